@@ -1,14 +1,16 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
 from models.database import get_db
 from models.user import User
 from services.auth_service import get_current_user
 from services.ai_service import generate_meal_feedback, generate_daily_tip, answer_nutrition_question, suggest_meal_improvements
 from services.meal_service import get_recent_meals_for_ai, get_daily_nutrition_summary, get_meal_by_id
+from utils.query_budget import query_budget
+from utils.request_timing import InstrumentedRoute
 from datetime import date
 
-router = APIRouter(prefix="/api/ai", tags=["ai"])
+router = APIRouter(prefix="/api/ai", tags=["ai"], route_class=InstrumentedRoute)
 
 class MealFeedbackRequest(BaseModel):
     meal_id: int
@@ -20,10 +22,11 @@ class MealAdjustmentRequest(BaseModel):
     meal_id: int
 
 @router.post("/feedback")
+@query_budget(4)
 async def get_meal_feedback(
     request: MealFeedbackRequest,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     meal = await get_meal_by_id(current_user, request.meal_id, db)
     if not meal:
@@ -54,28 +57,31 @@ async def get_meal_feedback(
     return {"feedback": feedback}
 
 @router.get("/daily-tip")
+@query_budget(2)
 async def get_daily_tip(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     recent_meals = await get_recent_meals_for_ai(current_user, db, limit=5)
     tip = await generate_daily_tip(current_user, recent_meals)
     return {"tip": tip}
 
 @router.post("/qna")
+@query_budget(1)
 async def nutrition_qna(
     request: NutritionQuestionRequest,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     answer = await answer_nutrition_question(request.question, current_user)
     return {"answer": answer}
 
 @router.post("/meal-adjustment")
+@query_budget(2)
 async def get_meal_suggestions(
     request: MealAdjustmentRequest,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     meal = await get_meal_by_id(current_user, request.meal_id, db)
     if not meal:
@@ -1,38 +1,50 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from typing import Optional, List
+from fastapi import APIRouter, Depends, HTTPException, Request, status, Query, UploadFile, File
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional, List, Union
 from datetime import datetime, date
 from models.database import get_db
 from models.user import User
 from schemas.meal import (
-    Meal, MealCreate, MealUpdate, PhotoAnalysisRequest, PhotoAnalysisResponse,
-    ChatLogRequest, ChatLogResponse
+    Meal, MealCreate, MealUpdate, MealSearchResult, MealPage, PaginationMode, PhotoAnalysisRequest, PhotoAnalysisResponse,
+    ChatLogRequest, ChatLogResponse, BarcodeProduct, ImportFormat, MealImportResult, ExportFormat, ExportDataset
 )
-from services.auth_service import get_current_user
+from services.auth_service import get_current_user, require_premium
 from services.meal_service import (
-    create_meal, get_user_meals, get_meal_by_id, update_meal, delete_meal,
+    create_meal, get_user_meals, get_user_meals_page, get_meal_by_id, update_meal, delete_meal,
     analyze_photo, parse_chat_log, search_meals
 )
+from services.product_service import lookup_barcode
+from services.import_service import detect_import_format, import_meals
+from services.export_service import stream_export, export_headers, EXPORT_MEDIA_TYPES
+from services.data_version_service import versioned_response
+from utils.query_budget import query_budget
+from utils.request_timing import InstrumentedRoute
 
-router = APIRouter(prefix="/api/meals", tags=["meals"])
+router = APIRouter(prefix="/api/meals", tags=["meals"], route_class=InstrumentedRoute)
 
 @router.post("", response_model=Meal)
+@query_budget(11)
 async def create_new_meal(
     meal_data: MealCreate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     meal = await create_meal(current_user, meal_data, db)
     return meal
 
-@router.get("", response_model=List[Meal])
+@router.get("", response_model=Union[List[Meal], MealPage])
+@query_budget(3)
 async def get_meals(
+    request: Request,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, le=1000),
+    pagination: PaginationMode = Query(PaginationMode.OFFSET),
+    cursor: Optional[str] = None,
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     # Convert date strings to datetime objects if provided
     start_datetime = None
@@ -56,24 +68,60 @@ async def get_meals(
                 detail="Invalid end_date format. Use YYYY-MM-DD"
             )
     
-    meals = await get_user_meals(current_user, db, skip, limit, start_datetime, end_datetime)
-    return meals
+    if cursor or pagination == PaginationMode.CURSOR:
+        return await versioned_response(
+            request, current_user, db,
+            lambda: get_user_meals_page(current_user, db, limit, cursor, start_datetime, end_datetime),
+            MealPage
+        )
+    
+    return await versioned_response(
+        request, current_user, db,
+        lambda: get_user_meals(current_user, db, skip, limit, start_datetime, end_datetime),
+        List[Meal]
+    )
+
+@router.post("/import", response_model=MealImportResult)
+async def import_meal_history(
+    file: UploadFile = File(...),
+    format: Optional[ImportFormat] = Query(None),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    import_format = format or detect_import_format(file.filename, file.content_type)
+    result = await import_meals(current_user, file.file, import_format, db)
+    return result
 
-@router.get("/search", response_model=List[Meal])
+@router.get("/export")
+async def export_meal_history(
+    format: ExportFormat = Query(ExportFormat.CSV),
+    dataset: ExportDataset = Query(ExportDataset.MEALS),
+    current_user: User = Depends(require_premium),
+    db: AsyncSession = Depends(get_db)
+):
+    return StreamingResponse(
+        stream_export(current_user, format, dataset, db),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers=export_headers(format, dataset)
+    )
+
+@router.get("/search", response_model=List[MealSearchResult])
+@query_budget(3)
 async def search_user_meals(
     q: str = Query(..., min_length=1),
     limit: int = Query(20, le=100),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     meals = await search_meals(current_user, q, db, limit)
     return meals
 
 @router.get("/{meal_id}", response_model=Meal)
+@query_budget(3)
 async def get_meal(
     meal_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     meal = await get_meal_by_id(current_user, meal_id, db)
     if not meal:
@@ -84,11 +132,12 @@ async def get_meal(
     return meal
 
 @router.put("/{meal_id}", response_model=Meal)
+@query_budget(11)
 async def update_existing_meal(
     meal_id: int,
     meal_data: MealUpdate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     meal = await update_meal(current_user, meal_id, meal_data, db)
     if not meal:
@@ -99,10 +148,11 @@ async def update_existing_meal(
     return meal
 
 @router.delete("/{meal_id}")
+@query_budget(11)
 async def delete_existing_meal(
     meal_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     success = await delete_meal(current_user, meal_id, db)
     if not success:
@@ -113,19 +163,31 @@ async def delete_existing_meal(
     return {"message": "Meal deleted successfully"}
 
 @router.post("/photo-analysis", response_model=PhotoAnalysisResponse)
+@query_budget(3)
 async def analyze_meal_photo(
     photo_request: PhotoAnalysisRequest,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     analysis = await analyze_photo(current_user, photo_request, db)
     return analysis
 
 @router.post("/chat-log", response_model=ChatLogResponse)
+@query_budget(3)
 async def parse_meal_description(
     chat_request: ChatLogRequest,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     analysis = await parse_chat_log(current_user, chat_request, db)
-    return analysis
\ No newline at end of file
+    return analysis
+
+@router.get("/barcode/{barcode}", response_model=BarcodeProduct)
+@query_budget(1)
+async def lookup_product_barcode(
+    barcode: str,
+    servings: float = Query(1.0, gt=0, le=100),
+    grams: Optional[float] = Query(None, gt=0, le=5000),
+    current_user: User = Depends(get_current_user)
+):
+    return lookup_barcode(barcode, servings, grams)
\ No newline at end of file
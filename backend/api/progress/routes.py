@@ -1,38 +1,101 @@
-from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Query, Request
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import date
 from models.database import get_db
 from models.user import User
-from schemas.meal import DailyNutritionSummary, WeeklyProgressData
+from schemas.meal import DailyNutritionSummary, WeeklyProgressData, ProgressGranularity, ProgressRangeData, YearHeatmapData, NutritionAnalytics
 from services.auth_service import get_current_user
-from services.meal_service import get_daily_nutrition_summary, get_weekly_progress, get_meal_calendar_data
+from services.meal_service import get_daily_nutrition_summary, get_weekly_progress, get_meal_calendar_data, get_progress_range, get_year_heatmap
+from services.analytics_service import get_nutrition_analytics
+from services.data_version_service import versioned_response
+from utils.query_budget import query_budget
+from utils.request_timing import InstrumentedRoute
 
-router = APIRouter(prefix="/api/progress", tags=["progress"])
+router = APIRouter(prefix="/api/progress", tags=["progress"], route_class=InstrumentedRoute)
 
 @router.get("/daily", response_model=DailyNutritionSummary)
+@query_budget(4)
 async def get_daily_progress(
+    request: Request,
     target_date: date = Query(...),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    summary = await get_daily_nutrition_summary(current_user, target_date, db)
-    return summary
+    return await versioned_response(
+        request, current_user, db,
+        lambda: get_daily_nutrition_summary(current_user, target_date, db),
+        DailyNutritionSummary
+    )
 
 @router.get("/weekly", response_model=WeeklyProgressData)
+@query_budget(5)
 async def get_weekly_progress_data(
+    request: Request,
     week_start: date = Query(...),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    progress = await get_weekly_progress(current_user, week_start, db)
-    return progress
+    return await versioned_response(
+        request, current_user, db,
+        lambda: get_weekly_progress(current_user, week_start, db),
+        WeeklyProgressData
+    )
+
+@router.get("/range", response_model=ProgressRangeData)
+@query_budget(3)
+async def get_progress_range_data(
+    request: Request,
+    start: date = Query(...),
+    end: date = Query(...),
+    granularity: ProgressGranularity = Query(ProgressGranularity.DAY),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    return await versioned_response(
+        request, current_user, db,
+        lambda: get_progress_range(current_user, start, end, granularity, db),
+        ProgressRangeData
+    )
+
+@router.get("/analytics", response_model=NutritionAnalytics)
+@query_budget(3)
+async def get_nutrition_analytics_data(
+    request: Request,
+    start: date = Query(...),
+    end: date = Query(...),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    return await versioned_response(
+        request, current_user, db,
+        lambda: get_nutrition_analytics(current_user, start, end, db),
+        NutritionAnalytics
+    )
 
 @router.get("/calendar")
+@query_budget(2)
 async def get_calendar_data(
+    request: Request,
     month: int = Query(..., ge=1, le=12),
     year: int = Query(..., ge=2020, le=2030),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
+):
+    return await versioned_response(
+        request, current_user, db,
+        lambda: get_meal_calendar_data(current_user, month, year, db)
+    )
+
+@router.get("/year", response_model=YearHeatmapData)
+@query_budget(2)
+async def get_year_heatmap_data(
+    request: Request,
+    year: int = Query(..., ge=2020, le=2030),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
-    calendar_data = await get_meal_calendar_data(current_user, month, year, db)
-    return calendar_data
\ No newline at end of file
+    return await versioned_response(
+        request, current_user, db,
+        lambda: get_year_heatmap(current_user, year, db),
+        YearHeatmapData
+    )
\ No newline at end of file
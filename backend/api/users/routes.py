@@ -1,29 +1,36 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List
 from models.database import get_db
 from models.user import User
-from schemas.user import User as UserSchema, UserUpdate, UserProfile, UserProfileCreate, UserProfileUpdate, Subscription
+from schemas.user import User as UserSchema, UserUpdate, UserProfile, UserProfileCreate, UserProfileUpdate, NutritionGoalVersion, Subscription
 from services.auth_service import get_current_user
 from services.user_service import (
     get_user_profile, create_user_profile, update_user_profile, 
-    calculate_user_goals, update_user_email, get_user_subscription,
-    check_subscription_status, get_user_streak
+    get_current_goals, get_goal_history, update_user_email, get_user_subscription,
+    check_subscription_status
 )
+from services.streak_service import get_streak_summary
+from services.data_version_service import versioned_response
+from utils.query_budget import query_budget
+from utils.request_timing import InstrumentedRoute
 
-router = APIRouter(prefix="/api/users", tags=["users"])
+router = APIRouter(prefix="/api/users", tags=["users"], route_class=InstrumentedRoute)
 
 @router.get("/me", response_model=UserSchema)
+@query_budget(3)
 async def get_current_user_info(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     return current_user
 
 @router.put("/me", response_model=UserSchema)
+@query_budget(1)
 async def update_current_user(
     user_data: UserUpdate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     if user_data.email:
         updated_user = await update_user_email(current_user, user_data.email, db)
@@ -31,9 +38,10 @@ async def update_current_user(
     return current_user
 
 @router.get("/profile", response_model=UserProfile)
+@query_budget(2)
 async def get_user_profile_info(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     profile = await get_user_profile(current_user, db)
     if not profile:
@@ -44,19 +52,21 @@ async def get_user_profile_info(
     return profile
 
 @router.post("/profile", response_model=UserProfile)
+@query_budget(9)
 async def create_user_profile_info(
     profile_data: UserProfileCreate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     profile = await create_user_profile(current_user, profile_data, db)
     return profile
 
 @router.put("/profile", response_model=UserProfile)
+@query_budget(7)
 async def update_user_profile_info(
     profile_data: UserProfileUpdate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     profile = await update_user_profile(current_user, profile_data, db)
     if not profile:
@@ -67,9 +77,10 @@ async def update_user_profile_info(
     return profile
 
 @router.get("/goals")
+@query_budget(3)
 async def get_user_goals(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     profile = await get_user_profile(current_user, db)
     if not profile:
@@ -78,21 +89,34 @@ async def get_user_goals(
             detail="User profile not found"
         )
     
-    goals = await calculate_user_goals(profile)
+    goals = await get_current_goals(current_user, db)
     return goals
 
+@router.get("/goals/history", response_model=List[NutritionGoalVersion])
+@query_budget(2)
+async def get_user_goal_history(
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    return await get_goal_history(current_user, db)
+
 @router.get("/subscription")
+@query_budget(2)
 async def get_subscription_info(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     subscription_status = await check_subscription_status(current_user, db)
     return subscription_status
 
 @router.get("/streak")
+@query_budget(5)
 async def get_user_streak_info(
+    request: Request,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    streak = await get_user_streak(current_user, db)
-    return {"streak": streak}
\ No newline at end of file
+    return await versioned_response(
+        request, current_user, db,
+        lambda: get_streak_summary(current_user.id, db)
+    )
\ No newline at end of file
@@ -0,0 +1,51 @@
+from typing import Any, AsyncIterator, Callable
+from contextlib import asynccontextmanager
+import inspect
+import os
+import subprocess
+from sqlalchemy.engine import make_url
+
+def use_database(database_url: str):
+    os.environ["DATABASE_URL"] = database_url
+
+def display_url(database_url: str) -> str:
+    return make_url(database_url).render_as_string(hide_password=True)
+
+async def resolve(value: Any) -> Any:
+    if inspect.isawaitable(value):
+        return await value
+    return value
+
+def sync_engine():
+    from models.database import engine
+    return getattr(engine, "sync_engine", engine)
+
+async def run_on_connection(fn: Callable) -> Any:
+    from models.database import engine
+    if hasattr(engine, "sync_engine"):
+        async with engine.begin() as connection:
+            return await connection.run_sync(fn)
+    with engine.begin() as connection:
+        return fn(connection)
+
+@asynccontextmanager
+async def open_session() -> AsyncIterator[Any]:
+    from models.database import SessionLocal
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        await resolve(db.close())
+
+async def dispose_engine():
+    from models.database import engine
+    await resolve(engine.dispose())
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "describe", "--always", "--dirty"],
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
@@ -0,0 +1,133 @@
+from typing import Any, Dict, List
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from benchmarks.seed import add_seed_arguments
+from benchmarks.run import add_run_arguments
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+HARNESS_DIR = Path(__file__).resolve().parent
+
+def _git(*args: str, cwd: Path = BACKEND_DIR) -> str:
+    return subprocess.run(["git", *args], cwd=cwd, capture_output=True, text=True, check=True).stdout.strip()
+
+def _forward(args: argparse.Namespace, flags: Dict[str, str]) -> List[str]:
+    forwarded = []
+    for name, flag in flags.items():
+        value = getattr(args, name)
+        for item in value if isinstance(value, list) else [value]:
+            if item is not None:
+                forwarded += [flag, str(item)]
+    return forwarded
+
+SEED_FLAGS = {
+    "users": "--users",
+    "days": "--days",
+    "meals_per_day": "--meals-per-day",
+    "skip_rate": "--skip-rate",
+    "end_date": "--end-date",
+    "seed": "--seed",
+    "batch_size": "--batch-size",
+}
+
+RUN_FLAGS = {
+    "cases": "--case",
+    "sample_users": "--sample-users",
+    "repeat": "--repeat",
+    "warmup": "--warmup",
+    "search_term": "--search-term",
+}
+
+def run_revision(revision: str, label: str, workdir: Path, args: argparse.Namespace) -> Dict[str, Any]:
+    commit = _git("rev-parse", "--verify", f"{revision}^{{commit}}")
+    checkout = workdir / label
+    _git("worktree", "add", "--detach", str(checkout), commit)
+    try:
+        backend = checkout / BACKEND_DIR.relative_to(Path(_git("rev-parse", "--show-toplevel")).resolve())
+        shutil.rmtree(backend / "benchmarks", ignore_errors=True)
+        shutil.copytree(HARNESS_DIR, backend / "benchmarks", ignore=shutil.ignore_patterns("__pycache__"))
+        if (BACKEND_DIR / ".env").exists():
+            shutil.copy(BACKEND_DIR / ".env", backend / ".env")
+        
+        database_url = args.database_url or f"sqlite:///{workdir / label}.db"
+        output = workdir / f"{label}.json"
+        env = {**os.environ, "DATABASE_URL": database_url}
+        
+        print(f"[{label}] {revision} ({commit[:12]}): seeding", file=sys.stderr)
+        subprocess.run(
+            [sys.executable, "-m", "benchmarks.seed", "--database-url", database_url,
+             *_forward(args, SEED_FLAGS)],
+            cwd=backend, env=env, check=True
+        )
+        print(f"[{label}] running cases", file=sys.stderr)
+        subprocess.run(
+            [sys.executable, "-m", "benchmarks.run", "--database-url", database_url, "--output", str(output),
+             *_forward(args, RUN_FLAGS)],
+            cwd=backend, env=env, check=True
+        )
+        
+        results = json.loads(output.read_text())
+        results["meta"].update({"revision": revision, "commit": commit})
+        return results
+    finally:
+        if not args.keep_worktrees:
+            _git("worktree", "remove", "--force", str(checkout))
+
+def compare_results(base: Dict[str, Any], head: Dict[str, Any]) -> Dict[str, Any]:
+    cases = {}
+    for name, head_case in head["cases"].items():
+        base_case = base["cases"].get(name)
+        if base_case is None:
+            continue
+        cases[name] = {
+            "base_median_ms": base_case["median_ms"],
+            "head_median_ms": head_case["median_ms"],
+            "base_p95_ms": base_case["p95_ms"],
+            "head_p95_ms": head_case["p95_ms"],
+            "base_statements": base_case["statements_per_call"],
+            "head_statements": head_case["statements_per_call"],
+            "speedup": round(base_case["median_ms"] / head_case["median_ms"], 3) if head_case["median_ms"] else None,
+            "change_pct": round((head_case["median_ms"] - base_case["median_ms"]) / base_case["median_ms"] * 100, 1) if base_case["median_ms"] else None,
+        }
+    return {"base": base, "head": head, "comparison": cases}
+
+def format_table(comparison: Dict[str, Any]) -> str:
+    lines = [f"{'case':<30} {'base ms':>10} {'head ms':>10} {'change':>9} {'speedup':>8} {'queries':>11}"]
+    for name, row in comparison.items():
+        change = f"{row['change_pct']:+.1f}%" if row["change_pct"] is not None else "n/a"
+        speedup = f"{row['speedup']:.2f}x" if row["speedup"] is not None else "n/a"
+        queries = f"{row['base_statements']:g}->{row['head_statements']:g}"
+        lines.append(f"{name:<30} {row['base_median_ms']:>10.2f} {row['head_median_ms']:>10.2f} {change:>9} {speedup:>8} {queries:>11}")
+    return "\n".join(lines)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark two git revisions on identical seeded data and compare them")
+    parser.add_argument("base", help="Baseline revision, e.g. main or HEAD~1")
+    parser.add_argument("head", nargs="?", default="HEAD", help="Revision to compare against the baseline")
+    parser.add_argument("--database-url", default=None, help="Database to reseed for each revision (default: a SQLite file per revision)")
+    parser.add_argument("--output", default=None, help="Write the combined JSON report here")
+    parser.add_argument("--workdir", default=None, help="Directory for worktrees, databases and raw results")
+    parser.add_argument("--keep-worktrees", action="store_true")
+    add_seed_arguments(parser)
+    add_run_arguments(parser)
+    args = parser.parse_args()
+    
+    workdir = Path(args.workdir or tempfile.mkdtemp(prefix="eatwise-bench-")).resolve()
+    workdir.mkdir(parents=True, exist_ok=True)
+    
+    base = run_revision(args.base, "base", workdir, args)
+    head = run_revision(args.head, "head", workdir, args)
+    report = compare_results(base, head)
+    
+    print(format_table(report["comparison"]))
+    if args.output:
+        with open(args.output, "w") as output:
+            output.write(json.dumps(report, indent=2) + "\n")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+from typing import Any, Dict, List
+from types import SimpleNamespace
+import asyncio
+import json
+import random
+
+MEAL_ESTIMATE = {
+    "description": "Grilled chicken with rice and vegetables",
+    "parsed_description": "Grilled chicken with rice and vegetables",
+    "calories": 620.0,
+    "protein": 42.0,
+    "carbs": 68.0,
+    "fat": 16.0,
+    "fiber": 6.0,
+    "water": 250.0,
+    "confidence": 0.8,
+}
+
+COACH_TEXT = "Aim for a palm-sized portion of protein at every meal and fill half your plate with vegetables."
+
+class FakeOpenAIError(Exception):
+    pass
+
+def _expects_json(messages: List[Dict[str, Any]]) -> bool:
+    for message in messages:
+        content = message.get("content")
+        if isinstance(content, str) and "JSON" in content:
+            return True
+    return False
+
+class FakeChatCompletions:
+    def __init__(self, latency_ms: float, jitter_ms: float, error_rate: float, seed: int):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.rng = random.Random(seed)
+        self.calls = 0
+        self.failures = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+    
+    async def create(self, **kwargs):
+        self.calls += 1
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(max(0.0, self.rng.gauss(self.latency_ms, self.jitter_ms)) / 1000)
+        finally:
+            self.in_flight -= 1
+        
+        if self.rng.random() < self.error_rate:
+            self.failures += 1
+            raise FakeOpenAIError("Simulated upstream failure")
+        
+        content = json.dumps(MEAL_ESTIMATE) if _expects_json(kwargs.get("messages", [])) else COACH_TEXT
+        message = SimpleNamespace(role="assistant", content=content)
+        return SimpleNamespace(choices=[SimpleNamespace(index=0, message=message, finish_reason="stop")])
+
+class FakeOpenAI:
+    def __init__(self, latency_ms: float = 800.0, jitter_ms: float = 200.0, error_rate: float = 0.0, seed: int = 42):
+        self.chat = SimpleNamespace(completions=FakeChatCompletions(latency_ms, jitter_ms, error_rate, seed))
+    
+    def reset(self):
+        completions = self.chat.completions
+        completions.calls = 0
+        completions.failures = 0
+        completions.peak_in_flight = completions.in_flight
+    
+    def stats(self) -> Dict[str, Any]:
+        completions = self.chat.completions
+        return {
+            "calls": completions.calls,
+            "failures": completions.failures,
+            "peak_in_flight": completions.peak_in_flight,
+            "latency_ms": completions.latency_ms,
+            "jitter_ms": completions.jitter_ms,
+            "error_rate": completions.error_rate,
+        }
+
+def install_fake_openai(latency_ms: float, jitter_ms: float, error_rate: float, seed: int = 42) -> FakeOpenAI:
+    from services import ai_service
+    fake = FakeOpenAI(latency_ms, jitter_ms, error_rate, seed)
+    ai_service.client = fake
+    return fake
@@ -0,0 +1,389 @@
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+from collections import Counter, defaultdict
+from contextlib import asynccontextmanager
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import sys
+import time
+import uuid
+from datetime import date, datetime, timedelta
+import httpx
+from jose import jwt
+from benchmarks.common import display_url, dispose_engine, git_revision, resolve, use_database
+from benchmarks.fake_openai import install_fake_openai
+
+PLACEHOLDER_SETTINGS = (
+    "SUPABASE_URL",
+    "SUPABASE_KEY",
+    "SUPABASE_SERVICE_ROLE_KEY",
+    "SUPABASE_ANON_KEY",
+    "SUPABASE_STORAGE_BUCKET",
+    "OPENAI_API_KEY",
+    "STRIPE_SECRET_KEY",
+    "STRIPE_PUBLISHABLE_KEY",
+    "STRIPE_WEBHOOK_SECRET",
+)
+
+HISTOGRAM_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+MEAL_TEXTS = (
+    "Two scrambled eggs with toast and a coffee",
+    "Chicken caesar salad",
+    "Bowl of oatmeal with blueberries",
+    "Salmon, rice and steamed broccoli",
+    "Turkey sandwich and an apple",
+)
+
+QUESTIONS = (
+    "How much protein should I eat after a workout?",
+    "Is it fine to skip breakfast?",
+    "What is a good snack before bed?",
+)
+
+def percentile(ordered: List[float], fraction: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+def histogram(samples: List[float]) -> Dict[str, int]:
+    overflow = f"gt_{HISTOGRAM_BUCKETS_MS[-1]}ms"
+    buckets = {**{f"le_{bound}ms": 0 for bound in HISTOGRAM_BUCKETS_MS}, overflow: 0}
+    for sample in samples:
+        bucket = next((f"le_{bound}ms" for bound in HISTOGRAM_BUCKETS_MS if sample <= bound), overflow)
+        buckets[bucket] += 1
+    return buckets
+
+class Recorder:
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.statuses: Dict[str, Counter] = defaultdict(Counter)
+        self.scenarios: Dict[str, List[float]] = defaultdict(list)
+        self.scenario_failures: Counter = Counter()
+    
+    def record(self, name: str, elapsed_ms: float, status: str):
+        self.latencies[name].append(elapsed_ms)
+        self.statuses[name][status] += 1
+    
+    def record_scenario(self, name: str, elapsed_ms: float, failed: bool):
+        self.scenarios[name].append(elapsed_ms)
+        if failed:
+            self.scenario_failures[name] += 1
+    
+    def _summary(self, samples: List[float], errors: int) -> Dict[str, Any]:
+        ordered = sorted(samples)
+        return {
+            "count": len(ordered),
+            "errors": errors,
+            "error_rate": round(errors / len(ordered), 4) if ordered else 0.0,
+            "mean_ms": round(sum(ordered) / len(ordered), 2) if ordered else 0.0,
+            "p50_ms": round(percentile(ordered, 0.50), 2),
+            "p90_ms": round(percentile(ordered, 0.90), 2),
+            "p99_ms": round(percentile(ordered, 0.99), 2),
+            "max_ms": round(ordered[-1], 2) if ordered else 0.0,
+            "histogram": histogram(ordered),
+        }
+    
+    def report(self, elapsed: float) -> Dict[str, Any]:
+        endpoints = {}
+        for name, samples in sorted(self.latencies.items()):
+            statuses = self.statuses[name]
+            errors = sum(count for status, count in statuses.items() if not status.startswith(("2", "3")))
+            endpoints[name] = {**self._summary(samples, errors), "statuses": dict(statuses)}
+        
+        scenarios = {
+            name: self._summary(samples, self.scenario_failures[name])
+            for name, samples in sorted(self.scenarios.items())
+        }
+        
+        all_samples = [sample for samples in self.latencies.values() for sample in samples]
+        total_errors = sum(endpoint["errors"] for endpoint in endpoints.values())
+        return {
+            "duration_s": round(elapsed, 2),
+            "requests": len(all_samples),
+            "throughput_rps": round(len(all_samples) / elapsed, 2) if elapsed else 0.0,
+            "overall": self._summary(all_samples, total_errors),
+            "endpoints": endpoints,
+            "scenarios": scenarios,
+        }
+
+class VirtualUser:
+    def __init__(self, index: int, user_id: uuid.UUID, token: str, client: httpx.AsyncClient, recorder: Recorder, rng: random.Random):
+        self.index = index
+        self.user_id = user_id
+        self.client = client
+        self.recorder = recorder
+        self.rng = rng
+        self.headers = {"Authorization": f"Bearer {token}"}
+        self.failed = False
+        self.today = date.today()
+    
+    async def request(self, method: str, path: str, **kwargs) -> Optional[httpx.Response]:
+        name = f"{method} {path}"
+        started = time.perf_counter()
+        try:
+            response = await self.client.request(method, path, headers=self.headers, **kwargs)
+        except httpx.HTTPError as error:
+            self.failed = True
+            self.recorder.record(name, (time.perf_counter() - started) * 1000, type(error).__name__)
+            return None
+        
+        self.recorder.record(name, (time.perf_counter() - started) * 1000, str(response.status_code))
+        if response.status_code >= 400:
+            self.failed = True
+        return response
+    
+    async def get(self, path: str, **kwargs) -> Optional[httpx.Response]:
+        return await self.request("GET", path, **kwargs)
+    
+    async def post(self, path: str, **kwargs) -> Optional[httpx.Response]:
+        return await self.request("POST", path, **kwargs)
+
+def mint_token(user_id: uuid.UUID, email: str, secret: str, ttl_seconds: int = 3600) -> str:
+    issued_at = int(time.time())
+    return jwt.encode(
+        {
+            "sub": str(user_id),
+            "email": email,
+            "aud": "authenticated",
+            "role": "authenticated",
+            "iat": issued_at,
+            "exp": issued_at + ttl_seconds,
+        },
+        secret,
+        algorithm="HS256",
+    )
+
+async def open_dashboard(user: VirtualUser):
+    await user.get("/api/users/me")
+    await asyncio.gather(
+        user.get("/api/progress/daily", params={"target_date": user.today.isoformat()}),
+        user.get("/api/meals", params={"start_date": user.today.isoformat(), "end_date": (user.today + timedelta(days=1)).isoformat()}),
+        user.get("/api/users/streak"),
+    )
+
+async def open_progress(user: VirtualUser):
+    week_start = user.today - timedelta(days=user.today.weekday())
+    await asyncio.gather(
+        user.get("/api/progress/weekly", params={"week_start": week_start.isoformat()}),
+        user.get("/api/progress/daily", params={"target_date": user.today.isoformat()}),
+        user.get("/api/users/profile"),
+    )
+
+async def log_meal(user: VirtualUser):
+    parsed = await user.post("/api/meals/chat-log", json={"description": user.rng.choice(MEAL_TEXTS)})
+    if parsed is None or parsed.status_code != 200:
+        return
+    
+    estimate = parsed.json()
+    meal = {field: estimate[field] for field in ("calories", "protein", "carbs", "fat", "fiber", "water")}
+    await user.post("/api/meals", json={"description": estimate["parsed_description"], **meal})
+    await user.get("/api/progress/daily", params={"target_date": user.today.isoformat()})
+
+async def ask_coach(user: VirtualUser):
+    await asyncio.gather(
+        user.get("/api/meals", params={"start_date": user.today.isoformat(), "end_date": (user.today + timedelta(days=1)).isoformat()}),
+        user.get("/api/ai/daily-tip"),
+    )
+    await user.post("/api/ai/qna", json={"question": user.rng.choice(QUESTIONS)})
+
+async def browse_history(user: VirtualUser):
+    await user.get("/api/meals", params={"limit": 20})
+    await user.get("/api/meals/search", params={"q": "chicken"})
+
+SCENARIOS: Dict[str, Callable[[VirtualUser], Awaitable[None]]] = {
+    "dashboard": open_dashboard,
+    "progress": open_progress,
+    "log_meal": log_meal,
+    "coach": ask_coach,
+    "history": browse_history,
+}
+
+DEFAULT_WEIGHTS = {
+    "dashboard": 40,
+    "progress": 15,
+    "log_meal": 20,
+    "coach": 10,
+    "history": 15,
+}
+
+def parse_weights(values: Optional[List[str]]) -> Dict[str, float]:
+    weights = dict(DEFAULT_WEIGHTS)
+    for value in values or []:
+        name, _, weight = value.partition("=")
+        if name not in SCENARIOS or not weight:
+            raise argparse.ArgumentTypeError(f"Expected <scenario>=<weight> with scenario one of {', '.join(SCENARIOS)}")
+        weights[name] = float(weight)
+    return {name: weight for name, weight in weights.items() if weight > 0}
+
+async def prepare_user(user: VirtualUser, setup_meals: int):
+    await user.get("/api/users/me")
+    profile = await user.get("/api/users/profile")
+    if profile is not None and profile.status_code == 404:
+        await user.post("/api/users/profile", json={
+            "age": user.rng.randint(20, 65),
+            "height": round(user.rng.uniform(155, 195), 1),
+            "weight": round(user.rng.uniform(55, 110), 1),
+            "activity_level": user.rng.choice(["low", "medium", "high"]),
+            "goal": user.rng.choice(["weight_loss", "muscle_gain", "maintain"]),
+            "sex": user.rng.choice(["male", "female"]),
+        })
+    
+    for offset in range(setup_meals):
+        logged_at = datetime.combine(user.today - timedelta(days=offset % 7), datetime.min.time()) + timedelta(hours=8 + offset % 12)
+        await user.post("/api/meals", json={
+            "description": user.rng.choice(MEAL_TEXTS),
+            "calories": round(user.rng.uniform(200, 800), 1),
+            "protein": round(user.rng.uniform(10, 50), 1),
+            "carbs": round(user.rng.uniform(20, 90), 1),
+            "fat": round(user.rng.uniform(5, 35), 1),
+            "logged_at": logged_at.isoformat(),
+        })
+
+async def user_loop(user: VirtualUser, weights: Dict[str, float], deadline: float, think_time_ms: float, start_delay: float):
+    await asyncio.sleep(start_delay)
+    names = list(weights)
+    scenario_weights = [weights[name] for name in names]
+    while time.perf_counter() < deadline:
+        name = user.rng.choices(names, scenario_weights)[0]
+        user.failed = False
+        started = time.perf_counter()
+        await SCENARIOS[name](user)
+        user.recorder.record_scenario(name, (time.perf_counter() - started) * 1000, user.failed)
+        if think_time_ms > 0:
+            await asyncio.sleep(user.rng.expovariate(1000 / think_time_ms))
+
+@asynccontextmanager
+async def app_client(transport: str, port: int, timeout: float) -> AsyncIterator[httpx.AsyncClient]:
+    from main import app
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+    if transport == "asgi":
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://loadtest", timeout=timeout) as client:
+            yield client
+        return
+    
+    import uvicorn
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    serving = asyncio.create_task(server.serve())
+    while not server.started:
+        if serving.done():
+            await serving
+            raise SystemExit(f"Server on port {port} exited before it started")
+        await asyncio.sleep(0.05)
+    
+    try:
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", timeout=timeout, limits=limits) as client:
+            yield client
+    finally:
+        server.should_exit = True
+        await serving
+
+async def run_load(args: argparse.Namespace) -> Dict[str, Any]:
+    from models.database import create_tables
+    await resolve(create_tables())
+    for logger_name in ("eatwise.timing", "httpx"):
+        logging.getLogger(logger_name).setLevel(logging.WARNING)
+    fake = install_fake_openai(args.ai_latency_ms, args.ai_jitter_ms, args.ai_error_rate, args.seed)
+    weights = parse_weights(args.weight)
+    
+    rng = random.Random(args.seed)
+    recorder = Recorder()
+    async with app_client(args.transport, args.port, args.timeout) as client:
+        users = []
+        for index in range(args.users):
+            user_id = uuid.UUID(int=rng.getrandbits(128), version=4)
+            token = mint_token(user_id, f"load-{index}@example.com", args.jwt_secret)
+            users.append(VirtualUser(index, user_id, token, client, Recorder(), random.Random(rng.getrandbits(64))))
+        
+        print(f"Preparing {len(users)} virtual users", file=sys.stderr)
+        await asyncio.gather(*(prepare_user(user, args.setup_meals) for user in users))
+        for user in users:
+            user.recorder = recorder
+        fake.reset()
+        
+        print(f"Running {', '.join(f'{name}={weight:g}' for name, weight in weights.items())} for {args.duration}s", file=sys.stderr)
+        started = time.perf_counter()
+        deadline = started + args.duration
+        await asyncio.gather(*(
+            user_loop(user, weights, deadline, args.think_time_ms, args.ramp_up * index / len(users))
+            for index, user in enumerate(users)
+        ))
+        elapsed = time.perf_counter() - started
+    
+    return {
+        "meta": {
+            "revision": git_revision(),
+            "database": display_url(args.database_url),
+            "transport": args.transport,
+            "users": args.users,
+            "duration_s": args.duration,
+            "ramp_up_s": args.ramp_up,
+            "think_time_ms": args.think_time_ms,
+            "weights": weights,
+            "seed": args.seed,
+            "created_at": datetime.utcnow().isoformat(),
+        },
+        **recorder.report(elapsed),
+        "openai": fake.stats(),
+    }
+
+def format_report(report: Dict[str, Any]) -> str:
+    lines = [
+        f"{report['requests']} requests in {report['duration_s']}s, {report['throughput_rps']} req/s, "
+        f"error rate {report['overall']['error_rate']:.2%}, p50 {report['overall']['p50_ms']}ms, p99 {report['overall']['p99_ms']}ms",
+        f"{'endpoint':<32} {'count':>7} {'errors':>7} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} {'max ms':>9}",
+    ]
+    for section in ("endpoints", "scenarios"):
+        if section == "scenarios":
+            lines.append(f"{'scenario':<32}")
+        for name, row in report[section].items():
+            lines.append(
+                f"{name:<32} {row['count']:>7} {row['errors']:>7} {row['p50_ms']:>9.1f} {row['p90_ms']:>9.1f} {row['p99_ms']:>9.1f} {row['max_ms']:>9.1f}"
+            )
+    return "\n".join(lines)
+
+def main():
+    parser = argparse.ArgumentParser(description="Drive mixed concurrent traffic through the API with a simulated OpenAI backend")
+    parser.add_argument("--database-url", required=True, help="Database the app under test uses")
+    parser.add_argument("--users", type=int, default=20, help="Concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds of measured traffic")
+    parser.add_argument("--ramp-up", type=float, default=0.0, help="Seconds over which virtual users start")
+    parser.add_argument("--think-time-ms", type=float, default=0.0, help="Mean pause between scenarios per user")
+    parser.add_argument("--weight", action="append", help="Scenario weight as <scenario>=<weight> (repeatable)")
+    parser.add_argument("--setup-meals", type=int, default=10, help="Meals logged per user before measuring")
+    parser.add_argument("--transport", choices=("asgi", "http"), default="asgi", help="Call the app in-process or through uvicorn on localhost")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--timeout", type=float, default=30.0, help="Per-request client timeout in seconds")
+    parser.add_argument("--ai-latency-ms", type=float, default=800.0, help="Mean simulated OpenAI latency")
+    parser.add_argument("--ai-jitter-ms", type=float, default=200.0)
+    parser.add_argument("--ai-error-rate", type=float, default=0.0, help="Fraction of simulated OpenAI calls that fail")
+    parser.add_argument("--jwt-secret", default="load-test-secret", help="Secret used to mint and verify test JWTs")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default=None, help="Write JSON results here instead of stdout")
+    args = parser.parse_args()
+    
+    use_database(args.database_url)
+    os.environ["SUPABASE_JWT_SECRET"] = args.jwt_secret
+    for name in PLACEHOLDER_SETTINGS:
+        os.environ.setdefault(name, "load-test")
+    
+    async def run():
+        try:
+            return await run_load(args)
+        finally:
+            await dispose_engine()
+    
+    report = asyncio.run(run())
+    print(format_report(report), file=sys.stderr)
+    payload = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as output:
+            output.write(payload + "\n")
+    else:
+        print(payload)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+from typing import Any, Callable, Dict, List
+import argparse
+import asyncio
+import json
+import platform
+import statistics
+import sys
+import time
+from datetime import date, datetime, timedelta
+import sqlalchemy
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import joinedload
+from benchmarks.common import display_url, dispose_engine, git_revision, open_session, resolve, sync_engine, use_database
+
+CASE_NAMES = (
+    "get_daily_nutrition_summary",
+    "get_weekly_progress",
+    "get_meal_calendar_data",
+    "search_meals",
+    "get_user_streak",
+    "get_user_meals",
+)
+
+class StatementCounter:
+    def __init__(self):
+        self.count = 0
+    
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+
+def build_cases(anchor: date, search_term: str) -> Dict[str, Callable]:
+    from services.meal_service import (
+        get_daily_nutrition_summary, get_weekly_progress, get_meal_calendar_data, search_meals, get_user_meals
+    )
+    from services.user_service import get_user_streak
+    week_start = anchor - timedelta(days=anchor.weekday() + 7)
+    
+    return {
+        "get_daily_nutrition_summary": lambda user, db: get_daily_nutrition_summary(user, anchor, db),
+        "get_weekly_progress": lambda user, db: get_weekly_progress(user, week_start, db),
+        "get_meal_calendar_data": lambda user, db: get_meal_calendar_data(user, anchor.month, anchor.year, db),
+        "search_meals": lambda user, db: search_meals(user, search_term, db),
+        "get_user_streak": lambda user, db: get_user_streak(user, db),
+        "get_user_meals": lambda user, db: get_user_meals(user, db),
+    }
+
+def summarize(samples: List[float], statements: List[int]) -> Dict[str, Any]:
+    ordered = sorted(samples)
+    return {
+        "calls": len(ordered),
+        "mean_ms": round(statistics.fmean(ordered), 3),
+        "median_ms": round(statistics.median(ordered), 3),
+        "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 3),
+        "min_ms": round(ordered[0], 3),
+        "max_ms": round(ordered[-1], 3),
+        "stdev_ms": round(statistics.stdev(ordered), 3) if len(ordered) > 1 else 0.0,
+        "statements_per_call": round(statistics.fmean(statements), 2),
+    }
+
+async def load_users(sample_users: int) -> List[Any]:
+    from models.user import User
+    async with open_session() as db:
+        result = await resolve(db.execute(
+            select(User).options(joinedload(User.profile)).order_by(User.id).limit(sample_users)
+        ))
+        return list(result.unique().scalars())
+
+async def dataset_summary() -> Dict[str, Any]:
+    from models.user import User
+    from models.meal import Meal
+    async with open_session() as db:
+        users = (await resolve(db.execute(select(func.count(User.id))))).scalar()
+        meals, last_logged = (await resolve(db.execute(select(func.count(Meal.id), func.max(Meal.logged_at))))).one()
+    if isinstance(last_logged, str):
+        last_logged = datetime.fromisoformat(last_logged)
+    return {"users": users, "meals": meals, "last_logged": last_logged.date() if last_logged else None}
+
+async def time_case(case: Callable, users: List[Any], repeat: int, warmup: int, counter: StatementCounter) -> Dict[str, Any]:
+    samples: List[float] = []
+    statements: List[int] = []
+    
+    for iteration in range(warmup + repeat):
+        for user in users:
+            async with open_session() as db:
+                db.add(user)
+                before = counter.count
+                started = time.perf_counter()
+                await case(user, db)
+                elapsed = time.perf_counter() - started
+                if iteration >= warmup:
+                    samples.append(elapsed * 1000)
+                    statements.append(counter.count - before)
+    
+    return summarize(samples, statements)
+
+async def run_suite(
+    database_url: str,
+    cases: List[str],
+    sample_users: int = 50,
+    repeat: int = 3,
+    warmup: int = 1,
+    search_term: str = "chicken",
+) -> Dict[str, Any]:
+    dataset = await dataset_summary()
+    if not dataset["meals"]:
+        raise SystemExit("Benchmark database has no meals; run python -m benchmarks.seed first")
+    
+    users = await load_users(sample_users)
+    available = build_cases(dataset["last_logged"], search_term)
+    counter = StatementCounter()
+    event.listen(sync_engine(), "before_cursor_execute", counter)
+    
+    results = {}
+    try:
+        for name in cases:
+            results[name] = await time_case(available[name], users, repeat, warmup, counter)
+            print(f"{name}: median {results[name]['median_ms']:.2f}ms, p95 {results[name]['p95_ms']:.2f}ms", file=sys.stderr)
+    finally:
+        event.remove(sync_engine(), "before_cursor_execute", counter)
+    
+    return {
+        "meta": {
+            "revision": git_revision(),
+            "database": display_url(database_url),
+            "dialect": sync_engine().dialect.name,
+            "python": platform.python_version(),
+            "sqlalchemy": sqlalchemy.__version__,
+            "created_at": datetime.utcnow().isoformat(),
+            "users": dataset["users"],
+            "meals": dataset["meals"],
+            "anchor_date": dataset["last_logged"].isoformat(),
+            "sample_users": len(users),
+            "repeat": repeat,
+            "warmup": warmup,
+            "search_term": search_term,
+        },
+        "cases": results,
+    }
+
+def add_run_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--case", action="append", choices=CASE_NAMES, dest="cases", help="Only run this case (repeatable)")
+    parser.add_argument("--sample-users", type=int, default=50, help="Number of users each case is timed against")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed passes over the sampled users")
+    parser.add_argument("--warmup", type=int, default=1, help="Untimed passes before measuring")
+    parser.add_argument("--search-term", default="chicken")
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the meal and progress service functions against a seeded database")
+    parser.add_argument("--database-url", required=True, help="Database previously seeded with python -m benchmarks.seed")
+    parser.add_argument("--output", default=None, help="Write JSON results here instead of stdout")
+    add_run_arguments(parser)
+    args = parser.parse_args()
+    
+    use_database(args.database_url)
+    
+    async def run():
+        try:
+            return await run_suite(
+                args.database_url, args.cases or list(CASE_NAMES),
+                args.sample_users, args.repeat, args.warmup, args.search_term
+            )
+        finally:
+            await dispose_engine()
+    
+    results = asyncio.run(run())
+    payload = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as output:
+            output.write(payload + "\n")
+    else:
+        print(payload)
+
+if __name__ == "__main__":
+    main()
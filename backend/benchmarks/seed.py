@@ -0,0 +1,243 @@
+from typing import Any, Dict, Iterator, List
+import argparse
+import asyncio
+import contextlib
+import importlib
+import io
+import os
+import random
+import time
+import uuid
+from datetime import date, datetime, timedelta
+from sqlalchemy import insert, text
+from sqlalchemy.engine import make_url
+from benchmarks.common import dispose_engine, open_session, resolve, run_on_connection, use_database
+
+MEAL_DESCRIPTIONS = [
+    "Grilled chicken salad with olive oil",
+    "Oatmeal with banana and peanut butter",
+    "Greek yogurt with berries and granola",
+    "Salmon with brown rice and broccoli",
+    "Turkey sandwich on whole wheat bread",
+    "Scrambled eggs with toast and avocado",
+    "Chicken burrito bowl with black beans",
+    "Spaghetti bolognese with parmesan",
+    "Protein shake with almond milk",
+    "Beef stir fry with vegetables and noodles",
+    "Tuna poke bowl with edamame",
+    "Lentil soup with sourdough bread",
+    "Chicken tikka masala with basmati rice",
+    "Margherita pizza slice and side salad",
+    "Apple with almond butter",
+    "Tofu curry with jasmine rice",
+]
+
+MEAL_HOURS = (8, 13, 19, 16, 21)
+
+ACTIVITY_LEVELS = ("LOW", "MEDIUM", "HIGH")
+GOAL_TYPES = ("WEIGHT_LOSS", "MUSCLE_GAIN", "MAINTAIN")
+SEXES = ("MALE", "FEMALE")
+
+DERIVED_JOBS = (
+    ("daily_nutrition", "services.rollup_service", "rebuild_daily_nutrition", True),
+    ("streaks", "scripts.rebuild_streaks", "rebuild_streaks", False),
+    ("nutrition_goals", "scripts.recompute_goals", "recompute_goals", False),
+)
+
+def reset_database(database_url: str):
+    url = make_url(database_url)
+    if url.get_backend_name() == "sqlite" and url.database:
+        for suffix in ("", "-wal", "-shm", "-journal"):
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(url.database + suffix)
+
+async def drop_postgres_schema():
+    def drop(connection):
+        if connection.dialect.name == "postgresql":
+            connection.execute(text("DROP SCHEMA public CASCADE"))
+            connection.execute(text("CREATE SCHEMA public"))
+    await run_on_connection(drop)
+
+def _columns(table) -> set:
+    return set(table.columns.keys())
+
+def _filtered(rows: List[Dict[str, Any]], columns: set) -> List[Dict[str, Any]]:
+    return [{key: value for key, value in row.items() if key in columns} for row in rows]
+
+def generate_users(rng: random.Random, users: int, first_day: date) -> Iterator[tuple]:
+    created_at = datetime.combine(first_day, datetime.min.time())
+    for index in range(users):
+        user_id = uuid.UUID(int=rng.getrandbits(128), version=4)
+        user = {
+            "id": user_id,
+            "email": f"bench-{index}@example.com",
+            "role": "PREMIUM",
+            "created_at": created_at,
+        }
+        profile = {
+            "user_id": user_id,
+            "age": rng.randint(18, 70),
+            "height": round(rng.uniform(150, 200), 1),
+            "weight": round(rng.uniform(50, 120), 1),
+            "activity_level": rng.choice(ACTIVITY_LEVELS),
+            "goal": rng.choice(GOAL_TYPES),
+            "sex": rng.choice(SEXES),
+            "created_at": created_at,
+            "updated_at": created_at,
+        }
+        yield user, profile
+
+def generate_meals(rng: random.Random, user_id: uuid.UUID, first_day: date, days: int, meals_per_day: int, skip_rate: float) -> Iterator[Dict[str, Any]]:
+    for offset in range(days):
+        if rng.random() < skip_rate:
+            continue
+        
+        day = first_day + timedelta(days=offset)
+        for meal_index in range(rng.randint(1, max(1, 2 * meals_per_day - 1))):
+            hour = MEAL_HOURS[meal_index % len(MEAL_HOURS)]
+            calories = rng.uniform(150, 900)
+            yield {
+                "user_id": user_id,
+                "description": rng.choice(MEAL_DESCRIPTIONS),
+                "calories": round(calories, 1),
+                "protein": round(calories * rng.uniform(0.15, 0.35) / 4, 1),
+                "carbs": round(calories * rng.uniform(0.3, 0.55) / 4, 1),
+                "fat": round(calories * rng.uniform(0.2, 0.35) / 9, 1),
+                "fiber": round(rng.uniform(0, 12), 1),
+                "water": round(rng.uniform(0, 500), 1),
+                "logged_at": datetime.combine(day, datetime.min.time()) + timedelta(hours=hour, minutes=rng.randint(0, 59)),
+            }
+
+def seed_rows(connection, users: int, days: int, meals_per_day: int, skip_rate: float, end_date: date, seed: int, batch_size: int) -> Dict[str, int]:
+    from models.user import Base
+    users_table = Base.metadata.tables["users"]
+    profiles_table = Base.metadata.tables["user_profiles"]
+    meals_table = Base.metadata.tables["meals"]
+    
+    rng = random.Random(seed)
+    first_day = end_date - timedelta(days=days - 1)
+    user_rows, profile_rows, meal_rows = [], [], []
+    counts = {"users": 0, "meals": 0}
+    
+    def flush_users():
+        if user_rows:
+            connection.execute(insert(users_table), _filtered(user_rows, _columns(users_table)))
+            connection.execute(insert(profiles_table), _filtered(profile_rows, _columns(profiles_table)))
+            user_rows.clear()
+            profile_rows.clear()
+    
+    def flush_meals():
+        if meal_rows:
+            connection.execute(insert(meals_table), _filtered(meal_rows, _columns(meals_table)))
+            meal_rows.clear()
+    
+    for user, profile in generate_users(rng, users, first_day):
+        user_rows.append(user)
+        profile_rows.append(profile)
+        counts["users"] += 1
+        if len(user_rows) >= batch_size:
+            flush_users()
+        
+        for meal in generate_meals(rng, user["id"], first_day, days, meals_per_day, skip_rate):
+            meal_rows.append(meal)
+            counts["meals"] += 1
+            if len(meal_rows) >= batch_size:
+                flush_users()
+                flush_meals()
+    
+    flush_users()
+    flush_meals()
+    return counts
+
+async def rebuild_derived_data() -> List[str]:
+    completed = []
+    for name, module_name, function_name, needs_session in DERIVED_JOBS:
+        try:
+            job = getattr(importlib.import_module(module_name), function_name)
+        except ModuleNotFoundError as error:
+            if error.name != module_name:
+                raise
+            continue
+        except AttributeError:
+            continue
+        
+        with contextlib.redirect_stdout(io.StringIO()):
+            if needs_session:
+                async with open_session() as db:
+                    await resolve(job(db))
+            else:
+                await resolve(job())
+        completed.append(name)
+    return completed
+
+async def seed_database(
+    database_url: str,
+    users: int = 500,
+    days: int = 365,
+    meals_per_day: int = 3,
+    skip_rate: float = 0.15,
+    end_date: date = None,
+    seed: int = 42,
+    batch_size: int = 5000,
+) -> Dict[str, Any]:
+    from models.database import create_tables
+    end_date = end_date or datetime.utcnow().date() - timedelta(days=1)
+    
+    await drop_postgres_schema()
+    await resolve(create_tables())
+    
+    started = time.perf_counter()
+    counts = await run_on_connection(
+        lambda connection: seed_rows(connection, users, days, meals_per_day, skip_rate, end_date, seed, batch_size)
+    )
+    inserted = time.perf_counter()
+    derived = await rebuild_derived_data()
+    await run_on_connection(lambda connection: connection.execute(text("ANALYZE")))
+    finished = time.perf_counter()
+    
+    return {
+        **counts,
+        "days": days,
+        "meals_per_day": meals_per_day,
+        "end_date": end_date.isoformat(),
+        "seed": seed,
+        "derived": derived,
+        "insert_seconds": round(inserted - started, 2),
+        "derive_seconds": round(finished - inserted, 2),
+    }
+
+def add_seed_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--days", type=int, default=365, help="Days of meal history per user")
+    parser.add_argument("--meals-per-day", type=int, default=3, help="Average meals on a logged day")
+    parser.add_argument("--skip-rate", type=float, default=0.15, help="Fraction of days with no meals logged")
+    parser.add_argument("--end-date", type=date.fromisoformat, default=None, help="Last seeded day (default yesterday)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--batch-size", type=int, default=5000)
+
+def main():
+    parser = argparse.ArgumentParser(description="Seed a database with synthetic users and meal history for benchmarking")
+    parser.add_argument("--database-url", required=True, help="Database to seed; existing data is dropped")
+    add_seed_arguments(parser)
+    args = parser.parse_args()
+    
+    reset_database(args.database_url)
+    use_database(args.database_url)
+    
+    async def run():
+        try:
+            return await seed_database(
+                args.database_url, args.users, args.days, args.meals_per_day,
+                args.skip_rate, args.end_date, args.seed, args.batch_size
+            )
+        finally:
+            await dispose_engine()
+    
+    summary = asyncio.run(run())
+    print(
+        f"Seeded {summary['users']} users and {summary['meals']} meals in {summary['insert_seconds']:.2f}s, "
+        f"rebuilt {', '.join(summary['derived']) or 'nothing'} in {summary['derive_seconds']:.2f}s"
+    )
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,23 @@
-from fastapi import FastAPI
+import logging
+from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from api.users.routes import router as users_router
 from api.meals.routes import router as meals_router
 from api.progress.routes import router as progress_router
 from api.ai.routes import router as ai_router
 from utils.config import settings
-from models.database import create_tables
+from services.auth_service import require_internal
+from models.database import engine, create_tables, get_pool_status
+from services.parse_cache_service import meal_text_cache_stats
+from services.photo_cache_service import meal_photo_cache_stats
+from services.food_service import get_food_table, local_parser_stats
+from utils.query_budget import install_statement_counter, query_budgets_enforced
+from utils.request_timing import RequestTimingMiddleware, install_query_timing
+
+logging.basicConfig(level=settings.log_level)
+
+TIMING_HEADER_ENVIRONMENTS = ("development", "test")
+emit_timing_header = settings.app_environment in TIMING_HEADER_ENVIRONMENTS
 
 app = FastAPI(
     title="EatWise API",
@@ -16,7 +28,11 @@ app = FastAPI(
 # Create database tables on startup
 @app.on_event("startup")
 async def startup_event():
-    create_tables()
+    await create_tables()
+    get_food_table()
+
+if query_budgets_enforced():
+    install_statement_counter(engine)
 
 app.add_middleware(
     CORSMiddleware,
@@ -24,8 +40,13 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing", "ETag"] if emit_timing_header else ["ETag"],
 )
 
+if settings.request_timing_sample_rate > 0:
+    install_query_timing(engine)
+    app.add_middleware(RequestTimingMiddleware, sample_rate=settings.request_timing_sample_rate, emit_header=emit_timing_header)
+
 app.include_router(users_router)
 app.include_router(meals_router)
 app.include_router(progress_router)
@@ -38,3 +59,11 @@ def read_root():
 @app.get("/health")
 def health_check():
     return {"status": "healthy"}
+
+@app.get("/health/db", dependencies=[Depends(require_internal)])
+def database_health():
+    return get_pool_status()
+
+@app.get("/health/ai-cache", dependencies=[Depends(require_internal)])
+def ai_cache_health():
+    return {"meal_text": meal_text_cache_stats(), "meal_photo": meal_photo_cache_stats(), "local_meal_text": local_parser_stats()}
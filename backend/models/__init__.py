@@ -1,18 +1,28 @@
-from .user import Base, User, UserProfile, Subscription, UserRole, ActivityLevel, GoalType
-from .meal import Meal
-from .database import engine, SessionLocal, get_db, create_tables
+from .user import Base, User, UserProfile, NutritionGoal, Subscription, UserStreak, UserRole, ActivityLevel, GoalType, Sex
+from .meal import Meal, MealArchive, DailyNutrition, WeeklyReport
+from .ai_cache import MealTextCache, MealPhotoCache
+from .database import engine, SessionLocal, get_db, create_tables, get_pool_status
 
 __all__ = [
     "Base",
     "User", 
     "UserProfile",
+    "NutritionGoal",
     "Meal",
+    "MealArchive",
+    "DailyNutrition",
+    "WeeklyReport",
+    "MealTextCache",
+    "MealPhotoCache",
     "Subscription",
+    "UserStreak",
     "UserRole",
     "ActivityLevel", 
     "GoalType",
+    "Sex",
     "engine",
     "SessionLocal",
     "get_db",
-    "create_tables"
+    "create_tables",
+    "get_pool_status"
 ]
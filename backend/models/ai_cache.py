@@ -0,0 +1,33 @@
+from sqlalchemy import Column, String, Text, Integer, DateTime, JSON, ForeignKey, Index, Uuid
+from datetime import datetime
+from .user import Base
+
+class MealTextCache(Base):
+    __tablename__ = "meal_text_cache"
+    
+    cache_key = Column(String(64), primary_key=True)
+    model_version = Column(String(32), nullable=False)
+    description = Column(Text, nullable=False)
+    response = Column(JSON, nullable=False)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    expires_at = Column(DateTime, nullable=False)
+    
+    __table_args__ = (
+        Index('ix_meal_text_cache_expires_at', 'expires_at'),
+    )
+
+class MealPhotoCache(Base):
+    __tablename__ = "meal_photo_cache"
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    user_id = Column(Uuid(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    image_hash = Column(String(16), nullable=False)
+    model_version = Column(String(32), nullable=False)
+    response = Column(JSON, nullable=False)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    expires_at = Column(DateTime, nullable=False)
+    
+    __table_args__ = (
+        Index('ix_meal_photo_cache_user_created', 'user_id', 'created_at'),
+        Index('ix_meal_photo_cache_expires_at', 'expires_at'),
+    )
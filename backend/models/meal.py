@@ -1,5 +1,4 @@
-from sqlalchemy import Column, String, Integer, Float, DateTime, ForeignKey, Index
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, Integer, Float, Date, DateTime, ForeignKey, Index, Uuid, JSON
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from .user import Base
@@ -8,7 +7,7 @@ class Meal(Base):
     __tablename__ = "meals"
     
     id = Column(Integer, primary_key=True, autoincrement=True)
-    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    user_id = Column(Uuid(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
     description = Column(String, nullable=True)
     image_url = Column(String, nullable=True)
     calories = Column(Float, nullable=True)
@@ -23,4 +22,46 @@ class Meal(Base):
     
     __table_args__ = (
         Index('ix_meals_user_logged', 'user_id', 'logged_at'),
-    )
\ No newline at end of file
+        {"sqlite_autoincrement": True},
+    )
+
+class MealArchive(Base):
+    __tablename__ = "meals_archive"
+    
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    user_id = Column(Uuid(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    description = Column(String, nullable=True)
+    image_url = Column(String, nullable=True)
+    calories = Column(Float, nullable=True)
+    protein = Column(Float, nullable=True)
+    carbs = Column(Float, nullable=True)
+    fat = Column(Float, nullable=True)
+    fiber = Column(Float, nullable=True)
+    water = Column(Float, nullable=True)
+    logged_at = Column(DateTime, nullable=False)
+    archived_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    
+    __table_args__ = (
+        Index('ix_meals_archive_user_logged', 'user_id', 'logged_at'),
+    )
+
+class DailyNutrition(Base):
+    __tablename__ = "daily_nutrition"
+    
+    user_id = Column(Uuid(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    meal_count = Column(Integer, nullable=False, default=0)
+    calories = Column(Float, nullable=False, default=0)
+    protein = Column(Float, nullable=False, default=0)
+    carbs = Column(Float, nullable=False, default=0)
+    fat = Column(Float, nullable=False, default=0)
+    fiber = Column(Float, nullable=False, default=0)
+    water = Column(Float, nullable=False, default=0)
+
+class WeeklyReport(Base):
+    __tablename__ = "weekly_reports"
+    
+    user_id = Column(Uuid(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    week_start = Column(Date, primary_key=True)
+    report = Column(JSON, nullable=False)
+    computed_at = Column(DateTime, nullable=False, default=datetime.utcnow)
\ No newline at end of file
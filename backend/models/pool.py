@@ -0,0 +1,96 @@
+from typing import Any, Deque, Dict
+from collections import deque
+import threading
+import time
+from sqlalchemy import exc, event
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, Pool
+
+class PoolStats:
+    def __init__(self, window: int = 1000):
+        self.lock = threading.Lock()
+        self.recent_waits: Deque[float] = deque(maxlen=window)
+        self.checkouts = 0
+        self.checked_out = 0
+        self.timeouts = 0
+        self.invalidated = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+    
+    def record_wait(self, seconds: float):
+        with self.lock:
+            self.checkouts += 1
+            self.total_wait += seconds
+            self.max_wait = max(self.max_wait, seconds)
+            self.recent_waits.append(seconds)
+    
+    def record_timeout(self):
+        with self.lock:
+            self.timeouts += 1
+    
+    def snapshot(self) -> Dict[str, Any]:
+        with self.lock:
+            waits = sorted(self.recent_waits)
+            return {
+                "checkouts": self.checkouts,
+                "checked_out": self.checked_out,
+                "timeouts": self.timeouts,
+                "invalidated": self.invalidated,
+                "wait_ms": {
+                    "avg": self.total_wait / self.checkouts * 1000 if self.checkouts else 0.0,
+                    "p50": _percentile_ms(waits, 0.5),
+                    "p95": _percentile_ms(waits, 0.95),
+                    "p99": _percentile_ms(waits, 0.99),
+                    "max": self.max_wait * 1000,
+                },
+            }
+
+def _percentile_ms(values, fraction: float) -> float:
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(fraction * len(values)))] * 1000
+
+pool_stats = PoolStats()
+
+class _TimedCheckout:
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            pool_stats.record_timeout()
+            raise
+        finally:
+            pool_stats.record_wait(time.perf_counter() - started)
+
+class InstrumentedQueuePool(_TimedCheckout, AsyncAdaptedQueuePool):
+    pass
+
+class InstrumentedNullPool(_TimedCheckout, NullPool):
+    pass
+
+@event.listens_for(Pool, "checkout")
+def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+    with pool_stats.lock:
+        pool_stats.checked_out += 1
+
+@event.listens_for(Pool, "checkin")
+def _on_checkin(dbapi_connection, connection_record):
+    with pool_stats.lock:
+        pool_stats.checked_out -= 1
+
+@event.listens_for(Pool, "invalidate")
+def _on_invalidate(dbapi_connection, connection_record, exception):
+    with pool_stats.lock:
+        pool_stats.invalidated += 1
+
+def describe_pool(pool: Pool) -> Dict[str, Any]:
+    details: Dict[str, Any] = {"class": type(pool).__name__, "status": pool.status()}
+    if isinstance(pool, AsyncAdaptedQueuePool):
+        details.update({
+            "size": pool.size(),
+            "max_overflow": pool._max_overflow,
+            "idle": pool.checkedin(),
+            "in_use": pool.checkedout(),
+            "overflow": pool.overflow(),
+        })
+    return {**details, **pool_stats.snapshot()}
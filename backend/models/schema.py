@@ -0,0 +1,25 @@
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.types import SchemaType
+from .user import Base
+
+def add_missing_columns(connection: Connection):
+    inspector = inspect(connection)
+    preparer = connection.dialect.identifier_preparer
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing or not (column.nullable or column.server_default is not None):
+                continue
+            
+            if isinstance(column.type, SchemaType):
+                column.type.create(connection, checkfirst=True)
+            column_type = column.type.compile(dialect=connection.dialect)
+            if column.server_default is not None:
+                column_type += f" NOT NULL DEFAULT {column.server_default.arg}"
+            connection.execute(text(
+                f"ALTER TABLE {preparer.format_table(table)} ADD COLUMN {preparer.format_column(column)} {column_type}"
+            ))
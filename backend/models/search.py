@@ -0,0 +1,75 @@
+from typing import Dict, List
+import logging
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import DBAPIError
+
+logger = logging.getLogger(__name__)
+
+SEARCH_TABLES = (
+    ("meals", "meals_fts"),
+    ("meals_archive", "meals_archive_fts"),
+)
+
+search_index_status: Dict[str, bool] = {}
+
+def postgres_search_ddl(table: str, composite: bool = True):
+    if not composite:
+        return [
+            f"CREATE INDEX IF NOT EXISTS ix_{table}_description_trgm ON {table} USING gin (description gin_trgm_ops)",
+        ]
+    return [
+        f"CREATE INDEX IF NOT EXISTS ix_{table}_user_description_trgm ON {table} USING gin (user_id, description gin_trgm_ops)",
+        f"DROP INDEX IF EXISTS ix_{table}_description_trgm",
+    ]
+
+def sqlite_search_ddl(table: str, fts: str):
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+        f"description, content='{table}', content_rowid='id', tokenize='trigram')",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_insert AFTER INSERT ON {table} BEGIN "
+        f"INSERT INTO {fts}(rowid, description) VALUES (new.id, new.description); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_delete AFTER DELETE ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, description) VALUES ('delete', old.id, old.description); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_update AFTER UPDATE OF description ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, description) VALUES ('delete', old.id, old.description); "
+        f"INSERT INTO {fts}(rowid, description) VALUES (new.id, new.description); END",
+    ]
+
+def search_index_available(dialect: str) -> bool:
+    return search_index_status.get(dialect, True)
+
+def _run_ddl(connection: Connection, statements: List[str], savepoint: bool) -> bool:
+    try:
+        if savepoint:
+            with connection.begin_nested():
+                for statement in statements:
+                    connection.execute(text(statement))
+        else:
+            for statement in statements:
+                connection.execute(text(statement))
+    except DBAPIError as error:
+        logger.warning("Search index DDL failed, falling back to substring search: %s", error.orig)
+        return False
+    return True
+
+def create_search_index(connection: Connection):
+    dialect = connection.dialect.name
+    if dialect == "postgresql":
+        available = _run_ddl(connection, ["CREATE EXTENSION IF NOT EXISTS pg_trgm"], True)
+        if available:
+            composite = _run_ddl(connection, ["CREATE EXTENSION IF NOT EXISTS btree_gin"], True)
+            for table, _ in SEARCH_TABLES:
+                available = _run_ddl(connection, postgres_search_ddl(table, composite), True) and available
+        search_index_status[dialect] = available
+    elif dialect == "sqlite":
+        available = True
+        for table, fts in SEARCH_TABLES:
+            exists = connection.execute(
+                text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"), {"name": fts}
+            ).first()
+            statements = sqlite_search_ddl(table, fts)
+            if not exists:
+                statements.append(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+            available = _run_ddl(connection, statements, False) and available
+        search_index_status[dialect] = available
@@ -1,5 +1,4 @@
-from sqlalchemy import Column, String, Integer, Float, DateTime, Boolean, Enum, ForeignKey, Index
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, Integer, Float, Date, DateTime, Boolean, Enum, ForeignKey, Index, Uuid
 from sqlalchemy.orm import relationship, DeclarativeBase
 import enum
 import uuid
@@ -22,39 +21,85 @@ class GoalType(enum.Enum):
     MUSCLE_GAIN = "muscle_gain"
     MAINTAIN = "maintain"
 
+class Sex(enum.Enum):
+    MALE = "male"
+    FEMALE = "female"
+
 class User(Base):
     __tablename__ = "users"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
     email = Column(String, unique=True, nullable=False, index=True)
     role = Column(Enum(UserRole), nullable=False, default=UserRole.PREMIUM)
     created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    data_version = Column(Integer, nullable=False, default=0, server_default="0")
     
     profile = relationship("UserProfile", back_populates="user", uselist=False, cascade="all, delete-orphan")
     meals = relationship("Meal", back_populates="user", cascade="all, delete-orphan")
     subscriptions = relationship("Subscription", back_populates="user", cascade="all, delete-orphan")
+    streak = relationship("UserStreak", back_populates="user", uselist=False, cascade="all, delete-orphan")
+    goal_versions = relationship("NutritionGoal", back_populates="user", cascade="all, delete-orphan", order_by="NutritionGoal.effective_from")
 
 class UserProfile(Base):
     __tablename__ = "user_profiles"
     
     id = Column(Integer, primary_key=True, autoincrement=True)
-    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    user_id = Column(Uuid(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
     age = Column(Integer, nullable=False)
     height = Column(Float, nullable=False)
     weight = Column(Float, nullable=False)
     activity_level = Column(Enum(ActivityLevel), nullable=False)
     goal = Column(Enum(GoalType), nullable=False)
+    sex = Column(Enum(Sex), nullable=True)
     
     user = relationship("User", back_populates="profile")
 
+class NutritionGoal(Base):
+    __tablename__ = "nutrition_goals"
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    user_id = Column(Uuid(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    effective_from = Column(Date, nullable=False)
+    formula_version = Column(Integer, nullable=False)
+    age = Column(Integer, nullable=False)
+    height = Column(Float, nullable=False)
+    weight = Column(Float, nullable=False)
+    activity_level = Column(Enum(ActivityLevel), nullable=False)
+    goal = Column(Enum(GoalType), nullable=False)
+    sex = Column(Enum(Sex), nullable=True)
+    bmr = Column(Float, nullable=False)
+    tdee = Column(Float, nullable=False)
+    calorie_goal = Column(Float, nullable=False)
+    protein = Column(Float, nullable=False)
+    carbs = Column(Float, nullable=False)
+    fat = Column(Float, nullable=False)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    
+    user = relationship("User", back_populates="goal_versions")
+    
+    __table_args__ = (
+        Index('ix_nutrition_goals_user_effective', 'user_id', 'effective_from', unique=True),
+    )
+
 class Subscription(Base):
     __tablename__ = "subscriptions"
     
     id = Column(Integer, primary_key=True, autoincrement=True)
-    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    user_id = Column(Uuid(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
     plan = Column(String, nullable=False)
     start_date = Column(DateTime, nullable=False, default=datetime.utcnow)
     end_date = Column(DateTime, nullable=True)
     active = Column(Boolean, nullable=False, default=True)
     
-    user = relationship("User", back_populates="subscriptions")
\ No newline at end of file
+    user = relationship("User", back_populates="subscriptions")
+
+class UserStreak(Base):
+    __tablename__ = "user_streaks"
+    
+    user_id = Column(Uuid(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    current_streak = Column(Integer, nullable=False, default=0)
+    longest_streak = Column(Integer, nullable=False, default=0)
+    last_logged_date = Column(Date, nullable=True)
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    user = relationship("User", back_populates="streak")
\ No newline at end of file
@@ -1,17 +1,21 @@
 from .user import (
     User, UserCreate, UserUpdate, UserProfile, UserProfileCreate, 
-    UserProfileUpdate, Subscription, SubscriptionCreate
+    UserProfileUpdate, NutritionGoalVersion, Subscription, SubscriptionCreate
 )
 from .meal import (
-    Meal, MealCreate, MealUpdate, PhotoAnalysisRequest, PhotoAnalysisResponse,
-    ChatLogRequest, ChatLogResponse, DailyNutritionSummary, WeeklyProgressData
+    Meal, MealCreate, MealUpdate, MealSearchResult, MealPage, PaginationMode,
+    ImportFormat, MealImportError, MealImportResult, ExportFormat, ExportDataset, PhotoAnalysisRequest, PhotoAnalysisResponse,
+    ChatLogRequest, ChatLogResponse, ParseSource, BarcodeProduct, DailyNutritionSummary, WeeklyProgressData,
+    ProgressGranularity, ProgressBucket, ProgressRangeData, HeatmapCell, YearHeatmapData
 )
 from .auth import TokenData, UserClaims
 
 __all__ = [
     "User", "UserCreate", "UserUpdate", "UserProfile", "UserProfileCreate", 
-    "UserProfileUpdate", "Subscription", "SubscriptionCreate",
-    "Meal", "MealCreate", "MealUpdate", "PhotoAnalysisRequest", "PhotoAnalysisResponse",
-    "ChatLogRequest", "ChatLogResponse", "DailyNutritionSummary", "WeeklyProgressData",
+    "UserProfileUpdate", "NutritionGoalVersion", "Subscription", "SubscriptionCreate",
+    "Meal", "MealCreate", "MealUpdate", "MealSearchResult", "MealPage", "PaginationMode",
+    "ImportFormat", "MealImportError", "MealImportResult", "ExportFormat", "ExportDataset", "PhotoAnalysisRequest", "PhotoAnalysisResponse",
+    "ChatLogRequest", "ChatLogResponse", "ParseSource", "BarcodeProduct", "DailyNutritionSummary", "WeeklyProgressData",
+    "ProgressGranularity", "ProgressBucket", "ProgressRangeData", "HeatmapCell", "YearHeatmapData",
     "TokenData", "UserClaims"
 ]
\ No newline at end of file
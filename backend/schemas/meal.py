@@ -1,7 +1,8 @@
 from pydantic import BaseModel, Field
 from typing import Optional
-from datetime import datetime
+from datetime import datetime, date
 from uuid import UUID
+import enum
 
 class NutritionBase(BaseModel):
     calories: Optional[float] = Field(None, ge=0)
@@ -35,6 +36,40 @@ class Meal(MealBase, NutritionBase):
     class Config:
         from_attributes = True
 
+class PaginationMode(str, enum.Enum):
+    OFFSET = "offset"
+    CURSOR = "cursor"
+
+class MealPage(BaseModel):
+    items: list[Meal]
+    next_cursor: Optional[str] = None
+
+class ImportFormat(str, enum.Enum):
+    CSV = "csv"
+    NDJSON = "ndjson"
+
+class ExportFormat(str, enum.Enum):
+    CSV = "csv"
+    NDJSON = "ndjson"
+    PARQUET = "parquet"
+
+class ExportDataset(str, enum.Enum):
+    MEALS = "meals"
+    DAILY = "daily"
+
+class MealImportError(BaseModel):
+    row: int
+    error: str
+
+class MealImportResult(BaseModel):
+    imported: int
+    failed: int
+    errors: list[MealImportError]
+
+class MealSearchResult(Meal):
+    score: float = 0.0
+    snippet: Optional[str] = None
+
 class PhotoAnalysisRequest(BaseModel):
     image_url: str
 
@@ -45,9 +80,25 @@ class PhotoAnalysisResponse(NutritionBase):
 class ChatLogRequest(BaseModel):
     description: str
 
+class ParseSource(str, enum.Enum):
+    LOCAL = "local"
+    CACHE = "cache"
+    MODEL = "model"
+    FALLBACK = "fallback"
+
 class ChatLogResponse(NutritionBase):
     parsed_description: str
     confidence: float = Field(ge=0, le=1)
+    source: ParseSource = ParseSource.MODEL
+
+class BarcodeProduct(BaseModel):
+    barcode: str
+    name: str
+    brand: Optional[str] = None
+    serving_grams: Optional[float] = None
+    grams: float
+    per_100g: NutritionBase
+    meal: MealCreate
 
 class DailyNutritionSummary(NutritionBase):
     date: datetime
@@ -63,4 +114,65 @@ class WeeklyProgressData(BaseModel):
     avg_calories: float
     avg_protein: float
     avg_carbs: float
-    avg_fat: float
\ No newline at end of file
+    avg_fat: float
+
+class ProgressGranularity(str, enum.Enum):
+    DAY = "day"
+    WEEK = "week"
+    MONTH = "month"
+
+class ProgressBucket(NutritionBase):
+    start: datetime
+    end: datetime
+    meal_count: int
+    days_logged: int
+    calorie_goal: Optional[float] = None
+    protein_goal: Optional[float] = None
+    carbs_goal: Optional[float] = None
+    fat_goal: Optional[float] = None
+
+class ProgressRangeData(BaseModel):
+    start: datetime
+    end: datetime
+    granularity: ProgressGranularity
+    buckets: list[ProgressBucket]
+    calorie_goal: Optional[float] = None
+    protein_goal: Optional[float] = None
+    carbs_goal: Optional[float] = None
+    fat_goal: Optional[float] = None
+
+class HeatmapCell(BaseModel):
+    day: date
+    meal_count: int
+    total_calories: float
+
+class YearHeatmapData(BaseModel):
+    year: int
+    days: list[HeatmapCell]
+
+class AnalyticsTrend(BaseModel):
+    average: Optional[float] = None
+    daily: list[Optional[float]]
+    moving_averages: dict[int, list[Optional[float]]]
+
+class WeekdayPattern(BaseModel):
+    weekday: int
+    days_logged: int
+    logging_rate: float
+    calories: Optional[float] = None
+    protein: Optional[float] = None
+    carbs: Optional[float] = None
+    fat: Optional[float] = None
+
+class NutritionAnalytics(BaseModel):
+    start: date
+    end: date
+    windows: list[int]
+    days_logged: int
+    logging_rate: float
+    meal_counts: list[int]
+    nutrients: dict[str, AnalyticsTrend]
+    macro_ratios: dict[str, AnalyticsTrend]
+    adherence: dict[str, AnalyticsTrend]
+    adherence_tolerance: float
+    weekdays: list[WeekdayPattern]
\ No newline at end of file
@@ -1,8 +1,8 @@
 from pydantic import BaseModel, EmailStr, Field
 from typing import Optional
-from datetime import datetime
+from datetime import datetime, date
 from uuid import UUID
-from models.user import UserRole, ActivityLevel, GoalType
+from models.user import UserRole, ActivityLevel, GoalType, Sex
 
 class UserProfileBase(BaseModel):
     age: int = Field(ge=1, le=120)
@@ -10,6 +10,7 @@ class UserProfileBase(BaseModel):
     weight: float = Field(ge=20, le=500)
     activity_level: ActivityLevel
     goal: GoalType
+    sex: Optional[Sex] = None
 
 class UserProfileCreate(UserProfileBase):
     pass
@@ -20,6 +21,7 @@ class UserProfileUpdate(BaseModel):
     weight: Optional[float] = Field(None, ge=20, le=500)
     activity_level: Optional[ActivityLevel] = None
     goal: Optional[GoalType] = None
+    sex: Optional[Sex] = None
 
 class UserProfile(UserProfileBase):
     id: int
@@ -28,6 +30,25 @@ class UserProfile(UserProfileBase):
     class Config:
         from_attributes = True
 
+class NutritionGoalVersion(BaseModel):
+    effective_from: date
+    formula_version: int
+    age: int
+    height: float
+    weight: float
+    activity_level: ActivityLevel
+    goal: GoalType
+    sex: Optional[Sex] = None
+    bmr: float
+    tdee: float
+    calorie_goal: float
+    protein: float
+    carbs: float
+    fat: float
+    
+    class Config:
+        from_attributes = True
+
 class UserBase(BaseModel):
     email: EmailStr
 
@@ -0,0 +1,27 @@
+import argparse
+import asyncio
+from typing import Tuple
+from uuid import UUID
+from models.database import SessionLocal, create_tables
+from services.archive_service import archive_old_meals
+from utils.config import settings
+
+async def run(user_id: UUID = None, batch_size: int = 5000) -> Tuple[int, int]:
+    await create_tables()
+    async with SessionLocal() as db:
+        return await archive_old_meals(db, batch_size, user_id)
+
+def main():
+    parser = argparse.ArgumentParser(description="Move meals older than MEAL_ARCHIVE_AFTER_DAYS into the meals_archive table")
+    parser.add_argument("--user-id", type=UUID, default=None, help="Only archive meals for this user")
+    parser.add_argument("--batch-size", type=int, default=5000, help="Meals moved per transaction")
+    args = parser.parse_args()
+    
+    archived, restored = asyncio.run(run(args.user_id, args.batch_size))
+    if settings.meal_archive_after_days <= 0:
+        print(f"Archiving disabled, restored {restored} meals to the hot table")
+    else:
+        print(f"Archived {archived} meals older than {settings.meal_archive_after_days} days, restored {restored} meals")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+import argparse
+import csv
+import gzip
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+import numpy as np
+from services.product_service import BRAND_BYTES, NAME_BYTES, PRODUCT_DTYPE, normalize_barcode, product_index_path, write_product_index
+from services.rollup_service import NUTRIENT_FIELDS
+
+NUTRIENT_KEYS = {
+    "calories": "energy-kcal_100g",
+    "protein": "proteins_100g",
+    "carbs": "carbohydrates_100g",
+    "fat": "fat_100g",
+    "fiber": "fiber_100g",
+    "water": "water_100g",
+}
+KILOJOULES_PER_KCAL = 4.184
+CHUNK_SIZE = 100000
+
+def _open(path: Path):
+    if path.suffix == ".gz":
+        return gzip.open(path, "rt", encoding="utf-8", newline="")
+    return open(path, encoding="utf-8", newline="")
+
+def _detect_format(path: Path) -> str:
+    suffixes = [suffix for suffix in path.suffixes if suffix != ".gz"]
+    if suffixes and suffixes[-1] in (".jsonl", ".ndjson", ".json"):
+        return "jsonl"
+    return "csv"
+
+def _read_rows(path: Path, dump_format: str) -> Iterator[Tuple[Dict[str, Any], Callable[[str], Any]]]:
+    with _open(path) as handle:
+        if dump_format == "jsonl":
+            for line in handle:
+                if line.strip():
+                    record = json.loads(line)
+                    nutriments = record.get("nutriments") or {}
+                    yield record, nutriments.get
+            return
+        
+        csv.field_size_limit(sys.maxsize)
+        sample = handle.readline()
+        delimiter = "\t" if sample.count("\t") > sample.count(",") else ","
+        for row in csv.DictReader(handle, fieldnames=next(csv.reader([sample], delimiter=delimiter)), delimiter=delimiter):
+            yield row, row.get
+
+def _number(value: Any, upper: float) -> float:
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return np.nan
+    return number if 0 <= number <= upper else np.nan
+
+def _truncate(text: str, limit: int) -> bytes:
+    text = " ".join(text.split())
+    return text.encode("utf-8")[:limit].decode("utf-8", errors="ignore").encode("utf-8")
+
+def parse_product(row: Dict[str, Any], nutrient: Callable[[str], Any]) -> Optional[Tuple[int, tuple]]:
+    code = normalize_barcode(str(row.get("code") or ""))
+    if code is None:
+        return None
+    
+    values = {field: _number(nutrient(key), 1000.0 if field == "calories" else 100.0) for field, key in NUTRIENT_KEYS.items()}
+    if not np.isfinite(values["calories"]):
+        values["calories"] = _number(nutrient("energy_100g"), 1000.0 * KILOJOULES_PER_KCAL) / KILOJOULES_PER_KCAL
+    if not np.isfinite(values["calories"]):
+        return None
+    
+    return code, (
+        *[values[field] for field in NUTRIENT_FIELDS],
+        _number(row.get("serving_quantity"), 5000.0),
+        _truncate(str(row.get("product_name") or ""), NAME_BYTES),
+        _truncate(str(row.get("brands") or "").split(",")[0], BRAND_BYTES),
+    )
+
+def build_product_index(dump: Path, output: Path, dump_format: str) -> Dict[str, float]:
+    code_chunks: List[np.ndarray] = []
+    product_chunks: List[np.ndarray] = []
+    codes: List[int] = []
+    products: List[tuple] = []
+    rows = 0
+    started = time.perf_counter()
+    
+    def flush():
+        if codes:
+            code_chunks.append(np.array(codes, dtype="<u8"))
+            product_chunks.append(np.array(products, dtype=PRODUCT_DTYPE))
+            codes.clear()
+            products.clear()
+    
+    for row, nutrient in _read_rows(dump, dump_format):
+        rows += 1
+        parsed = parse_product(row, nutrient)
+        if parsed is not None:
+            codes.append(parsed[0])
+            products.append(parsed[1])
+        if len(codes) >= CHUNK_SIZE:
+            flush()
+        if rows % 500000 == 0:
+            elapsed = time.perf_counter() - started
+            print(f"{rows} rows read, {sum(map(len, code_chunks)) + len(codes)} products, {rows / elapsed:.0f} rows/s", flush=True)
+    flush()
+    
+    output.parent.mkdir(parents=True, exist_ok=True)
+    written = write_product_index(
+        output,
+        np.concatenate(code_chunks) if code_chunks else np.zeros(0, dtype="<u8"),
+        np.concatenate(product_chunks) if product_chunks else np.zeros(0, dtype=PRODUCT_DTYPE)
+    )
+    return {"rows": rows, "products": written, "seconds": time.perf_counter() - started}
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the memory-mapped barcode product index from a product dump")
+    parser.add_argument("dump", type=Path, help="Open Food Facts style CSV/TSV or JSONL dump, optionally gzipped")
+    parser.add_argument("--output", type=Path, default=None, help="Index file to write (default: PRODUCT_INDEX_PATH or data/products.idx)")
+    parser.add_argument("--format", choices=("auto", "csv", "jsonl"), default="auto", help="Dump format")
+    args = parser.parse_args()
+    
+    dump_format = _detect_format(args.dump) if args.format == "auto" else args.format
+    output = args.output or product_index_path()
+    summary = build_product_index(args.dump, output, dump_format)
+    size = output.stat().st_size / (1024 * 1024)
+    print(
+        f"Indexed {summary['products']} products from {summary['rows']} rows in {summary['seconds']:.1f}s; "
+        f"wrote {output} ({size:.1f} MiB)"
+    )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+import argparse
+import asyncio
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional
+from uuid import UUID
+from sqlalchemy import func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from models.database import SessionLocal, create_tables
+from models.user import User, UserStreak
+from models.meal import WeeklyReport
+from services.auth_service import USER_LOAD_OPTIONS
+from services.meal_service import compute_weekly_progress
+from services.report_service import last_completed_week_start, store_weekly_report
+from services.streak_service import recompute_user_streak
+from services.data_version_service import bump_data_version
+
+STREAK_FIELDS = ("current_streak", "longest_streak", "last_logged_date")
+
+_worker_loop: Optional[asyncio.AbstractEventLoop] = None
+
+def _pending_users(week_starts: List[date], force: bool, user_id: Optional[UUID]):
+    query = select(User.id)
+    if not force:
+        query = query.where(or_(*[
+            ~select(WeeklyReport.user_id).where(
+                WeeklyReport.user_id == User.id,
+                WeeklyReport.week_start == week_start
+            ).exists()
+            for week_start in week_starts
+        ]))
+    if user_id:
+        query = query.where(User.id == user_id)
+    return query
+
+async def _stored_weeks(user_ids: List[UUID], week_starts: List[date], db: AsyncSession) -> set:
+    rows = await db.execute(
+        select(WeeklyReport.user_id, WeeklyReport.week_start).where(
+            WeeklyReport.user_id.in_(user_ids),
+            WeeklyReport.week_start.in_(week_starts)
+        )
+    )
+    return set(rows.all())
+
+async def process_chunk(user_ids: List[UUID], week_starts: List[date], force: bool) -> Dict[str, int]:
+    counts = {"users": 0, "reports": 0, "stale": 0, "streaks": 0}
+    async with SessionLocal() as db:
+        stored = set() if force else await _stored_weeks(user_ids, week_starts, db)
+        
+        for user_id in user_ids:
+            user = await db.scalar(
+                select(User)
+                .options(*USER_LOAD_OPTIONS)
+                .where(User.id == user_id)
+                .with_for_update(read=True, of=User)
+                .execution_options(populate_existing=True)
+            )
+            if user is None:
+                continue
+            
+            for week_start in week_starts:
+                if (user.id, week_start) in stored:
+                    continue
+                report = await compute_weekly_progress(user, week_start, db)
+                if await store_weekly_report(user, report, db):
+                    counts["reports"] += 1
+                else:
+                    counts["stale"] += 1
+            
+            previous = await db.get(UserStreak, user.id)
+            before = {field: getattr(previous, field) for field in STREAK_FIELDS} if previous else None
+            streak = await recompute_user_streak(user.id, db)
+            if before != {field: getattr(streak, field) for field in STREAK_FIELDS}:
+                await bump_data_version(user.id, db)
+                counts["streaks"] += 1
+            counts["users"] += 1
+            await db.commit()
+    return counts
+
+def _init_worker():
+    global _worker_loop
+    _worker_loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(_worker_loop)
+
+def _run_chunk(user_ids: List[UUID], week_starts: List[date], force: bool) -> Dict[str, int]:
+    return _worker_loop.run_until_complete(process_chunk(user_ids, week_starts, force))
+
+async def precompute_weekly_reports(
+    week_starts: List[date],
+    workers: int = 4,
+    chunk_size: int = 200,
+    force: bool = False,
+    user_id: Optional[UUID] = None
+) -> Dict[str, float]:
+    await create_tables()
+    query = _pending_users(week_starts, force, user_id)
+    async with SessionLocal() as db:
+        pending = await db.scalar(select(func.count()).select_from(query.subquery()))
+    
+    totals = {"users": 0, "reports": 0, "stale": 0, "streaks": 0}
+    started = time.perf_counter()
+    
+    def record(counts: Dict[str, int]):
+        for key, value in counts.items():
+            totals[key] += value
+        elapsed = time.perf_counter() - started
+        rate = totals["users"] / elapsed if elapsed else 0.0
+        remaining = (pending - totals["users"]) / rate if rate else 0.0
+        print(
+            f"{totals['users']}/{pending} users, {totals['reports']} reports, "
+            f"{rate:.1f} users/s, ~{remaining:.0f}s remaining",
+            flush=True
+        )
+    
+    loop = asyncio.get_running_loop()
+    pool = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn"), initializer=_init_worker) if workers > 0 else None
+    in_flight = set()
+    try:
+        last_id = None
+        while True:
+            chunk_query = query if last_id is None else query.where(User.id > last_id)
+            async with SessionLocal() as db:
+                user_ids = list(await db.scalars(chunk_query.order_by(User.id).limit(chunk_size)))
+            if not user_ids:
+                break
+            last_id = user_ids[-1]
+            
+            if pool is None:
+                record(await process_chunk(user_ids, week_starts, force))
+                continue
+            
+            in_flight.add(loop.run_in_executor(pool, _run_chunk, user_ids, week_starts, force))
+            if len(in_flight) >= workers * 2:
+                done, in_flight = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    record(future.result())
+        
+        for future in asyncio.as_completed(in_flight):
+            record(await future)
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+    
+    elapsed = time.perf_counter() - started
+    return {**totals, "pending": pending, "seconds": elapsed}
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompute weekly progress reports and streaks for completed weeks")
+    parser.add_argument("--week-start", type=date.fromisoformat, default=None, help="First day of the newest week to compute (default: last completed Monday-Sunday week)")
+    parser.add_argument("--weeks", type=int, default=1, help="Number of consecutive weeks ending with --week-start")
+    parser.add_argument("--workers", type=int, default=min(4, os.cpu_count() or 1), help="Worker processes; 0 runs in-process")
+    parser.add_argument("--chunk-size", type=int, default=200, help="Users per worker task")
+    parser.add_argument("--force", action="store_true", help="Recompute reports that are already stored")
+    parser.add_argument("--user-id", type=UUID, default=None, help="Only process this user")
+    args = parser.parse_args()
+    
+    newest = args.week_start or last_completed_week_start()
+    week_starts = [newest - timedelta(days=7 * offset) for offset in range(args.weeks)]
+    if newest + timedelta(days=7) > datetime.utcnow().date():
+        parser.error("--week-start must begin a week that has already ended")
+    
+    summary = asyncio.run(precompute_weekly_reports(week_starts, args.workers, args.chunk_size, args.force, args.user_id))
+    rate = summary["users"] / summary["seconds"] if summary["seconds"] else 0.0
+    print(
+        f"Processed {summary['users']} users in {summary['seconds']:.2f}s ({rate:.1f} users/s): "
+        f"{summary['reports']} reports stored, {summary['stale']} skipped after concurrent edits, "
+        f"{summary['streaks']} streaks corrected"
+    )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,21 @@
+import argparse
+import asyncio
+from typing import Tuple
+from models.database import SessionLocal, create_tables
+from services.parse_cache_service import purge_expired_meal_text_cache
+from services.photo_cache_service import purge_expired_meal_photo_cache
+
+async def run() -> Tuple[int, int]:
+    await create_tables()
+    async with SessionLocal() as db:
+        return await purge_expired_meal_text_cache(db), await purge_expired_meal_photo_cache(db)
+
+def main():
+    parser = argparse.ArgumentParser(description="Delete expired AI result cache entries")
+    parser.parse_args()
+    
+    text_purged, photo_purged = asyncio.run(run())
+    print(f"Purged {text_purged} expired meal text and {photo_purged} expired meal photo cache entries")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,27 @@
+import argparse
+import asyncio
+from uuid import UUID
+from models.database import SessionLocal, create_tables
+from services.rollup_service import rebuild_daily_nutrition
+from services.data_version_service import bump_data_versions
+from services.report_service import clear_weekly_reports
+
+async def run(user_id: UUID = None) -> int:
+    await create_tables()
+    async with SessionLocal() as db:
+        rows = await rebuild_daily_nutrition(db, user_id)
+        await clear_weekly_reports([user_id] if user_id else None, db)
+        await bump_data_versions([user_id] if user_id else None, db)
+        await db.commit()
+        return rows
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild the daily_nutrition rollup from raw meals")
+    parser.add_argument("--user-id", type=UUID, default=None, help="Only rebuild rollups for this user")
+    args = parser.parse_args()
+    
+    rows = asyncio.run(run(args.user_id))
+    print(f"Rebuilt {rows} daily_nutrition rows")
+
+if __name__ == "__main__":
+    main()
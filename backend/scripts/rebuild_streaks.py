@@ -0,0 +1,58 @@
+import argparse
+import asyncio
+from uuid import UUID
+from sqlalchemy import select
+from models.database import SessionLocal, create_tables
+from models.user import User, UserStreak
+from services.streak_service import compute_streak, recompute_user_streak
+from services.data_version_service import bump_data_version
+
+STREAK_FIELDS = ("current_streak", "longest_streak", "last_logged_date")
+
+async def rebuild_streaks(user_id: UUID = None, verify_only: bool = False, batch_size: int = 500):
+    await create_tables()
+    checked = 0
+    mismatched = 0
+    async with SessionLocal() as db:
+        query = select(User.id).order_by(User.id)
+        if user_id:
+            query = query.where(User.id == user_id)
+        
+        last_id = None
+        while True:
+            batch_query = query if last_id is None else query.where(User.id > last_id)
+            user_ids = list(await db.scalars(batch_query.limit(batch_size)))
+            if not user_ids:
+                break
+            
+            for current_id in user_ids:
+                expected = await compute_streak(current_id, db, from_meals=True)
+                stored = await db.get(UserStreak, current_id, populate_existing=True)
+                actual = {field: getattr(stored, field) for field in STREAK_FIELDS} if stored else None
+                
+                checked += 1
+                if actual != expected:
+                    mismatched += 1
+                    print(f"{current_id}: stored={actual} expected={expected}")
+                    if not verify_only:
+                        await recompute_user_streak(current_id, db, from_meals=True)
+                        await bump_data_version(current_id, db)
+            
+            await db.commit()
+            last_id = user_ids[-1]
+    
+    return checked, mismatched
+
+def main():
+    parser = argparse.ArgumentParser(description="Recompute stored logging streaks from raw meals")
+    parser.add_argument("--user-id", type=UUID, default=None, help="Only process this user")
+    parser.add_argument("--verify", action="store_true", help="Report mismatches without writing")
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+    
+    checked, mismatched = asyncio.run(rebuild_streaks(args.user_id, args.verify, args.batch_size))
+    action = "found" if args.verify else "fixed"
+    print(f"Checked {checked} users, {action} {mismatched} mismatched streaks")
+
+if __name__ == "__main__":
+    main()
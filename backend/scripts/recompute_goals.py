@@ -0,0 +1,91 @@
+import argparse
+import asyncio
+import time
+from datetime import datetime
+from sqlalchemy import and_, delete, func, insert, select
+from models.database import SessionLocal, create_tables
+from models.user import User, UserProfile, NutritionGoal
+from services.goal_service import GOAL_INPUT_FIELDS, GOAL_OUTPUT_FIELDS
+from services.data_version_service import bump_data_versions
+from utils.helpers import GOAL_FORMULA_VERSION, calculate_goals_bulk
+
+async def recompute_goals(recompute_all: bool = False, batch_size: int = 5000):
+    await create_tables()
+    today = datetime.utcnow().date()
+    written = 0
+    
+    latest_day = (
+        select(NutritionGoal.user_id, func.max(NutritionGoal.effective_from).label("effective_from"))
+        .group_by(NutritionGoal.user_id)
+        .subquery()
+    )
+    latest = (
+        select(NutritionGoal.user_id, NutritionGoal.formula_version)
+        .join(latest_day, and_(
+            NutritionGoal.user_id == latest_day.c.user_id,
+            NutritionGoal.effective_from == latest_day.c.effective_from
+        ))
+        .subquery()
+    )
+    query = (
+        select(UserProfile, User.created_at, latest.c.formula_version)
+        .join(User, User.id == UserProfile.user_id)
+        .outerjoin(latest, latest.c.user_id == UserProfile.user_id)
+        .order_by(UserProfile.id)
+    )
+    
+    async with SessionLocal() as db:
+        last_id = 0
+        while True:
+            rows = (await db.execute(query.where(UserProfile.id > last_id).limit(batch_size))).all()
+            if not rows:
+                break
+            last_id = rows[-1][0].id
+            
+            stale = [
+                (profile, created_at, formula_version) for profile, created_at, formula_version in rows
+                if recompute_all or formula_version != GOAL_FORMULA_VERSION
+            ]
+            if not stale:
+                continue
+            
+            profiles = [profile for profile, _, _ in stale]
+            goals = calculate_goals_bulk(*[
+                [getattr(profile, field) for profile in profiles] for field in GOAL_INPUT_FIELDS
+            ])
+            
+            versions = []
+            for index, (profile, created_at, formula_version) in enumerate(stale):
+                versions.append({
+                    "user_id": profile.user_id,
+                    "effective_from": today if formula_version is not None else created_at.date(),
+                    "formula_version": GOAL_FORMULA_VERSION,
+                    **{field: getattr(profile, field) for field in GOAL_INPUT_FIELDS},
+                    **{field: float(goals[field][index]) for field in GOAL_OUTPUT_FIELDS},
+                })
+            
+            await db.execute(delete(NutritionGoal).where(
+                NutritionGoal.user_id.in_([profile.user_id for profile in profiles]),
+                NutritionGoal.effective_from == today
+            ))
+            await db.execute(insert(NutritionGoal), versions)
+            await bump_data_versions([profile.user_id for profile in profiles], db)
+            await db.commit()
+            written += len(versions)
+            db.expunge_all()
+    
+    return written
+
+def main():
+    parser = argparse.ArgumentParser(description="Recompute stored nutrition goal versions for all profiles")
+    parser.add_argument("--all", action="store_true", help="Write a new version even when the stored one uses the current formula")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    args = parser.parse_args()
+    
+    started = time.perf_counter()
+    written = asyncio.run(recompute_goals(args.all, args.batch_size))
+    elapsed = time.perf_counter() - started
+    print(f"Wrote {written} goal versions in {elapsed:.2f}s")
+
+if __name__ == "__main__":
+    main()
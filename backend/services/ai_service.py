@@ -1,156 +1,154 @@
 from typing import Dict, Any, Optional
 from openai import AsyncOpenAI
+from fastapi import HTTPException
 from utils.config import settings
-from schemas.meal import PhotoAnalysisResponse, ChatLogResponse
+from schemas.meal import PhotoAnalysisResponse, ChatLogResponse, ParseSource
 from models.user import User, GoalType
+from services.image_service import PREPARED_MIME_TYPE, prepare_image
 import json
 import base64
-import re
 
 # Initialize OpenAI client with new v1.x API
 client = AsyncOpenAI(api_key=settings.openai_api_key)
 
-async def analyze_meal_photo(image_url: str) -> PhotoAnalysisResponse:
-    try:
-        # Check if the image is a base64 string
-        if image_url.startswith('data:image'):
-            # Extract the base64 part after the comma
-            base64_match = re.match(r'data:image/[^;]+;base64,(.+)', image_url)
-            if base64_match:
-                base64_image = base64_match.group(1)
-            else:
-                raise ValueError("Invalid base64 image format")
-        else:
-            # Convert URL to base64 (this branch won't be used anymore)
-            try:
-                import httpx
-                async with httpx.AsyncClient() as http_client:
-                    response = await http_client.get(image_url)
-                    response.raise_for_status()
-                    image_data = response.content
-                    base64_image = base64.b64encode(image_data).decode('utf-8')
-            except Exception as e:
-                print(f"Error downloading image: {e}")
-                raise
+PHOTO_ANALYSIS_PARAMS = {
+    "model": "gpt-4o-mini",  # still using the mini, but you could bump to "gpt-4o" for even stronger vision
+    "temperature": 0.0,       # deterministic output
+    "top_p": 1.0,             # full nucleus sampling
+    "max_tokens": 500,
+}
 
-        response = await client.chat.completions.create(
-    model="gpt-4o-mini",  # still using the mini, but you could bump to "gpt-4o" for even stronger vision
-    temperature=0.0,       # deterministic output
-    top_p=1.0,             # full nucleus sampling
-    max_tokens=500,
-    messages=[
-        # 1) Send the image up‐front, so the model “sees” it first
-        {
-            "role": "user",
-            "content": [
-                {
-                    "type": "image_url",
-                    "image_url": {
-                        "url": f"data:image/jpeg;base64,{base64_image}"
-                    }
-                }
-            ]
-        },
-        # 2) Strong system instruction to emphasize deep visual analysis
-        {
-            "role": "system",
-            "content": (
-                "You are a nutrition expert with advanced vision capabilities. "
-                "Examine every visible detail of the meal photo—portion sizes, textures, cooking method, garnish, even plate size—to "
-                "produce the most accurate nutrition estimate possible. "
-                "Return ONLY a JSON object with these fields (all in grams except calories): "
-                "description, calories, protein, carbs, fat, fiber, water, and confidence (0-1)."
-            )
-        },
-        # 3) A brief user prompt to trigger the analysis
-        {
-            "role": "user",
-            "content": [
-                {
-                    "type": "text",
-                    "text": "Please analyze this meal and output ONLY valid JSON."
-                }
-            ]
-        }
-    ]
+PHOTO_ANALYSIS_SYSTEM_PROMPT = (
+    "You are a nutrition expert with advanced vision capabilities. "
+    "Examine every visible detail of the meal photo—portion sizes, textures, cooking method, garnish, even plate size—to "
+    "produce the most accurate nutrition estimate possible. "
+    "Return ONLY a JSON object with these fields (all in grams except calories): "
+    "description, calories, protein, carbs, fat, fiber, water, and confidence (0-1)."
 )
 
-        
-        # Extract JSON from the response
-        response_text = response.choices[0].message.content
-        # Find the JSON part (between { and })
-        json_start = response_text.find('{')
-        json_end = response_text.rfind('}') + 1
-        if json_start >= 0 and json_end > json_start:
-            json_str = response_text[json_start:json_end]
-            result = json.loads(json_str)
-        else:
-            raise ValueError("No valid JSON found in response")
+PHOTO_ANALYSIS_USER_PROMPT = "Please analyze this meal and output ONLY valid JSON."
 
-        return PhotoAnalysisResponse(**result)
+async def request_meal_photo_analysis(image_data: bytes) -> PhotoAnalysisResponse:
+    base64_image = base64.b64encode(image_data).decode('utf-8')
+    response = await client.chat.completions.create(
+        **PHOTO_ANALYSIS_PARAMS,
+        messages=[
+            # 1) Send the image up‐front, so the model “sees” it first
+            {
+                "role": "user",
+                "content": [
+                    {
+                        "type": "image_url",
+                        "image_url": {
+                            "url": f"data:{PREPARED_MIME_TYPE};base64,{base64_image}"
+                        }
+                    }
+                ]
+            },
+            # 2) Strong system instruction to emphasize deep visual analysis
+            {"role": "system", "content": PHOTO_ANALYSIS_SYSTEM_PROMPT},
+            # 3) A brief user prompt to trigger the analysis
+            {
+                "role": "user",
+                "content": [{"type": "text", "text": PHOTO_ANALYSIS_USER_PROMPT}]
+            }
+        ]
+    )
     
+    # Extract JSON from the response
+    response_text = response.choices[0].message.content
+    # Find the JSON part (between { and })
+    json_start = response_text.find('{')
+    json_end = response_text.rfind('}') + 1
+    if json_start >= 0 and json_end > json_start:
+        json_str = response_text[json_start:json_end]
+        result = json.loads(json_str)
+    else:
+        raise ValueError("No valid JSON found in response")
+    
+    return PhotoAnalysisResponse(**result)
+
+def photo_analysis_fallback() -> PhotoAnalysisResponse:
+    return PhotoAnalysisResponse(
+        description="Unable to analyze image",
+        calories=0,
+        protein=0,
+        carbs=0,
+        fat=0,
+        fiber=0,
+        water=0,
+        confidence=0.0
+    )
+
+async def analyze_meal_photo(image_url: str) -> PhotoAnalysisResponse:
+    try:
+        image_data, _ = await prepare_image(image_url)
+        return await request_meal_photo_analysis(image_data)
+    
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"Error analyzing photo: {e}")  # For debugging
-        return PhotoAnalysisResponse(
-            description="Unable to analyze image",
-            calories=0,
-            protein=0,
-            carbs=0,
-            fat=0,
-            fiber=0,
-            water=0,
-            confidence=0.0
-        )
+        return photo_analysis_fallback()
+
+MEAL_TEXT_PARAMS = {
+    "model": "gpt-4o",  # Full model for best parsing and reasoning
+    "temperature": 0.0,  # Deterministic output
+    "top_p": 1.0,
+    "max_tokens": 400,
+}
+
+MEAL_TEXT_SYSTEM_PROMPT = (
+    "You are a professional nutrition analyst. "
+    "Given a natural language meal description, your task is to extract and interpret the food items, estimate their quantities, "
+    "and compute an accurate nutritional profile. "
+    "Only return a **valid JSON object** with the following fields:\n"
+    "- parsed_description (string)\n"
+    "- calories (float)\n"
+    "- protein (float)\n"
+    "- carbs (float)\n"
+    "- fat (float)\n"
+    "- fiber (float)\n"
+    "- water (float)\n"
+    "- confidence (float from 0.0 to 1.0)\n\n"
+    "Units: grams for all except calories.\n"
+    "Be conservative with confidence scores if information is ambiguous or portion size is unclear."
+)
+
+MEAL_TEXT_USER_PROMPT = "Estimate the nutritional values for this meal: {description}. Only return valid JSON."
+
+async def request_meal_text_parse(description: str) -> ChatLogResponse:
+    response = await client.chat.completions.create(
+        **MEAL_TEXT_PARAMS,
+        messages=[
+            {"role": "system", "content": MEAL_TEXT_SYSTEM_PROMPT},
+            {"role": "user", "content": MEAL_TEXT_USER_PROMPT.format(description=description)}
+        ]
+    )
+    
+    result = json.loads(response.choices[0].message.content)
+    return ChatLogResponse(**result)
+
+def meal_text_fallback(description: str) -> ChatLogResponse:
+    return ChatLogResponse(
+        parsed_description=description,
+        calories=0,
+        protein=0,
+        carbs=0,
+        fat=0,
+        fiber=0,
+        water=0,
+        confidence=0.0,
+        source=ParseSource.FALLBACK
+    )
 
 async def parse_meal_text(description: str) -> ChatLogResponse:
     try:
-        response = await client.chat.completions.create(
-    model="gpt-4o",  # Full model for best parsing and reasoning
-    temperature=0.0,  # Deterministic output
-    top_p=1.0,
-    max_tokens=400,
-    messages=[
-        {
-            "role": "system",
-            "content": (
-                "You are a professional nutrition analyst. "
-                "Given a natural language meal description, your task is to extract and interpret the food items, estimate their quantities, "
-                "and compute an accurate nutritional profile. "
-                "Only return a **valid JSON object** with the following fields:\n"
-                "- parsed_description (string)\n"
-                "- calories (float)\n"
-                "- protein (float)\n"
-                "- carbs (float)\n"
-                "- fat (float)\n"
-                "- fiber (float)\n"
-                "- water (float)\n"
-                "- confidence (float from 0.0 to 1.0)\n\n"
-                "Units: grams for all except calories.\n"
-                "Be conservative with confidence scores if information is ambiguous or portion size is unclear."
-            )
-        },
-        {
-            "role": "user",
-            "content": f"Estimate the nutritional values for this meal: {description}. Only return valid JSON."
-        }
-    ]
-)
-        
-        result = json.loads(response.choices[0].message.content)
-        return ChatLogResponse(**result)
+        return await request_meal_text_parse(description)
     
     except Exception as e:
         print(f"Error parsing meal text: {e}")  # For debugging
-        return ChatLogResponse(
-            parsed_description=description,
-            calories=0,
-            protein=0,
-            carbs=0,
-            fat=0,
-            fiber=0,
-            water=0,
-            confidence=0.0
-        )
+        return meal_text_fallback(description)
 
 async def generate_meal_feedback(
     meal_data: Dict[str, Any],
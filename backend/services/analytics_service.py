@@ -0,0 +1,165 @@
+from typing import Dict, List, Optional, Tuple
+from datetime import date, timedelta
+import numpy as np
+from fastapi import HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from models.user import User
+from models.meal import DailyNutrition
+from schemas.meal import AnalyticsTrend, NutritionAnalytics, WeekdayPattern
+from services.rollup_service import NUTRIENT_FIELDS
+from services.goal_service import GOAL_OUTPUT_FIELDS, compute_profile_goals, get_goal_versions
+from utils.helpers import MACRO_CALORIES_PER_GRAM
+from utils.config import settings
+
+ANALYTICS_WINDOWS = (7, 30, 90)
+GOAL_METRICS = {"calories": "calorie_goal", "protein": "protein", "carbs": "carbs", "fat": "fat"}
+WEEKDAY_FIELDS = ("calories", "protein", "carbs", "fat")
+
+async def load_daily_series(user: User, start_date: date, days: int, db: AsyncSession) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+    rows = (await db.execute(
+        select(DailyNutrition.day, DailyNutrition.meal_count, *[getattr(DailyNutrition, field) for field in NUTRIENT_FIELDS]).where(
+            DailyNutrition.user_id == user.id,
+            DailyNutrition.day >= start_date,
+            DailyNutrition.day < start_date + timedelta(days=days),
+            DailyNutrition.meal_count > 0
+        )
+    )).all()
+    
+    meal_counts = np.zeros(days, dtype=np.int64)
+    values = {field: np.zeros(days, dtype=np.float64) for field in NUTRIENT_FIELDS}
+    if not rows:
+        return meal_counts, values
+    
+    columns = list(zip(*rows))
+    offsets = (np.array(columns[0], dtype="datetime64[D]") - np.datetime64(start_date, "D")).astype(np.int64)
+    meal_counts[offsets] = np.array(columns[1], dtype=np.int64)
+    for field, column in zip(NUTRIENT_FIELDS, columns[2:]):
+        values[field][offsets] = np.nan_to_num(np.array(column, dtype=np.float64))
+    return meal_counts, values
+
+async def load_goal_series(user: User, start_date: date, days: int, db: AsyncSession) -> Dict[str, np.ndarray]:
+    versions = await get_goal_versions(user.id, db)
+    if not versions:
+        goals = compute_profile_goals(user.profile) if user.profile else {}
+        return {field: np.full(days, goals.get(field, np.nan), dtype=np.float64) for field in GOAL_OUTPUT_FIELDS}
+    
+    effective = np.array([version.effective_from for version in versions], dtype="datetime64[D]")
+    day_values = np.datetime64(start_date, "D") + np.arange(days)
+    index = np.clip(np.searchsorted(effective, day_values, side="right") - 1, 0, None)
+    return {
+        field: np.array([getattr(version, field) for version in versions], dtype=np.float64)[index]
+        for field in GOAL_OUTPUT_FIELDS
+    }
+
+def rolling_sum(values: np.ndarray, window: int) -> np.ndarray:
+    cumulative = np.concatenate(([0.0], np.cumsum(values, dtype=np.float64)))
+    upper = np.arange(1, len(values) + 1)
+    return cumulative[upper] - cumulative[np.maximum(upper - window, 0)]
+
+def _ratio(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(denominator > 0, numerator / np.where(denominator > 0, denominator, 1), np.nan)
+
+def _to_list(values: np.ndarray) -> List[Optional[float]]:
+    rounded = np.round(values, 2).astype(object)
+    rounded[~np.isfinite(values)] = None
+    return rounded.tolist()
+
+def _average(numerator: np.ndarray, denominator: np.ndarray) -> Optional[float]:
+    total = denominator.sum()
+    return round(float(numerator.sum() / total), 2) if total > 0 else None
+
+def build_trend(values: np.ndarray, mask: np.ndarray, weights: np.ndarray, lookback: int, windows: Tuple[int, ...]) -> AnalyticsTrend:
+    weighted = np.where(mask, values * weights, 0.0)
+    counted = np.where(mask, weights, 0.0)
+    return AnalyticsTrend(
+        average=_average(weighted[lookback:], counted[lookback:]),
+        daily=_to_list(np.where(mask, values, np.nan)[lookback:]),
+        moving_averages={
+            window: _to_list(_ratio(rolling_sum(weighted, window), rolling_sum(counted, window))[lookback:])
+            for window in windows
+        }
+    )
+
+def _weekday_patterns(start_date: date, logged: np.ndarray, values: Dict[str, np.ndarray]) -> List[WeekdayPattern]:
+    weekdays = (np.arange(len(logged)) + start_date.weekday()) % 7
+    days_total = np.bincount(weekdays, minlength=7)
+    days_logged = np.bincount(weekdays, weights=logged, minlength=7)
+    averages = {
+        field: _ratio(np.bincount(weekdays, weights=np.where(logged, values[field], 0.0), minlength=7), days_logged)
+        for field in WEEKDAY_FIELDS
+    }
+    
+    return [
+        WeekdayPattern(
+            weekday=weekday,
+            days_logged=int(days_logged[weekday]),
+            logging_rate=round(float(days_logged[weekday] / days_total[weekday]), 4) if days_total[weekday] else 0.0,
+            **{field: _to_list(averages[field][weekday:weekday + 1])[0] for field in WEEKDAY_FIELDS}
+        )
+        for weekday in range(7)
+    ]
+
+async def get_nutrition_analytics(user: User, start_date: date, end_date: date, db: AsyncSession) -> NutritionAnalytics:
+    if end_date < start_date:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="end must not be before start"
+        )
+    
+    days = (end_date - start_date).days + 1
+    if days > settings.analytics_max_days:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Range must not exceed {settings.analytics_max_days} days"
+        )
+    
+    lookback = max(ANALYTICS_WINDOWS) - 1
+    if (start_date - date.min).days < lookback or end_date == date.max:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"start must be on or after {(date.min + timedelta(days=lookback)).isoformat()} and end before {date.max.isoformat()}"
+        )
+    
+    series_start = start_date - timedelta(days=lookback)
+    meal_counts, values = await load_daily_series(user, series_start, days + lookback, db)
+    goals = await load_goal_series(user, series_start, days + lookback, db)
+    
+    logged = meal_counts > 0
+    ones = np.ones(len(logged), dtype=np.float64)
+    nutrients = {
+        field: build_trend(values[field], logged, ones, lookback, ANALYTICS_WINDOWS)
+        for field in NUTRIENT_FIELDS
+    }
+    
+    macro_calories = {macro: values[macro] * per_gram for macro, per_gram in MACRO_CALORIES_PER_GRAM.items()}
+    macro_total = sum(macro_calories.values())
+    has_macros = logged & (macro_total > 0)
+    macro_ratios = {
+        macro: build_trend(_ratio(calories, macro_total) * 100.0, has_macros, macro_total, lookback, ANALYTICS_WINDOWS)
+        for macro, calories in macro_calories.items()
+    }
+    
+    tolerance = settings.analytics_adherence_tolerance
+    adherence = {}
+    for metric, goal_field in GOAL_METRICS.items():
+        goal = goals[goal_field]
+        has_goal = logged & np.isfinite(goal) & (goal > 0)
+        within = np.abs(values[metric] - goal) <= tolerance * np.where(has_goal, goal, 0.0)
+        adherence[metric] = build_trend(within * 100.0, has_goal, ones, lookback, ANALYTICS_WINDOWS)
+    
+    days_logged = int(logged[lookback:].sum())
+    return NutritionAnalytics(
+        start=start_date,
+        end=end_date,
+        windows=list(ANALYTICS_WINDOWS),
+        days_logged=days_logged,
+        logging_rate=round(days_logged / days, 4),
+        meal_counts=meal_counts[lookback:].tolist(),
+        nutrients=nutrients,
+        macro_ratios=macro_ratios,
+        adherence=adherence,
+        adherence_tolerance=tolerance,
+        weekdays=_weekday_patterns(start_date, logged[lookback:], {field: values[field][lookback:] for field in WEEKDAY_FIELDS})
+    )
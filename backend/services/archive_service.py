@@ -0,0 +1,81 @@
+from typing import Any, List, Optional, Tuple, Type
+from datetime import datetime, timedelta
+from uuid import UUID
+from sqlalchemy import delete, insert, literal, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+from models.meal import Meal, MealArchive
+from utils.config import settings
+
+MEAL_COLUMNS = ("id", "user_id", "description", "image_url", "calories", "protein", "carbs", "fat", "fiber", "water", "logged_at")
+
+def archive_horizon(now: Optional[datetime] = None) -> Optional[datetime]:
+    if settings.meal_archive_after_days <= 0:
+        return None
+    return (now or datetime.utcnow()) - timedelta(days=settings.meal_archive_after_days)
+
+def reaches_archive(start: Optional[datetime]) -> bool:
+    horizon = archive_horizon()
+    return horizon is not None and (start is None or start < horizon)
+
+def meal_models(start: Optional[datetime] = None) -> List[Type]:
+    return [Meal, MealArchive] if reaches_archive(start) else [Meal]
+
+def meal_history(*columns: str, user_id: Optional[UUID] = None):
+    selects = []
+    for model in (Meal, MealArchive):
+        query = select(*[getattr(model, name) for name in columns])
+        if user_id:
+            query = query.where(model.user_id == user_id)
+        selects.append(query)
+    return union_all(*selects).subquery("meal_history")
+
+def newest_first(meals: List[Any]) -> List[Any]:
+    return sorted(meals, key=lambda meal: (meal.logged_at, meal.id), reverse=True)
+
+async def get_archived_meal(user_id: UUID, meal_id: int, db: AsyncSession) -> Optional[MealArchive]:
+    if archive_horizon() is None:
+        return None
+    return await db.scalar(
+        select(MealArchive).where(MealArchive.id == meal_id, MealArchive.user_id == user_id)
+    )
+
+async def restore_archived_meal(archived: MealArchive, db: AsyncSession) -> Meal:
+    meal = Meal(**{name: getattr(archived, name) for name in MEAL_COLUMNS})
+    await db.delete(archived)
+    db.add(meal)
+    await db.flush()
+    return meal
+
+async def _move_meals(source: Type, target: Type, condition, db: AsyncSession, batch_size: int, user_id: Optional[UUID]) -> int:
+    moved = 0
+    last_id = 0
+    extra = {"archived_at": literal(datetime.utcnow())} if target is MealArchive else {}
+    
+    while True:
+        query = select(source.id).where(condition, source.id > last_id)
+        if user_id:
+            query = query.where(source.user_id == user_id)
+        ids = list(await db.scalars(query.order_by(source.id).limit(batch_size)))
+        if not ids:
+            break
+        
+        await db.execute(insert(target).from_select(
+            [*MEAL_COLUMNS, *extra],
+            select(*[getattr(source, name) for name in MEAL_COLUMNS], *extra.values()).where(source.id.in_(ids))
+        ))
+        await db.execute(delete(source).where(source.id.in_(ids)))
+        await db.commit()
+        moved += len(ids)
+        last_id = ids[-1]
+    
+    return moved
+
+async def archive_old_meals(db: AsyncSession, batch_size: int = 5000, user_id: Optional[UUID] = None) -> Tuple[int, int]:
+    horizon = archive_horizon()
+    if horizon is None:
+        restored = await _move_meals(MealArchive, Meal, MealArchive.id.isnot(None), db, batch_size, user_id)
+        return 0, restored
+    
+    archived = await _move_meals(Meal, MealArchive, Meal.logged_at < horizon, db, batch_size, user_id)
+    restored = await _move_meals(MealArchive, Meal, MealArchive.logged_at >= horizon, db, batch_size, user_id)
+    return archived, restored
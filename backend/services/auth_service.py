@@ -1,17 +1,90 @@
 from typing import Dict, Any, Optional
+import hashlib
+import secrets
 from fastapi import HTTPException, Depends, status
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from fastapi.security import APIKeyHeader, HTTPBearer, HTTPAuthorizationCredentials
 from jose import JWTError, jwt
-from sqlalchemy.orm import Session
+from sqlalchemy import insert, inspect, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, raiseload, make_transient_to_detached
 from models.database import get_db
-from models.user import User
+from models.user import User, UserProfile
 from schemas.auth import UserClaims, TokenData
+from utils.cache import TTLCache
 from utils.config import settings
 from uuid import UUID
 
 security = HTTPBearer()
+internal_token_header = APIKeyHeader(name="X-Internal-Token", auto_error=False)
+
+USER_LOAD_OPTIONS = (joinedload(User.profile), raiseload("*"))
+
+claims_cache = TTLCache(settings.auth_claims_cache_size)
+user_cache = TTLCache(settings.auth_user_cache_size, ttl=settings.auth_user_cache_ttl_seconds)
+
+def _token_digest(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+def _column_values(instance) -> Dict[str, Any]:
+    return {attr.key: getattr(instance, attr.key) for attr in inspect(type(instance)).column_attrs}
+
+def _snapshot_user(user: User) -> Dict[str, Any]:
+    return {
+        "user": _column_values(user),
+        "profile": _column_values(user.profile) if user.profile else None,
+    }
+
+def _restore_user(snapshot: Dict[str, Any], db: AsyncSession) -> User:
+    profile = UserProfile(**snapshot["profile"]) if snapshot["profile"] else None
+    user = User(**snapshot["user"], profile=profile)
+    if profile:
+        make_transient_to_detached(profile)
+    make_transient_to_detached(user)
+    db.add(user)
+    return user
+
+def invalidate_cached_user(user_id: UUID):
+    user_cache.pop(str(user_id))
+
+async def _load_user(user_id: UUID, db: AsyncSession) -> Optional[User]:
+    snapshot = user_cache.get(str(user_id))
+    if snapshot:
+        version = await db.scalar(select(User.data_version).where(User.id == user_id))
+        if version is not None and version == snapshot["user"]["data_version"]:
+            return _restore_user(snapshot, db)
+    
+    user = await db.scalar(select(User).options(*USER_LOAD_OPTIONS).where(User.id == user_id))
+    if user:
+        user_cache.set(str(user_id), _snapshot_user(user))
+    return user
+
+async def _insert_user_if_missing(user_id: UUID, email: str, db: AsyncSession):
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        dialect_insert = None
+    
+    if dialect_insert is not None:
+        await db.execute(dialect_insert(User).values(id=user_id, email=email).on_conflict_do_nothing())
+        await db.commit()
+        return
+    
+    try:
+        await db.execute(insert(User).values(id=user_id, email=email))
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
 
 async def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security)) -> UserClaims:
+    digest = _token_digest(credentials.credentials)
+    cached_claims = claims_cache.get(digest)
+    if cached_claims:
+        return cached_claims
+    
     try:
         payload = jwt.decode(
             credentials.credentials,
@@ -21,6 +94,7 @@ async def verify_token(credentials: HTTPAuthorizationCredentials = Depends(secur
         )
         
         user_claims = UserClaims(**payload)
+        claims_cache.set(digest, user_claims, expires_at=user_claims.exp)
         return user_claims
     except JWTError:
         raise HTTPException(
@@ -31,33 +105,33 @@ async def verify_token(credentials: HTTPAuthorizationCredentials = Depends(secur
 
 async def get_current_user(
     claims: UserClaims = Depends(verify_token),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ) -> User:
     user_id = UUID(claims.sub)
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await _load_user(user_id, db)
     
     if not user:
-        user = User(
-            id=user_id,
-            email=claims.email
+        await _insert_user_if_missing(user_id, claims.email, db)
+        user = await _load_user(user_id, db)
+    
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Email is already registered to another account"
         )
-        db.add(user)
-        db.commit()
-        db.refresh(user)
     
     return user
 
 async def get_current_user_optional(
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(HTTPBearer(auto_error=False)),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ) -> Optional[User]:
     if not credentials:
         return None
     
     try:
         claims = await verify_token(credentials)
-        user_id = UUID(claims.sub)
-        return db.query(User).filter(User.id == user_id).first()
+        return await _load_user(UUID(claims.sub), db)
     except HTTPException:
         return None
 
@@ -71,4 +145,12 @@ def require_premium(user: User = Depends(get_current_user)) -> User:
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Premium subscription required"
         )
-    return user
\ No newline at end of file
+    return user
+
+def require_internal(token: Optional[str] = Depends(internal_token_header)):
+    expected = settings.internal_api_token
+    if not expected or not token or not secrets.compare_digest(token.encode(), expected.encode()):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Not Found"
+        )
\ No newline at end of file
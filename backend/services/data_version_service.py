@@ -0,0 +1,74 @@
+from typing import Any, Awaitable, Callable, Iterable, Optional
+from datetime import datetime
+from functools import lru_cache
+from uuid import UUID
+import hashlib
+from fastapi import Request, Response, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+from models.user import User
+from utils.cache import TTLCache
+from utils.config import settings
+
+response_cache = TTLCache(settings.response_cache_size, settings.response_cache_ttl_seconds)
+
+async def bump_data_version(user_id: UUID, db: AsyncSession):
+    await db.execute(update(User).where(User.id == user_id).values(data_version=User.data_version + 1))
+
+async def bump_data_versions(user_ids: Optional[Iterable[UUID]], db: AsyncSession):
+    statement = update(User).values(data_version=User.data_version + 1)
+    if user_ids is not None:
+        statement = statement.where(User.id.in_(list(user_ids)))
+    await db.execute(statement)
+
+@lru_cache(maxsize=None)
+def _adapter(response_model: Any) -> TypeAdapter:
+    return TypeAdapter(response_model)
+
+def _encode(result: Any, response_model: Any = None) -> bytes:
+    if response_model is None:
+        content = jsonable_encoder(result)
+    else:
+        adapter = _adapter(response_model)
+        content = adapter.dump_python(adapter.validate_python(result, from_attributes=True), mode="json")
+    return JSONResponse(content).body
+
+def _etag(key: tuple) -> str:
+    return '"' + hashlib.sha256(repr(key).encode()).hexdigest()[:32] + '"'
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = {candidate.strip().removeprefix("W/") for candidate in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
+
+async def versioned_response(
+    request: Request,
+    user: User,
+    db: AsyncSession,
+    producer: Callable[[], Awaitable[Any]],
+    response_model: Any = None
+) -> Response:
+    key = (
+        user.id,
+        request.url.path,
+        tuple(sorted(request.query_params.multi_items())),
+        user.data_version,
+        datetime.utcnow().date(),
+    )
+    etag = _etag(key)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    
+    body = response_cache.get(key)
+    if body is None:
+        body = _encode(await producer(), response_model)
+        if len(body) <= settings.response_cache_max_body_bytes:
+            response_cache.set(key, body)
+    
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -0,0 +1,136 @@
+from typing import Any, AsyncIterator, Dict, List, Sequence
+from datetime import datetime, date
+import csv
+import io
+import json
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from models.user import User
+from models.meal import DailyNutrition
+from services.archive_service import meal_history
+from schemas.meal import ExportFormat, ExportDataset
+from services.rollup_service import NUTRIENT_FIELDS
+from utils.config import settings
+
+EXPORT_COLUMNS = {
+    ExportDataset.MEALS: ("id", "logged_at", "description", "image_url", *NUTRIENT_FIELDS),
+    ExportDataset.DAILY: ("day", "meal_count", *NUTRIENT_FIELDS),
+}
+
+EXPORT_MEDIA_TYPES = {
+    ExportFormat.CSV: "text/csv",
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.PARQUET: "application/vnd.apache.parquet",
+}
+
+class _ChunkSink(io.RawIOBase):
+    def __init__(self):
+        self.chunks: List[bytes] = []
+        self.position = 0
+    
+    def writable(self) -> bool:
+        return True
+    
+    def write(self, data) -> int:
+        self.chunks.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+    
+    def tell(self) -> int:
+        return self.position
+    
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks = []
+        return data
+
+def _export_statement(user: User, dataset: ExportDataset):
+    if dataset == ExportDataset.DAILY:
+        columns = [getattr(DailyNutrition, name) for name in EXPORT_COLUMNS[dataset]]
+        return select(*columns).where(
+            DailyNutrition.user_id == user.id,
+            DailyNutrition.meal_count > 0
+        ).order_by(DailyNutrition.day)
+    
+    meals = meal_history(*EXPORT_COLUMNS[dataset], user_id=user.id)
+    return select(*[meals.c[name] for name in EXPORT_COLUMNS[dataset]]).order_by(meals.c.logged_at, meals.c.id)
+
+async def iter_export_batches(user: User, dataset: ExportDataset, db: AsyncSession) -> AsyncIterator[Sequence[Any]]:
+    statement = _export_statement(user, dataset).execution_options(yield_per=settings.export_batch_size)
+    result = await db.stream(statement)
+    try:
+        async for partition in result.partitions():
+            yield partition
+    finally:
+        await result.close()
+
+def _json_value(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+async def _stream_ndjson(batches: AsyncIterator[Sequence[Any]], columns: Sequence[str]) -> AsyncIterator[bytes]:
+    async for batch in batches:
+        yield "".join(
+            json.dumps({name: _json_value(value) for name, value in zip(columns, row)}) + "\n"
+            for row in batch
+        ).encode()
+
+async def _stream_csv(batches: AsyncIterator[Sequence[Any]], columns: Sequence[str]) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    async for batch in batches:
+        writer.writerows(batch)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+def _parquet_schema(dataset: ExportDataset):
+    import pyarrow as pa
+    
+    nutrient_fields = [pa.field(name, pa.float64()) for name in NUTRIENT_FIELDS]
+    if dataset == ExportDataset.DAILY:
+        return pa.schema([pa.field("day", pa.date32()), pa.field("meal_count", pa.int32()), *nutrient_fields])
+    return pa.schema([
+        pa.field("id", pa.int64()),
+        pa.field("logged_at", pa.timestamp("us")),
+        pa.field("description", pa.string()),
+        pa.field("image_url", pa.string()),
+        *nutrient_fields
+    ])
+
+async def _stream_parquet(batches: AsyncIterator[Sequence[Any]], dataset: ExportDataset) -> AsyncIterator[bytes]:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    
+    schema = _parquet_schema(dataset)
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema, compression="zstd")
+    try:
+        async for batch in batches:
+            columns = list(zip(*batch))
+            writer.write_table(pa.Table.from_arrays(
+                [pa.array(column, type=field.type) for column, field in zip(columns, schema)],
+                schema=schema
+            ))
+            yield sink.drain()
+    finally:
+        writer.close()
+    yield sink.drain()
+
+def stream_export(user: User, export_format: ExportFormat, dataset: ExportDataset, db: AsyncSession) -> AsyncIterator[bytes]:
+    batches = iter_export_batches(user, dataset, db)
+    if export_format == ExportFormat.PARQUET:
+        return _stream_parquet(batches, dataset)
+    if export_format == ExportFormat.CSV:
+        return _stream_csv(batches, EXPORT_COLUMNS[dataset])
+    return _stream_ndjson(batches, EXPORT_COLUMNS[dataset])
+
+def export_filename(export_format: ExportFormat, dataset: ExportDataset) -> str:
+    return f"eatwise-{dataset.value}-{datetime.utcnow():%Y%m%d}.{export_format.value}"
+
+def export_headers(export_format: ExportFormat, dataset: ExportDataset) -> Dict[str, str]:
+    return {"Content-Disposition": f'attachment; filename="{export_filename(export_format, dataset)}"'}
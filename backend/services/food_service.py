@@ -0,0 +1,215 @@
+from typing import Any, Dict, List, Optional, Tuple
+from pathlib import Path
+import csv
+import re
+import unicodedata
+import numpy as np
+from schemas.meal import ChatLogResponse, ParseSource
+from services.rollup_service import NUTRIENT_FIELDS
+from utils.config import settings
+
+DEFAULT_FOOD_TABLE_PATH = Path(__file__).resolve().parent.parent / "data" / "foods.csv"
+LOCAL_PARSE_CONFIDENCE = 0.9
+MAX_ITEMS = 20
+MAX_ITEM_GRAMS = 5000.0
+
+MASS_UNITS = {
+    "g": 1.0, "gram": 1.0, "gr": 1.0, "kg": 1000.0, "kilogram": 1000.0,
+    "oz": 28.3495, "ounce": 28.3495, "lb": 453.592, "pound": 453.592,
+}
+VOLUME_UNITS = {
+    "ml": 1.0, "milliliter": 1.0, "millilitre": 1.0, "l": 1000.0, "liter": 1000.0, "litre": 1000.0,
+    "cup": 240.0, "tbsp": 15.0, "tablespoon": 15.0, "tsp": 5.0, "teaspoon": 5.0,
+}
+UNIT_ALIASES = {"tbs": "tbsp", "tbl": "tbsp", "tbsps": "tbsp", "c": "cup"}
+NUMBER_WORDS = {
+    "a": 1.0, "an": 1.0, "one": 1.0, "two": 2.0, "three": 3.0, "four": 4.0, "five": 5.0, "six": 6.0,
+    "seven": 7.0, "eight": 8.0, "nine": 9.0, "ten": 10.0, "dozen": 12.0, "half": 0.5, "quarter": 0.25,
+}
+SIZE_WORDS = ("small", "medium", "large")
+MODIFIERS = {"fresh", "plain", "grilled", "baked", "roasted", "boiled", "steamed", "cooked", "sliced", "chopped", "diced"}
+ITEM_SEPARATOR = re.compile(r"\s*(?:,|;|\+|&|\band\b|\bwith\b|\bplus\b)\s*")
+NUMBER = re.compile(r"\d+(?:\.\d+)?")
+FRACTION = re.compile(r"(\d+)/(\d+)")
+
+metrics = {"resolved": 0, "unresolved": 0}
+
+class FoodTable:
+    def __init__(self, path: Path):
+        names: List[str] = []
+        nutrients: List[List[float]] = []
+        densities: List[float] = []
+        self.portions: List[Dict[str, float]] = []
+        self.lookup: Dict[str, int] = {}
+        
+        with open(path, newline="", encoding="utf-8") as handle:
+            for row in csv.DictReader(handle):
+                index = len(names)
+                names.append(row["name"])
+                nutrients.append([float(row[field]) for field in NUTRIENT_FIELDS])
+                densities.append(float(row["density"]) if row["density"] else np.nan)
+                self.portions.append({
+                    unit: float(grams)
+                    for unit, grams in (entry.split("=") for entry in row["portions"].split("|") if entry)
+                })
+                for alias in [row["name"], *filter(None, row["aliases"].split("|"))]:
+                    self.lookup[alias] = index
+        
+        self.names = names
+        self.per_100g = np.array(nutrients, dtype=np.float32).reshape(-1, len(NUTRIENT_FIELDS))
+        self.density = np.array(densities, dtype=np.float32)
+        self.portion_words = set().union(*self.portions) - set(SIZE_WORDS) - {"each"}
+    
+    def match(self, words: List[str]) -> Optional[int]:
+        plain = [word for word in words if word not in MODIFIERS]
+        for candidate in (words, plain):
+            if not candidate:
+                continue
+            for phrase in (candidate, [*candidate[:-1], _singular(candidate[-1])]):
+                index = self.lookup.get(" ".join(phrase))
+                if index is not None:
+                    return index
+        return None
+    
+    def grams_per_ml(self, index: int) -> Optional[float]:
+        if np.isfinite(self.density[index]):
+            return float(self.density[index])
+        for unit in ("cup", "tbsp", "tsp"):
+            if unit in self.portions[index]:
+                return self.portions[index][unit] / VOLUME_UNITS[unit]
+        return None
+
+_food_table: Optional[FoodTable] = None
+
+def get_food_table() -> FoodTable:
+    global _food_table
+    if _food_table is None:
+        _food_table = FoodTable(Path(settings.food_table_path) if settings.food_table_path else DEFAULT_FOOD_TABLE_PATH)
+    return _food_table
+
+def _singular(word: str) -> str:
+    if word.endswith("ies") and len(word) > 4:
+        return word[:-3] + "y"
+    if word.endswith(("ches", "shes", "xes", "oes", "sses")):
+        return word[:-2]
+    if word.endswith("s") and not word.endswith("ss") and len(word) > 2:
+        return word[:-1]
+    return word
+
+def _unit(word: str) -> str:
+    word = UNIT_ALIASES.get(word, word)
+    return word if word in MASS_UNITS or word in VOLUME_UNITS else UNIT_ALIASES.get(_singular(word), _singular(word))
+
+def _take_quantity(tokens: List[str]) -> Tuple[Optional[float], int]:
+    if not tokens:
+        return None, 0
+    first = tokens[0]
+    following = tokens[1] if len(tokens) > 1 else ""
+    
+    if NUMBER.fullmatch(first):
+        fraction = FRACTION.fullmatch(following)
+        if fraction and int(fraction.group(2)):
+            return float(first) + int(fraction.group(1)) / int(fraction.group(2)), 2
+        return float(first), 1
+    fraction = FRACTION.fullmatch(first)
+    if fraction:
+        return (int(fraction.group(1)) / int(fraction.group(2)), 1) if int(fraction.group(2)) else (None, 0)
+    if first in ("a", "an") and following in ("half", "quarter", "dozen"):
+        return NUMBER_WORDS[following], 2
+    if first == "half" and following in ("a", "an"):
+        return 0.5, 2
+    if first in NUMBER_WORDS:
+        return NUMBER_WORDS[first], 1
+    return None, 0
+
+def _skip_of(tokens: List[str], position: int) -> int:
+    return position + 1 if position < len(tokens) and tokens[position] == "of" else position
+
+def parse_item(text: str, table: FoodTable) -> Optional[Tuple[int, float]]:
+    tokens = text.split()
+    quantity, position = _take_quantity(tokens)
+    if quantity is not None and quantity <= 0:
+        return None
+    
+    unit = None
+    if position < len(tokens) - 1:
+        if tokens[position] == "fl" and tokens[position + 1] == "oz":
+            unit, position = "fl oz", position + 2
+        else:
+            candidate = _unit(tokens[position])
+            if candidate in MASS_UNITS or candidate in VOLUME_UNITS:
+                unit, position = candidate, position + 1
+    position = _skip_of(tokens, position)
+    
+    size = None
+    if position < len(tokens) - 1 and tokens[position] in SIZE_WORDS:
+        size, position = tokens[position], position + 1
+    
+    portion = None
+    if unit is None and position < len(tokens) - 1 and _singular(tokens[position]) in table.portion_words:
+        portion, position = _singular(tokens[position]), _skip_of(tokens, position + 1)
+    
+    index = table.match(tokens[position:])
+    if index is None or (quantity is None and unit is None):
+        return None
+    quantity = 1.0 if quantity is None else quantity
+    portions = table.portions[index]
+    
+    if unit in MASS_UNITS:
+        grams = quantity * MASS_UNITS[unit]
+    elif unit is not None:
+        if unit in portions:
+            grams = quantity * portions[unit]
+        else:
+            grams_per_ml = table.grams_per_ml(index)
+            if grams_per_ml is None:
+                return None
+            grams = quantity * (29.5735 if unit == "fl oz" else VOLUME_UNITS[unit]) * grams_per_ml
+    elif portion is not None:
+        if portion not in portions:
+            return None
+        grams = quantity * portions[portion]
+    else:
+        each = portions.get(size) or portions.get("each")
+        if each is None:
+            return None
+        grams = quantity * each
+    
+    return (index, grams) if grams <= MAX_ITEM_GRAMS else None
+
+def normalize_meal_text(description: str) -> str:
+    text = unicodedata.normalize("NFKC", description).casefold().replace("⁄", "/")
+    text = re.sub(r"(\d)\s*/\s*(\d)", r"\1/\2", text)
+    text = re.sub(r"(\d)([a-z])", r"\1 \2", text)
+    return re.sub(r"[^\w\s,;+&./]", " ", text).strip(" .")
+
+def parse_meal_text_locally(description: str) -> Optional[ChatLogResponse]:
+    if not settings.local_meal_parser_enabled:
+        return None
+    
+    table = get_food_table()
+    items = [item for item in ITEM_SEPARATOR.split(normalize_meal_text(description)) if item.strip(" .")]
+    parsed = [parse_item(item.strip(" ."), table) for item in items[:MAX_ITEMS + 1]]
+    if not parsed or len(parsed) > MAX_ITEMS or any(item is None for item in parsed):
+        metrics["unresolved"] += 1
+        return None
+    
+    indexes = np.array([index for index, _ in parsed])
+    grams = np.array([grams for _, grams in parsed], dtype=np.float64)
+    totals = grams @ table.per_100g[indexes].astype(np.float64) / 100.0
+    
+    metrics["resolved"] += 1
+    return ChatLogResponse(
+        parsed_description=", ".join(f"{table.names[index]} ({grams:.0f} g)" for index, grams in parsed),
+        confidence=LOCAL_PARSE_CONFIDENCE,
+        source=ParseSource.LOCAL,
+        **{field: round(float(value), 1) for field, value in zip(NUTRIENT_FIELDS, totals)}
+    )
+
+def local_parser_stats() -> Dict[str, Any]:
+    lookups = metrics["resolved"] + metrics["unresolved"]
+    return {
+        "foods": len(get_food_table().names),
+        **metrics,
+        "resolved_rate": round(metrics["resolved"] / lookups, 4) if lookups else 0.0,
+    }
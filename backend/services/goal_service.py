@@ -0,0 +1,66 @@
+from typing import Any, Dict, List, Optional
+from bisect import bisect_right
+from datetime import date, datetime, timedelta
+from uuid import UUID
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from models.user import User, UserProfile, NutritionGoal
+from utils.helpers import GOAL_FORMULA_VERSION, calculate_goals
+
+GOAL_INPUT_FIELDS = ("age", "height", "weight", "activity_level", "goal", "sex")
+GOAL_OUTPUT_FIELDS = ("bmr", "tdee", "calorie_goal", "protein", "carbs", "fat")
+
+def goal_inputs(source: Any) -> Dict[str, Any]:
+    return {field: getattr(source, field) for field in GOAL_INPUT_FIELDS}
+
+def compute_profile_goals(profile: UserProfile) -> Dict[str, float]:
+    return calculate_goals(**goal_inputs(profile))
+
+def _version_goals(version: NutritionGoal) -> Dict[str, float]:
+    return {field: getattr(version, field) for field in GOAL_OUTPUT_FIELDS}
+
+async def get_goal_versions(user_id: UUID, db: AsyncSession) -> List[NutritionGoal]:
+    return list(await db.scalars(
+        select(NutritionGoal).where(NutritionGoal.user_id == user_id).order_by(NutritionGoal.effective_from)
+    ))
+
+async def record_goal_version(profile: UserProfile, db: AsyncSession, effective_from: Optional[date] = None) -> Optional[NutritionGoal]:
+    effective_from = effective_from or datetime.utcnow().date()
+    inputs = goal_inputs(profile)
+    
+    latest = await db.scalar(
+        select(NutritionGoal)
+        .where(NutritionGoal.user_id == profile.user_id, NutritionGoal.effective_from <= effective_from)
+        .order_by(NutritionGoal.effective_from.desc())
+        .limit(1)
+    )
+    if latest and latest.formula_version == GOAL_FORMULA_VERSION and goal_inputs(latest) == inputs:
+        return None
+    
+    values = {**inputs, **calculate_goals(**inputs), "formula_version": GOAL_FORMULA_VERSION}
+    if latest and latest.effective_from == effective_from:
+        for field, value in values.items():
+            setattr(latest, field, value)
+        return latest
+    
+    version = NutritionGoal(user_id=profile.user_id, effective_from=effective_from, **values)
+    db.add(version)
+    return version
+
+async def get_goals_by_day(user: User, start_date: date, end_date: date, db: AsyncSession) -> Dict[date, Dict[str, float]]:
+    days = [start_date + timedelta(days=offset) for offset in range((end_date - start_date).days)]
+    versions = await get_goal_versions(user.id, db)
+    
+    if not versions:
+        goals = compute_profile_goals(user.profile) if user.profile else {}
+        return {day: goals for day in days}
+    
+    effective_dates = [version.effective_from for version in versions]
+    return {
+        day: _version_goals(versions[max(bisect_right(effective_dates, day) - 1, 0)])
+        for day in days
+    }
+
+async def get_goals_for_day(user: User, day: date, db: AsyncSession) -> Dict[str, float]:
+    goals_by_day = await get_goals_by_day(user, day, day + timedelta(days=1), db)
+    return goals_by_day.get(day, {})
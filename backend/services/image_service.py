@@ -0,0 +1,90 @@
+from typing import Tuple
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import base64
+import io
+import numpy as np
+from fastapi import HTTPException, status
+from PIL import Image, ImageOps
+from utils.config import settings
+
+HASH_SIZE = 8
+PREPARED_MIME_TYPE = "image/jpeg"
+METADATA_KEYS = ("exif", "xmp", "comment", "photoshop")
+
+executor = ThreadPoolExecutor(max_workers=settings.photo_preprocess_workers, thread_name_prefix="image-preprocess")
+
+def _too_large(detail: str) -> HTTPException:
+    return HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=detail)
+
+async def load_image_bytes(image_url: str) -> bytes:
+    if image_url.startswith("data:image"):
+        header, separator, payload = image_url.partition(",")
+        if not separator or not header.endswith(";base64"):
+            raise ValueError("Invalid base64 image format")
+        if len(payload) * 3 // 4 > settings.photo_max_upload_bytes:
+            raise _too_large(f"Image must not exceed {settings.photo_max_upload_bytes} bytes")
+        return base64.b64decode(payload)
+    
+    import httpx
+    limit = settings.photo_max_upload_bytes
+    async with httpx.AsyncClient(timeout=settings.photo_download_timeout_seconds) as http_client:
+        async with http_client.stream("GET", image_url) as response:
+            response.raise_for_status()
+            content_length = response.headers.get("content-length")
+            if content_length is not None and content_length.isdigit() and int(content_length) > limit:
+                raise _too_large(f"Image must not exceed {limit} bytes")
+            
+            image_data = bytearray()
+            async for chunk in response.aiter_bytes():
+                image_data += chunk
+                if len(image_data) > limit:
+                    raise _too_large(f"Image must not exceed {limit} bytes")
+            return bytes(image_data)
+
+def perceptual_hash(image: Image.Image) -> str:
+    thumbnail = image.convert("L").resize((HASH_SIZE + 1, HASH_SIZE), Image.Resampling.LANCZOS)
+    pixels = np.asarray(thumbnail, dtype=np.int16)
+    return np.packbits(pixels[:, 1:] > pixels[:, :-1]).tobytes().hex()
+
+def _flatten(image: Image.Image) -> Image.Image:
+    if image.mode not in ("RGBA", "LA", "PA") and not (image.mode == "P" and "transparency" in image.info):
+        return image.convert("RGB")
+    image = image.convert("RGBA")
+    background = Image.new("RGB", image.size, (255, 255, 255))
+    background.paste(image, mask=image.getchannel("A"))
+    return background
+
+def preprocess_image(image_data: bytes) -> Tuple[bytes, str]:
+    try:
+        source = Image.open(io.BytesIO(image_data))
+    except Image.DecompressionBombError:
+        raise _too_large(f"Image must not exceed {settings.photo_max_pixels} pixels")
+    
+    with source:
+        if source.width * source.height > settings.photo_max_pixels:
+            raise _too_large(f"Image must not exceed {settings.photo_max_pixels} pixels")
+        
+        edge = settings.photo_max_edge
+        original_size = source.size
+        original_mode = source.mode
+        source.draft("RGB", (edge, edge))
+        image = _flatten(ImageOps.exif_transpose(source))
+        image.thumbnail((edge, edge), Image.Resampling.LANCZOS)
+        
+        output = io.BytesIO()
+        image.save(output, "JPEG", quality=settings.photo_jpeg_quality, optimize=True)
+        prepared = output.getvalue()
+        
+        reusable = (
+            source.format == "JPEG"
+            and original_mode in ("RGB", "L")
+            and image.size == original_size
+            and not any(key in source.info for key in METADATA_KEYS)
+            and len(image_data) <= len(prepared)
+        )
+        return (image_data if reusable else prepared), perceptual_hash(image)
+
+async def prepare_image(image_url: str) -> Tuple[bytes, str]:
+    image_data = await load_image_bytes(image_url)
+    return await asyncio.get_running_loop().run_in_executor(executor, preprocess_image, image_data)
@@ -0,0 +1,148 @@
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple
+from collections import defaultdict
+from datetime import datetime, date
+import codecs
+import csv
+import json
+from fastapi import HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from models.user import User
+from models.meal import Meal
+from schemas.meal import ImportFormat, MealCreate, MealImportError, MealImportResult
+from services.rollup_service import NUTRIENT_FIELDS, apply_daily_nutrition_delta
+from services.streak_service import recompute_user_streak
+from services.data_version_service import bump_data_version
+from services.report_service import invalidate_weekly_reports
+from utils.config import settings
+
+FORMAT_EXTENSIONS = {
+    ".csv": ImportFormat.CSV,
+    ".ndjson": ImportFormat.NDJSON,
+    ".jsonl": ImportFormat.NDJSON,
+}
+
+FORMAT_CONTENT_TYPES = {
+    "text/csv": ImportFormat.CSV,
+    "application/x-ndjson": ImportFormat.NDJSON,
+    "application/jsonl": ImportFormat.NDJSON,
+}
+
+def detect_import_format(filename: Optional[str], content_type: Optional[str]) -> ImportFormat:
+    if filename:
+        for extension, import_format in FORMAT_EXTENSIONS.items():
+            if filename.lower().endswith(extension):
+                return import_format
+    
+    if content_type in FORMAT_CONTENT_TYPES:
+        return FORMAT_CONTENT_TYPES[content_type]
+    
+    raise HTTPException(
+        status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        detail="Unsupported import format. Upload a .csv or .ndjson file"
+    )
+
+def _iter_lines(stream: BinaryIO) -> Iterator[str]:
+    return codecs.getreader("utf-8-sig")(stream)
+
+def _iter_csv_rows(stream: BinaryIO) -> Iterator[Tuple[int, Any]]:
+    reader = csv.DictReader(_iter_lines(stream))
+    for row_number, row in enumerate(reader, start=1):
+        yield row_number, {key: value for key, value in row.items() if key and value not in ("", None)}
+
+def _iter_ndjson_rows(stream: BinaryIO) -> Iterator[Tuple[int, Any]]:
+    for row_number, line in enumerate(_iter_lines(stream), start=1):
+        if not line.strip():
+            continue
+        try:
+            yield row_number, json.loads(line)
+        except json.JSONDecodeError as e:
+            yield row_number, e
+
+def iter_import_rows(stream: BinaryIO, import_format: ImportFormat) -> Iterator[Tuple[int, Any]]:
+    if import_format == ImportFormat.CSV:
+        return _iter_csv_rows(stream)
+    return _iter_ndjson_rows(stream)
+
+def _format_validation_error(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in detail['loc']) or 'row'}: {detail['msg']}"
+        for detail in error.errors()
+    )
+
+async def _insert_chunk(user: User, rows: List[Dict[str, Any]], db: AsyncSession):
+    await db.execute(insert(Meal), rows)
+    
+    daily_deltas: Dict[date, Dict[str, float]] = defaultdict(lambda: defaultdict(float))
+    for row in rows:
+        totals = daily_deltas[row["logged_at"].date()]
+        totals["meal_count"] += 1
+        for field in NUTRIENT_FIELDS:
+            totals[field] += row.get(field) or 0.0
+    
+    for day, totals in daily_deltas.items():
+        await apply_daily_nutrition_delta(user.id, day, totals, db, meal_count=int(totals["meal_count"]))
+    
+    await bump_data_version(user.id, db)
+    await invalidate_weekly_reports(user.id, daily_deltas.keys(), db)
+    await db.commit()
+
+async def import_meals(user: User, stream: BinaryIO, import_format: ImportFormat, db: AsyncSession) -> MealImportResult:
+    imported = 0
+    failed = 0
+    errors: List[MealImportError] = []
+    last_row = 0
+    
+    def record_error(row_number: int, message: str):
+        nonlocal failed
+        failed += 1
+        if len(errors) < settings.import_max_errors:
+            errors.append(MealImportError(row=row_number, error=message))
+    
+    rows = iter_import_rows(stream, import_format)
+    
+    def read_chunk() -> Tuple[List[Dict[str, Any]], bool]:
+        nonlocal last_row
+        chunk: List[Dict[str, Any]] = []
+        try:
+            for row_number, raw in rows:
+                last_row = row_number
+                if isinstance(raw, Exception):
+                    record_error(row_number, f"Invalid JSON: {raw}")
+                    continue
+                if not isinstance(raw, dict):
+                    record_error(row_number, "Row must be an object")
+                    continue
+                
+                try:
+                    meal_data = MealCreate.model_validate(raw)
+                except ValidationError as e:
+                    record_error(row_number, _format_validation_error(e))
+                    continue
+                
+                row = meal_data.model_dump()
+                row["user_id"] = user.id
+                row["logged_at"] = row["logged_at"] or datetime.utcnow()
+                chunk.append(row)
+                
+                if len(chunk) >= settings.import_chunk_size:
+                    return chunk, False
+        except (UnicodeDecodeError, csv.Error) as e:
+            record_error(last_row + 1, f"Unreadable file: {e}")
+        return chunk, True
+    
+    finished = False
+    while not finished:
+        chunk, finished = await run_in_threadpool(read_chunk)
+        if chunk:
+            await _insert_chunk(user, chunk, db)
+            imported += len(chunk)
+    
+    if imported:
+        await recompute_user_streak(user.id, db)
+        await bump_data_version(user.id, db)
+        await db.commit()
+    
+    return MealImportResult(imported=imported, failed=failed, errors=errors)
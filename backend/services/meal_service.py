@@ -1,15 +1,31 @@
-from typing import Dict, Any, List, Optional
-from sqlalchemy.orm import Session
-from sqlalchemy import desc, and_
+from typing import Dict, Any, List, Optional, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, desc, and_, tuple_, union_all
+from sqlalchemy.orm import aliased
 from models.user import User
-from models.meal import Meal
-from schemas.meal import MealCreate, MealUpdate, PhotoAnalysisRequest, ChatLogRequest, DailyNutritionSummary, WeeklyProgressData
-from services.ai_service import analyze_meal_photo, parse_meal_text
+from models.meal import Meal, MealArchive, DailyNutrition
+from schemas.meal import (
+    MealCreate, MealUpdate, MealSearchResult, MealPage, PhotoAnalysisRequest, ChatLogRequest, DailyNutritionSummary, WeeklyProgressData,
+    ProgressGranularity, ProgressBucket, ProgressRangeData, HeatmapCell, YearHeatmapData
+)
+from services.parse_cache_service import parse_meal_text_cached
+from services.food_service import parse_meal_text_locally
+from services.photo_cache_service import analyze_photo_cached
+from services.rollup_service import NUTRIENT_FIELDS, add_meal_to_rollup, remove_meal_from_rollup
+from services.streak_service import apply_logged_day_changes
+from services.search_service import search_user_meals
+from services.goal_service import get_goals_by_day, get_goals_for_day
+from services.data_version_service import bump_data_version
+from services.archive_service import MEAL_COLUMNS, meal_models, newest_first, get_archived_meal, restore_archived_meal
+from services.report_service import is_completed_week, get_stored_weekly_report, invalidate_weekly_reports
 from datetime import datetime, timedelta, date
+import base64
+import json
 from fastapi import HTTPException, status
+from utils.config import settings
+
+async def create_meal(user: User, meal_data: MealCreate, db: AsyncSession) -> Meal:
 
-async def create_meal(user: User, meal_data: MealCreate, db: Session) -> Meal:
-    
     meal = Meal(
         user_id=user.id,
         **meal_data.model_dump()
@@ -19,108 +35,208 @@ async def create_meal(user: User, meal_data: MealCreate, db: Session) -> Meal:
         meal.logged_at = datetime.utcnow()
     
     db.add(meal)
-    db.commit()
-    db.refresh(meal)
+    day_count = await add_meal_to_rollup(meal, db)
+    if day_count == 1:
+        await apply_logged_day_changes(user.id, db, added_day=meal.logged_at.date())
+    await bump_data_version(user.id, db)
+    await invalidate_weekly_reports(user.id, [meal.logged_at.date()], db)
+    await db.commit()
+    await db.refresh(meal)
     return meal
 
+def _user_meals_query(model, user: User, start_date: Optional[datetime], end_date: Optional[datetime]):
+    query = select(model).where(model.user_id == user.id)
+    
+    if start_date:
+        query = query.where(model.logged_at >= start_date)
+    if end_date:
+        query = query.where(model.logged_at <= end_date)
+    return query
+
 async def get_user_meals(
     user: User, 
-    db: Session, 
+    db: AsyncSession, 
     skip: int = 0, 
     limit: int = 100,
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None
 ) -> List[Meal]:
-    query = db.query(Meal).filter(Meal.user_id == user.id)
+    models = meal_models(start_date)
+    if len(models) == 1:
+        query = _user_meals_query(Meal, user, start_date, end_date)
+        return (await db.scalars(query.order_by(desc(Meal.logged_at)).offset(skip).limit(limit))).all()
     
-    if start_date:
-        query = query.filter(Meal.logged_at >= start_date)
-    if end_date:
-        query = query.filter(Meal.logged_at <= end_date)
+    history = union_all(*[
+        _user_meals_query(model, user, start_date, end_date).with_only_columns(*[getattr(model, name) for name in MEAL_COLUMNS])
+        for model in models
+    ]).subquery("meal_history")
+    meal = aliased(Meal, history)
+    query = select(meal).order_by(desc(meal.logged_at), desc(meal.id)).offset(skip).limit(limit)
+    return (await db.scalars(query)).all()
+
+def encode_meal_cursor(meal: Meal) -> str:
+    payload = json.dumps({"logged_at": meal.logged_at.isoformat(), "id": meal.id})
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+def decode_meal_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(payload["logged_at"]), int(payload["id"])
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Invalid cursor"
+        )
+
+async def get_user_meals_page(
+    user: User,
+    db: AsyncSession,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None
+) -> MealPage:
+    position = decode_meal_cursor(cursor) if cursor else None
+    
+    meals = []
+    for model in meal_models(start_date):
+        query = _user_meals_query(model, user, start_date, end_date)
+        if position:
+            query = query.where(tuple_(model.logged_at, model.id) < tuple_(*position))
+        meals += (await db.scalars(query.order_by(desc(model.logged_at), desc(model.id)).limit(limit + 1))).all()
+    meals = newest_first(meals)[:limit + 1]
+    
+    next_cursor = None
+    if limit > 0 and len(meals) > limit:
+        meals = meals[:limit]
+        next_cursor = encode_meal_cursor(meals[-1])
     
-    return query.order_by(desc(Meal.logged_at)).offset(skip).limit(limit).all()
+    return MealPage(items=meals, next_cursor=next_cursor)
 
-async def get_meal_by_id(user: User, meal_id: int, db: Session) -> Optional[Meal]:
-    return db.query(Meal).filter(
-        and_(Meal.id == meal_id, Meal.user_id == user.id)
-    ).first()
+async def get_meal_by_id(user: User, meal_id: int, db: AsyncSession) -> Optional[Meal]:
+    meal = await db.scalar(
+        select(Meal).where(and_(Meal.id == meal_id, Meal.user_id == user.id))
+    )
+    return meal or await get_archived_meal(user.id, meal_id, db)
 
-async def update_meal(user: User, meal_id: int, meal_data: MealUpdate, db: Session) -> Optional[Meal]:
+async def update_meal(user: User, meal_id: int, meal_data: MealUpdate, db: AsyncSession) -> Optional[Meal]:
     meal = await get_meal_by_id(user, meal_id, db)
     if not meal:
         return None
+    if isinstance(meal, MealArchive):
+        meal = await restore_archived_meal(meal, db)
     
     update_data = meal_data.model_dump(exclude_unset=True)
+    old_day = meal.logged_at.date()
+    old_day_count = await remove_meal_from_rollup(meal, db)
     for field, value in update_data.items():
         setattr(meal, field, value)
+    new_day = meal.logged_at.date()
+    new_day_count = await add_meal_to_rollup(meal, db)
+    
+    if old_day != new_day:
+        await apply_logged_day_changes(
+            user.id,
+            db,
+            added_day=new_day if new_day_count == 1 else None,
+            removed_day=old_day if old_day_count == 0 else None
+        )
     
-    db.commit()
-    db.refresh(meal)
+    await bump_data_version(user.id, db)
+    await invalidate_weekly_reports(user.id, [old_day, new_day], db)
+    await db.commit()
+    await db.refresh(meal)
     return meal
 
-async def delete_meal(user: User, meal_id: int, db: Session) -> bool:
+async def delete_meal(user: User, meal_id: int, db: AsyncSession) -> bool:
     meal = await get_meal_by_id(user, meal_id, db)
     if not meal:
         return False
     
-    db.delete(meal)
-    db.commit()
+    day_count = await remove_meal_from_rollup(meal, db)
+    if day_count == 0:
+        await apply_logged_day_changes(user.id, db, removed_day=meal.logged_at.date())
+    await bump_data_version(user.id, db)
+    await invalidate_weekly_reports(user.id, [meal.logged_at.date()], db)
+    await db.delete(meal)
+    await db.commit()
     return True
 
-async def analyze_photo(user: User, photo_request: PhotoAnalysisRequest, db: Session):
-    analysis = await analyze_meal_photo(photo_request.image_url)
+async def analyze_photo(user: User, photo_request: PhotoAnalysisRequest, db: AsyncSession):
+    analysis = await analyze_photo_cached(user, photo_request.image_url, db)
     return analysis
 
-async def parse_chat_log(user: User, chat_request: ChatLogRequest, db: Session):
-    analysis = await parse_meal_text(chat_request.description)
+async def parse_chat_log(user: User, chat_request: ChatLogRequest, db: AsyncSession):
+    analysis = parse_meal_text_locally(chat_request.description)
+    if analysis is None:
+        analysis = await parse_meal_text_cached(chat_request.description, db)
     return analysis
 
-async def get_daily_nutrition_summary(user: User, target_date: date, db: Session) -> DailyNutritionSummary:
-    start_datetime = datetime.combine(target_date, datetime.min.time())
-    end_datetime = datetime.combine(target_date + timedelta(days=1), datetime.min.time())
-    
-    meals = db.query(Meal).filter(
-        and_(
-            Meal.user_id == user.id,
-            Meal.logged_at >= start_datetime,
-            Meal.logged_at < end_datetime
+def _empty_totals() -> Dict[str, float]:
+    totals = {field: 0.0 for field in NUTRIENT_FIELDS}
+    totals["meal_count"] = 0
+    return totals
+
+async def get_daily_totals(user: User, start_date: date, end_date: date, db: AsyncSession) -> Dict[date, Dict[str, float]]:
+    rollups = (await db.scalars(
+        select(DailyNutrition).where(
+            and_(
+                DailyNutrition.user_id == user.id,
+                DailyNutrition.day >= start_date,
+                DailyNutrition.day < end_date,
+                DailyNutrition.meal_count > 0
+            )
         )
-    ).all()
-    
-    total_calories = sum(meal.calories or 0 for meal in meals)
-    total_protein = sum(meal.protein or 0 for meal in meals)
-    total_carbs = sum(meal.carbs or 0 for meal in meals)
-    total_fat = sum(meal.fat or 0 for meal in meals)
-    total_fiber = sum(meal.fiber or 0 for meal in meals)
-    total_water = sum(meal.water or 0 for meal in meals)
-    
-    goals = {}
-    if user.profile:
-        from services.user_service import calculate_user_goals
-        goals = await calculate_user_goals(user.profile)
+    )).all()
     
+    return {
+        rollup.day: {
+            "meal_count": rollup.meal_count,
+            **{field: getattr(rollup, field) for field in NUTRIENT_FIELDS}
+        }
+        for rollup in rollups
+    }
+
+def _build_daily_summary(target_date: date, totals: Dict[str, float], goals: Dict[str, float]) -> DailyNutritionSummary:
     return DailyNutritionSummary(
-        date=start_datetime,
-        meal_count=len(meals),
-        calories=total_calories,
-        protein=total_protein,
-        carbs=total_carbs,
-        fat=total_fat,
-        fiber=total_fiber,
-        water=total_water,
+        date=datetime.combine(target_date, datetime.min.time()),
+        meal_count=totals["meal_count"],
+        calories=totals["calories"],
+        protein=totals["protein"],
+        carbs=totals["carbs"],
+        fat=totals["fat"],
+        fiber=totals["fiber"],
+        water=totals["water"],
         calorie_goal=goals.get("calorie_goal"),
         protein_goal=goals.get("protein"),
         carbs_goal=goals.get("carbs"),
         fat_goal=goals.get("fat")
     )
 
-async def get_weekly_progress(user: User, week_start: date, db: Session) -> WeeklyProgressData:
-    daily_summaries = []
+async def get_daily_nutrition_summary(user: User, target_date: date, db: AsyncSession) -> DailyNutritionSummary:
+    daily_totals = await get_daily_totals(user, target_date, target_date + timedelta(days=1), db)
+    goals = await get_goals_for_day(user, target_date, db)
+    return _build_daily_summary(target_date, daily_totals.get(target_date, _empty_totals()), goals)
+
+async def get_weekly_progress(user: User, week_start: date, db: AsyncSession) -> WeeklyProgressData:
+    if is_completed_week(week_start):
+        stored = await get_stored_weekly_report(user.id, week_start, db)
+        if stored:
+            return stored
+    return await compute_weekly_progress(user, week_start, db)
+
+async def compute_weekly_progress(user: User, week_start: date, db: AsyncSession) -> WeeklyProgressData:
+    week_end = week_start + timedelta(days=7)
+    daily_totals = await get_daily_totals(user, week_start, week_end, db)
+    goals_by_day = await get_goals_by_day(user, week_start, week_end, db)
     
+    daily_summaries = []
     for i in range(7):
         current_date = week_start + timedelta(days=i)
-        daily_summary = await get_daily_nutrition_summary(user, current_date, db)
-        daily_summaries.append(daily_summary)
+        daily_summaries.append(
+            _build_daily_summary(current_date, daily_totals.get(current_date, _empty_totals()), goals_by_day[current_date])
+        )
     
     total_calories = sum(day.calories or 0 for day in daily_summaries)
     total_protein = sum(day.protein or 0 for day in daily_summaries)
@@ -138,32 +254,130 @@ async def get_weekly_progress(user: User, week_start: date, db: Session) -> Week
         avg_fat=total_fat / max(days_with_meals, 1)
     )
 
-async def get_meal_calendar_data(user: User, month: int, year: int, db: Session) -> Dict[str, Any]:
-    start_date = datetime(year, month, 1)
-    if month == 12:
-        end_date = datetime(year + 1, 1, 1)
-    else:
-        end_date = datetime(year, month + 1, 1)
+LAST_RANGE_DATE = date(date.max.year, 12, 1)
+RANGE_GOAL_FIELDS = {"calorie_goal": "calorie_goal", "protein_goal": "protein", "carbs_goal": "carbs", "fat_goal": "fat"}
+
+def _bucket_start(day: date, granularity: ProgressGranularity) -> date:
+    if granularity == ProgressGranularity.WEEK:
+        return day - timedelta(days=day.weekday())
+    if granularity == ProgressGranularity.MONTH:
+        return day.replace(day=1)
+    return day
+
+def _next_bucket_start(bucket_start: date, granularity: ProgressGranularity) -> date:
+    if granularity == ProgressGranularity.WEEK:
+        return bucket_start + timedelta(days=7)
+    if granularity == ProgressGranularity.MONTH:
+        if bucket_start.month == 12:
+            return date(bucket_start.year + 1, 1, 1)
+        return date(bucket_start.year, bucket_start.month + 1, 1)
+    return bucket_start + timedelta(days=1)
+
+async def get_progress_range(
+    user: User,
+    start_date: date,
+    end_date: date,
+    granularity: ProgressGranularity,
+    db: AsyncSession
+) -> ProgressRangeData:
+    if end_date < start_date:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="end must not be before start"
+        )
+    
+    if end_date >= LAST_RANGE_DATE:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"end must be before {LAST_RANGE_DATE.isoformat()}"
+        )
     
-    meals = db.query(Meal).filter(
-        and_(
-            Meal.user_id == user.id,
-            Meal.logged_at >= start_date,
-            Meal.logged_at < end_date
+    if (end_date - start_date).days + 1 > settings.progress_range_max_days:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Range must not exceed {settings.progress_range_max_days} days"
         )
-    ).all()
-    
-    calendar_data = {}
-    for meal in meals:
-        day = meal.logged_at.day
-        if day not in calendar_data:
-            calendar_data[day] = {
-                "meal_count": 0,
-                "total_calories": 0
-            }
+    
+    range_end = end_date + timedelta(days=1)
+    daily_totals = await get_daily_totals(user, start_date, range_end, db)
+    goals_by_day = await get_goals_by_day(user, start_date, range_end, db)
+    goals = goals_by_day[end_date]
+    
+    buckets = []
+    bucket_start = _bucket_start(start_date, granularity)
+    while bucket_start < range_end:
+        next_start = _next_bucket_start(bucket_start, granularity)
+        period_start = max(bucket_start, start_date)
+        period_end = min(next_start, range_end)
         
-        calendar_data[day]["meal_count"] += 1
-        calendar_data[day]["total_calories"] += meal.calories or 0
+        totals = _empty_totals()
+        goal_totals: Dict[str, float] = {}
+        days_logged = 0
+        current_date = period_start
+        while current_date < period_end:
+            day_totals = daily_totals.get(current_date)
+            if day_totals:
+                days_logged += 1
+                for key, value in day_totals.items():
+                    totals[key] += value
+            for field, key in RANGE_GOAL_FIELDS.items():
+                if goals_by_day[current_date].get(key) is not None:
+                    goal_totals[field] = goal_totals.get(field, 0.0) + goals_by_day[current_date][key]
+            current_date += timedelta(days=1)
+        
+        buckets.append(ProgressBucket(
+            start=datetime.combine(period_start, datetime.min.time()),
+            end=datetime.combine(period_end, datetime.min.time()),
+            days_logged=days_logged,
+            **totals,
+            **goal_totals
+        ))
+        bucket_start = next_start
+    
+    return ProgressRangeData(
+        start=datetime.combine(start_date, datetime.min.time()),
+        end=datetime.combine(range_end, datetime.min.time()),
+        granularity=granularity,
+        buckets=buckets,
+        calorie_goal=goals.get("calorie_goal"),
+        protein_goal=goals.get("protein"),
+        carbs_goal=goals.get("carbs"),
+        fat_goal=goals.get("fat")
+    )
+
+async def get_calendar_cells(user: User, start_date: date, end_date: date, db: AsyncSession) -> List[Tuple[date, int, float]]:
+    result = await db.execute(
+        select(
+            DailyNutrition.day,
+            DailyNutrition.meal_count,
+            DailyNutrition.calories
+        ).where(
+            and_(
+                DailyNutrition.user_id == user.id,
+                DailyNutrition.day >= start_date,
+                DailyNutrition.day < end_date,
+                DailyNutrition.meal_count > 0
+            )
+        ).order_by(DailyNutrition.day)
+    )
+    return result.all()
+
+async def get_meal_calendar_data(user: User, month: int, year: int, db: AsyncSession) -> Dict[str, Any]:
+    start_date = date(year, month, 1)
+    if month == 12:
+        end_date = date(year + 1, 1, 1)
+    else:
+        end_date = date(year, month + 1, 1)
+    
+    cells = await get_calendar_cells(user, start_date, end_date, db)
+    
+    calendar_data = {
+        day.day: {
+            "meal_count": meal_count,
+            "total_calories": total_calories
+        }
+        for day, meal_count, total_calories in cells
+    }
     
     return {
         "month": month,
@@ -171,8 +385,28 @@ async def get_meal_calendar_data(user: User, month: int, year: int, db: Session)
         "days": calendar_data
     }
 
-async def get_recent_meals_for_ai(user: User, db: Session, limit: int = 5) -> List[Dict[str, Any]]:
-    meals = db.query(Meal).filter(Meal.user_id == user.id).order_by(desc(Meal.logged_at)).limit(limit).all()
+async def get_year_heatmap(user: User, year: int, db: AsyncSession) -> YearHeatmapData:
+    start_date = date(year, 1, 1)
+    end_date = date(year + 1, 1, 1)
+    
+    cells = {
+        day: (meal_count, total_calories)
+        for day, meal_count, total_calories in await get_calendar_cells(user, start_date, end_date, db)
+    }
+    
+    days = []
+    current_date = start_date
+    while current_date < end_date:
+        meal_count, total_calories = cells.get(current_date, (0, 0.0))
+        days.append(HeatmapCell(day=current_date, meal_count=meal_count, total_calories=total_calories))
+        current_date += timedelta(days=1)
+    
+    return YearHeatmapData(year=year, days=days)
+
+async def get_recent_meals_for_ai(user: User, db: AsyncSession, limit: int = 5) -> List[Dict[str, Any]]:
+    meals = (await db.scalars(
+        select(Meal).where(Meal.user_id == user.id).order_by(desc(Meal.logged_at)).limit(limit)
+    )).all()
     
     return [
         {
@@ -186,10 +420,5 @@ async def get_recent_meals_for_ai(user: User, db: Session, limit: int = 5) -> Li
         for meal in meals
     ]
 
-async def search_meals(user: User, query: str, db: Session, limit: int = 20) -> List[Meal]:
-    return db.query(Meal).filter(
-        and_(
-            Meal.user_id == user.id,
-            Meal.description.ilike(f"%{query}%")
-        )
-    ).order_by(desc(Meal.logged_at)).limit(limit).all()
\ No newline at end of file
+async def search_meals(user: User, query: str, db: AsyncSession, limit: int = 20) -> List[MealSearchResult]:
+    return await search_user_meals(user, query, db, limit)
\ No newline at end of file
@@ -0,0 +1,128 @@
+from typing import Any, Dict, Optional
+from datetime import datetime, timedelta
+import hashlib
+import json
+import logging
+import re
+import time
+import unicodedata
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from models.ai_cache import MealTextCache
+from schemas.meal import ChatLogResponse, ParseSource
+from services import ai_service
+from utils.cache import TTLCache
+from utils.config import settings
+
+logger = logging.getLogger(__name__)
+
+MEAL_TEXT_CACHE_VERSION = hashlib.sha256(json.dumps([
+    ai_service.MEAL_TEXT_PARAMS,
+    ai_service.MEAL_TEXT_SYSTEM_PROMPT,
+    ai_service.MEAL_TEXT_USER_PROMPT,
+    sorted(ChatLogResponse.model_fields),
+], sort_keys=True).encode()).hexdigest()[:16]
+
+memory_cache = TTLCache(settings.meal_text_cache_size, settings.meal_text_cache_ttl_seconds)
+metrics = {"memory_hits": 0, "db_hits": 0, "misses": 0, "errors": 0, "model_seconds": 0.0}
+
+def normalize_description(description: str) -> str:
+    text = unicodedata.normalize("NFKC", description).casefold()
+    text = re.sub(r"\s+", " ", text).strip()
+    return text.rstrip(" .!?;,")
+
+def meal_text_cache_key(normalized: str) -> str:
+    return hashlib.sha256(f"{MEAL_TEXT_CACHE_VERSION}\x00{normalized}".encode()).hexdigest()
+
+def _upsert_statement(db: AsyncSession, values: Dict[str, Any]):
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        return None
+    
+    statement = dialect_insert(MealTextCache).values(**values)
+    return statement.on_conflict_do_update(
+        index_elements=[MealTextCache.cache_key],
+        set_={field: getattr(statement.excluded, field) for field in ("response", "created_at", "expires_at")}
+    )
+
+async def _load(key: str, db: AsyncSession) -> Optional[MealTextCache]:
+    return await db.scalar(
+        select(MealTextCache).where(MealTextCache.cache_key == key, MealTextCache.expires_at > datetime.utcnow())
+    )
+
+async def _store(key: str, normalized: str, result: ChatLogResponse, db: AsyncSession) -> datetime:
+    now = datetime.utcnow()
+    values = {
+        "cache_key": key,
+        "model_version": MEAL_TEXT_CACHE_VERSION,
+        "description": normalized,
+        "response": result.model_dump(mode="json"),
+        "created_at": now,
+        "expires_at": now + timedelta(seconds=settings.meal_text_cache_ttl_seconds),
+    }
+    
+    statement = _upsert_statement(db, values)
+    if statement is None:
+        await db.execute(delete(MealTextCache).where(MealTextCache.cache_key == key))
+        await db.execute(MealTextCache.__table__.insert().values(**values))
+    else:
+        await db.execute(statement)
+    await db.commit()
+    return values["expires_at"]
+
+def _remember(key: str, result: ChatLogResponse, expires_at: datetime):
+    memory_cache.set(key, result, time.time() + (expires_at - datetime.utcnow()).total_seconds())
+
+async def parse_meal_text_cached(description: str, db: AsyncSession) -> ChatLogResponse:
+    if settings.meal_text_cache_ttl_seconds <= 0:
+        return await ai_service.parse_meal_text(description)
+    
+    normalized = normalize_description(description)
+    key = meal_text_cache_key(normalized)
+    
+    cached = memory_cache.get(key)
+    if cached is not None:
+        metrics["memory_hits"] += 1
+        return cached.model_copy(update={"source": ParseSource.CACHE})
+    
+    row = await _load(key, db)
+    await db.commit()
+    if row is not None:
+        metrics["db_hits"] += 1
+        result = ChatLogResponse.model_validate(row.response)
+        _remember(key, result, row.expires_at)
+        return result.model_copy(update={"source": ParseSource.CACHE})
+    
+    metrics["misses"] += 1
+    started = time.perf_counter()
+    try:
+        result = await ai_service.request_meal_text_parse(description)
+    except Exception as e:
+        metrics["errors"] += 1
+        logger.warning("Error parsing meal text: %s", e)
+        return ai_service.meal_text_fallback(description)
+    finally:
+        metrics["model_seconds"] += time.perf_counter() - started
+    
+    _remember(key, result, await _store(key, normalized, result, db))
+    return result.model_copy()
+
+async def purge_expired_meal_text_cache(db: AsyncSession) -> int:
+    result = await db.execute(delete(MealTextCache).where(MealTextCache.expires_at <= datetime.utcnow()))
+    await db.commit()
+    return result.rowcount
+
+def meal_text_cache_stats() -> Dict[str, Any]:
+    lookups = metrics["memory_hits"] + metrics["db_hits"] + metrics["misses"]
+    hits = metrics["memory_hits"] + metrics["db_hits"]
+    return {
+        "version": MEAL_TEXT_CACHE_VERSION,
+        **metrics,
+        "model_seconds": round(metrics["model_seconds"], 3),
+        "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+        "memory": memory_cache.stats(),
+    }
@@ -0,0 +1,110 @@
+from typing import Any, Dict, List, Optional, Tuple
+from datetime import datetime, timedelta
+from uuid import UUID
+import hashlib
+import json
+import logging
+import time
+import numpy as np
+from fastapi import HTTPException
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from models.user import User
+from models.ai_cache import MealPhotoCache
+from schemas.meal import PhotoAnalysisResponse
+from services import ai_service
+from services.image_service import prepare_image
+from utils.config import settings
+
+logger = logging.getLogger(__name__)
+
+PHOTO_CACHE_VERSION = hashlib.sha256(json.dumps([
+    ai_service.PHOTO_ANALYSIS_PARAMS,
+    ai_service.PHOTO_ANALYSIS_SYSTEM_PROMPT,
+    ai_service.PHOTO_ANALYSIS_USER_PROMPT,
+    sorted(PhotoAnalysisResponse.model_fields),
+    [settings.photo_max_edge, settings.photo_jpeg_quality],
+], sort_keys=True).encode()).hexdigest()[:16]
+
+metrics = {"exact_hits": 0, "near_hits": 0, "misses": 0, "errors": 0, "unreadable": 0, "model_seconds": 0.0}
+
+def hamming_distances(image_hash: str, candidates: List[str]) -> np.ndarray:
+    target = np.frombuffer(bytes.fromhex(image_hash), dtype=np.uint8)
+    stored = np.frombuffer(bytes.fromhex("".join(candidates)), dtype=np.uint8).reshape(len(candidates), -1)
+    return np.unpackbits(stored ^ target, axis=1).sum(axis=1)
+
+async def find_similar_analysis(user_id: UUID, image_hash: str, db: AsyncSession) -> Optional[Tuple[Dict[str, Any], int]]:
+    rows = (await db.execute(
+        select(MealPhotoCache.image_hash, MealPhotoCache.response).where(
+            MealPhotoCache.user_id == user_id,
+            MealPhotoCache.model_version == PHOTO_CACHE_VERSION,
+            MealPhotoCache.expires_at > datetime.utcnow()
+        ).order_by(MealPhotoCache.created_at.desc()).limit(settings.photo_cache_candidates)
+    )).all()
+    if not rows:
+        return None
+    
+    distances = hamming_distances(image_hash, [row.image_hash for row in rows])
+    best = int(np.argmin(distances))
+    if distances[best] > settings.photo_cache_max_distance:
+        return None
+    return rows[best].response, int(distances[best])
+
+async def analyze_photo_cached(user: User, image_url: str, db: AsyncSession) -> PhotoAnalysisResponse:
+    if settings.photo_cache_ttl_seconds <= 0:
+        return await ai_service.analyze_meal_photo(image_url)
+    
+    try:
+        image_data, image_hash = await prepare_image(image_url)
+    except HTTPException:
+        raise
+    except Exception as e:
+        metrics["unreadable"] += 1
+        logger.warning("Error reading photo: %s", e)
+        return ai_service.photo_analysis_fallback()
+    
+    match = await find_similar_analysis(user.id, image_hash, db)
+    await db.commit()
+    if match is not None:
+        response, distance = match
+        metrics["exact_hits" if distance == 0 else "near_hits"] += 1
+        return PhotoAnalysisResponse.model_validate(response)
+    
+    metrics["misses"] += 1
+    started = time.perf_counter()
+    try:
+        result = await ai_service.request_meal_photo_analysis(image_data)
+    except Exception as e:
+        metrics["errors"] += 1
+        logger.warning("Error analyzing photo: %s", e)
+        return ai_service.photo_analysis_fallback()
+    finally:
+        metrics["model_seconds"] += time.perf_counter() - started
+    
+    now = datetime.utcnow()
+    db.add(MealPhotoCache(
+        user_id=user.id,
+        image_hash=image_hash,
+        model_version=PHOTO_CACHE_VERSION,
+        response=result.model_dump(mode="json"),
+        created_at=now,
+        expires_at=now + timedelta(seconds=settings.photo_cache_ttl_seconds)
+    ))
+    await db.commit()
+    return result
+
+async def purge_expired_meal_photo_cache(db: AsyncSession) -> int:
+    result = await db.execute(delete(MealPhotoCache).where(MealPhotoCache.expires_at <= datetime.utcnow()))
+    await db.commit()
+    return result.rowcount
+
+def meal_photo_cache_stats() -> Dict[str, Any]:
+    hits = metrics["exact_hits"] + metrics["near_hits"]
+    lookups = hits + metrics["misses"]
+    return {
+        "version": PHOTO_CACHE_VERSION,
+        "max_distance": settings.photo_cache_max_distance,
+        **metrics,
+        "model_seconds": round(metrics["model_seconds"], 3),
+        "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+    }
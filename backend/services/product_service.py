@@ -0,0 +1,130 @@
+from typing import Optional
+from pathlib import Path
+import os
+import numpy as np
+from fastapi import HTTPException, status
+from schemas.meal import BarcodeProduct, MealCreate, NutritionBase
+from services.rollup_service import NUTRIENT_FIELDS
+from utils.config import settings
+
+DEFAULT_PRODUCT_INDEX_PATH = Path(__file__).resolve().parent.parent / "data" / "products.idx"
+INDEX_MAGIC = b"EWPRODX1"
+HEADER_SIZE = 16
+NAME_BYTES = 80
+BRAND_BYTES = 40
+
+PRODUCT_DTYPE = np.dtype(
+    [(field, "<f4") for field in NUTRIENT_FIELDS]
+    + [("serving_grams", "<f4"), ("name", f"S{NAME_BYTES}"), ("brand", f"S{BRAND_BYTES}")]
+)
+
+def product_index_path() -> Path:
+    return Path(settings.product_index_path) if settings.product_index_path else DEFAULT_PRODUCT_INDEX_PATH
+
+def normalize_barcode(barcode: str) -> Optional[int]:
+    barcode = barcode.strip()
+    if not barcode.isascii() or not barcode.isdigit() or not 6 <= len(barcode) <= 14:
+        return None
+    return int(barcode)
+
+def write_product_index(path: Path, codes: np.ndarray, products: np.ndarray) -> int:
+    order = np.argsort(codes, kind="stable")
+    codes, products = codes[order], products[order]
+    keep = np.append(codes[1:] != codes[:-1], True) if len(codes) else np.zeros(0, dtype=bool)
+    codes, products = codes[keep].astype("<u8"), products[keep].astype(PRODUCT_DTYPE)
+    
+    temporary = path.with_name(f"{path.name}.tmp")
+    with open(temporary, "wb") as handle:
+        handle.write(INDEX_MAGIC)
+        handle.write(np.array([len(codes)], dtype="<u8").tobytes())
+        handle.write(codes.tobytes())
+        handle.write(products.tobytes())
+    os.replace(temporary, path)
+    return len(codes)
+
+class ProductIndex:
+    def __init__(self, path: Path):
+        stat = os.stat(path)
+        self.identity = (stat.st_ino, stat.st_mtime_ns)
+        with open(path, "rb") as handle:
+            header = handle.read(HEADER_SIZE)
+        if len(header) != HEADER_SIZE or header[:8] != INDEX_MAGIC:
+            raise ValueError(f"{path} is not a product index")
+        
+        count = int(np.frombuffer(header[8:], dtype="<u8")[0])
+        self.codes = np.memmap(path, dtype="<u8", mode="r", offset=HEADER_SIZE, shape=(count,)) if count else np.zeros(0, dtype="<u8")
+        self.products = (
+            np.memmap(path, dtype=PRODUCT_DTYPE, mode="r", offset=HEADER_SIZE + 8 * count, shape=(count,))
+            if count else np.zeros(0, dtype=PRODUCT_DTYPE)
+        )
+    
+    def __len__(self) -> int:
+        return len(self.codes)
+    
+    def find(self, code: int) -> Optional[np.void]:
+        position = int(np.searchsorted(self.codes, np.uint64(code)))
+        if position < len(self.codes) and int(self.codes[position]) == code:
+            return self.products[position]
+        return None
+
+_product_index: Optional[ProductIndex] = None
+
+def get_product_index() -> Optional[ProductIndex]:
+    global _product_index
+    path = product_index_path()
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        _product_index = None
+        return None
+    
+    if _product_index is None or _product_index.identity != (stat.st_ino, stat.st_mtime_ns):
+        _product_index = ProductIndex(path)
+    return _product_index
+
+def _text(value: bytes) -> Optional[str]:
+    return value.decode("utf-8", errors="ignore").strip() or None
+
+def _amount(value: float, scale: float, digits: int) -> Optional[float]:
+    return round(value * scale, digits) if np.isfinite(value) and value >= 0 else None
+
+def lookup_barcode(barcode: str, servings: float, grams: Optional[float]) -> BarcodeProduct:
+    code = normalize_barcode(barcode)
+    if code is None:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Barcode must be 6 to 14 digits"
+        )
+    
+    index = get_product_index()
+    if index is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Product index is not available"
+        )
+    
+    product = index.find(code)
+    if product is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Product not found"
+        )
+    
+    serving_grams = _amount(float(product["serving_grams"]), 1.0, 1) or None
+    portion = grams if grams is not None else servings * (serving_grams or 100.0)
+    name = _text(product["name"]) or barcode.strip()
+    brand = _text(product["brand"])
+    nutrients = {field: float(product[field]) for field in NUTRIENT_FIELDS}
+    
+    return BarcodeProduct(
+        barcode=barcode.strip(),
+        name=name,
+        brand=brand,
+        serving_grams=serving_grams,
+        grams=round(portion, 1),
+        per_100g=NutritionBase(**{field: _amount(value, 1.0, 2) for field, value in nutrients.items()}),
+        meal=MealCreate(
+            description=name if not brand or name.casefold().startswith(brand.casefold()) else f"{brand} {name}",
+            **{field: _amount(value, portion / 100.0, 1) for field, value in nutrients.items()}
+        )
+    )
@@ -0,0 +1,53 @@
+from typing import Iterable, Optional
+from datetime import date, datetime, timedelta
+from uuid import UUID
+from sqlalchemy import JSON, DateTime, Date, Uuid, delete, insert, literal, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from models.user import User
+from models.meal import WeeklyReport
+from schemas.meal import WeeklyProgressData
+
+def last_completed_week_start(today: Optional[date] = None) -> date:
+    today = today or datetime.utcnow().date()
+    return today - timedelta(days=today.weekday() + 7)
+
+def is_completed_week(week_start: date) -> bool:
+    return week_start + timedelta(days=7) <= datetime.utcnow().date()
+
+async def get_stored_weekly_report(user_id: UUID, week_start: date, db: AsyncSession) -> Optional[WeeklyProgressData]:
+    report = await db.scalar(
+        select(WeeklyReport.report).where(WeeklyReport.user_id == user_id, WeeklyReport.week_start == week_start)
+    )
+    return WeeklyProgressData.model_validate(report) if report is not None else None
+
+async def store_weekly_report(user: User, report: WeeklyProgressData, db: AsyncSession) -> bool:
+    week_start = report.week_start.date()
+    await db.execute(delete(WeeklyReport).where(WeeklyReport.user_id == user.id, WeeklyReport.week_start == week_start))
+    result = await db.execute(insert(WeeklyReport).from_select(
+        ["user_id", "week_start", "report", "computed_at"],
+        select(
+            literal(user.id, Uuid(as_uuid=True)),
+            literal(week_start, Date),
+            literal(report.model_dump(mode="json"), JSON),
+            literal(datetime.utcnow(), DateTime)
+        ).where(User.id == user.id, User.data_version == user.data_version)
+    ))
+    return result.rowcount > 0
+
+async def invalidate_weekly_reports(user_id: UUID, days: Iterable[date], db: AsyncSession):
+    today = datetime.utcnow().date()
+    days = [day for day in days if day < today]
+    if not days:
+        return
+    
+    await db.execute(delete(WeeklyReport).where(
+        WeeklyReport.user_id == user_id,
+        WeeklyReport.week_start > min(days) - timedelta(days=7),
+        WeeklyReport.week_start <= max(days)
+    ))
+
+async def clear_weekly_reports(user_ids: Optional[Iterable[UUID]], db: AsyncSession):
+    statement = delete(WeeklyReport)
+    if user_ids is not None:
+        statement = statement.where(WeeklyReport.user_id.in_(list(user_ids)))
+    await db.execute(statement)
@@ -0,0 +1,95 @@
+from typing import Dict, Optional
+from uuid import UUID
+from datetime import date
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import insert, delete, select, func, Date
+from models.meal import Meal, DailyNutrition
+from services.archive_service import meal_history
+
+NUTRIENT_FIELDS = ("calories", "protein", "carbs", "fat", "fiber", "water")
+
+def meal_nutrients(meal: Meal) -> Dict[str, float]:
+    return {field: getattr(meal, field) or 0.0 for field in NUTRIENT_FIELDS}
+
+def _upsert_statement(db: AsyncSession, values: Dict):
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        return None
+    
+    statement = dialect_insert(DailyNutrition).values(**values)
+    return statement.on_conflict_do_update(
+        index_elements=[DailyNutrition.user_id, DailyNutrition.day],
+        set_={
+            field: getattr(DailyNutrition, field) + getattr(statement.excluded, field)
+            for field in ("meal_count", *NUTRIENT_FIELDS)
+        }
+    ).returning(DailyNutrition.meal_count)
+
+async def apply_daily_nutrition_delta(
+    user_id: UUID,
+    day: date,
+    nutrients: Dict[str, float],
+    db: AsyncSession,
+    sign: int = 1,
+    meal_count: int = 1
+) -> int:
+    values = {
+        "user_id": user_id,
+        "day": day,
+        "meal_count": sign * meal_count,
+        **{field: sign * (nutrients.get(field) or 0.0) for field in NUTRIENT_FIELDS}
+    }
+    
+    statement = _upsert_statement(db, values)
+    if statement is not None:
+        return (await db.execute(statement)).scalar_one()
+    
+    rollup = await db.scalar(
+        select(DailyNutrition).where(
+            DailyNutrition.user_id == user_id,
+            DailyNutrition.day == day
+        ).with_for_update()
+    )
+    if not rollup:
+        db.add(DailyNutrition(**values))
+        await db.flush()
+        return values["meal_count"]
+    
+    for field in ("meal_count", *NUTRIENT_FIELDS):
+        setattr(rollup, field, getattr(rollup, field) + values[field])
+    await db.flush()
+    return rollup.meal_count
+
+async def add_meal_to_rollup(meal: Meal, db: AsyncSession) -> int:
+    return await apply_daily_nutrition_delta(meal.user_id, meal.logged_at.date(), meal_nutrients(meal), db)
+
+async def remove_meal_from_rollup(meal: Meal, db: AsyncSession) -> int:
+    return await apply_daily_nutrition_delta(meal.user_id, meal.logged_at.date(), meal_nutrients(meal), db, sign=-1)
+
+async def rebuild_daily_nutrition(db: AsyncSession, user_id: Optional[UUID] = None) -> int:
+    meals = meal_history("id", "user_id", "logged_at", *NUTRIENT_FIELDS, user_id=user_id)
+    day = func.date(meals.c.logged_at, type_=Date)
+    source = select(
+        meals.c.user_id,
+        day,
+        func.count(meals.c.id),
+        *[func.coalesce(func.sum(meals.c[field]), 0) for field in NUTRIENT_FIELDS]
+    ).group_by(meals.c.user_id, day)
+    clear = delete(DailyNutrition)
+    
+    if user_id:
+        clear = clear.where(DailyNutrition.user_id == user_id)
+    
+    await db.execute(clear)
+    result = await db.execute(
+        insert(DailyNutrition).from_select(
+            ["user_id", "day", "meal_count", *NUTRIENT_FIELDS],
+            source
+        )
+    )
+    await db.commit()
+    return result.rowcount
@@ -0,0 +1,164 @@
+from typing import List, Optional, Set, Tuple
+from datetime import datetime
+import html
+import re
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, desc, and_, func, literal, text, table, column
+from models.user import User
+from models.meal import Meal, MealArchive
+from models.search import search_index_available
+from schemas.meal import MealSearchResult
+from services.archive_service import archive_horizon
+from utils.config import settings
+
+WORD_PATTERN = re.compile(r"\w+")
+SNIPPET_RADIUS = 60
+CANDIDATE_MULTIPLIER = 5
+
+FTS_TABLES = {
+    Meal: "meals_fts",
+    MealArchive: "meals_archive_fts",
+}
+
+def _words(value: str) -> List[str]:
+    return [word.lower() for word in WORD_PATTERN.findall(value or "")]
+
+def _padded_trigrams(word: str) -> Set[str]:
+    padded = f"  {word} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+def _fts_trigrams(word: str) -> Set[str]:
+    return {word[i:i + 3] for i in range(len(word) - 2)}
+
+def word_similarity(term: str, word: str) -> float:
+    term_grams = _padded_trigrams(term)
+    word_grams = _padded_trigrams(word)
+    return len(term_grams & word_grams) / len(term_grams | word_grams)
+
+def text_relevance(query: str, description: Optional[str]) -> float:
+    terms = _words(query)
+    words = _words(description)
+    if not terms or not words:
+        return 0.0
+    return sum(max(word_similarity(term, word) for word in words) for term in terms) / len(terms)
+
+def recency_score(logged_at: datetime, now: datetime) -> float:
+    age_days = max((now - logged_at).total_seconds() / 86400, 0)
+    return 1.0 / (1.0 + age_days / settings.search_recency_half_life_days)
+
+def _term_matches(term: str, word: str) -> bool:
+    return word.startswith(term) or word_similarity(term, word) >= settings.search_similarity_threshold
+
+def build_snippet(description: Optional[str], query: str) -> Optional[str]:
+    if not description:
+        return None
+    
+    terms = _words(query)
+    spans = [
+        match.span() for match in WORD_PATTERN.finditer(description)
+        if any(_term_matches(term, match.group().lower()) for term in terms)
+    ]
+    
+    first_start = spans[0][0] if spans else 0
+    window_start = max(first_start - SNIPPET_RADIUS, 0)
+    window_end = min(first_start + SNIPPET_RADIUS, len(description))
+    
+    parts = ["…"] if window_start > 0 else []
+    cursor = window_start
+    for start, end in spans:
+        if start < window_start or end > window_end:
+            continue
+        parts.append(html.escape(description[cursor:start]))
+        parts.append(f"<mark>{html.escape(description[start:end])}</mark>")
+        cursor = end
+    parts.append(html.escape(description[cursor:window_end]))
+    if window_end < len(description):
+        parts.append("…")
+    
+    return "".join(parts)
+
+def _rank(meals: List[Meal], query: str, limit: int, min_relevance: float = 0.0) -> List[Tuple[Meal, float]]:
+    now = datetime.utcnow()
+    scored = []
+    for meal in meals:
+        relevance = text_relevance(query, meal.description)
+        if relevance < min_relevance:
+            continue
+        scored.append((meal, relevance + settings.search_recency_weight * recency_score(meal.logged_at, now)))
+    
+    scored.sort(key=lambda item: item[1], reverse=True)
+    return scored[:limit]
+
+async def _search_postgres(user: User, query: str, db: AsyncSession, limit: int, model=Meal) -> List[Tuple[Meal, float]]:
+    relevance = func.word_similarity(query, model.description)
+    age_days = func.extract("epoch", func.timezone("utc", func.now()) - model.logged_at) / 86400.0
+    recency = 1.0 / (1.0 + func.greatest(age_days, 0) / settings.search_recency_half_life_days)
+    score = (relevance + settings.search_recency_weight * recency).label("score")
+    
+    result = await db.execute(
+        select(model, score).where(
+            and_(
+                model.user_id == user.id,
+                literal(query).op("<%")(model.description)
+            )
+        ).order_by(desc("score")).limit(limit)
+    )
+    return result.all()
+
+async def _search_sqlite(user: User, query: str, db: AsyncSession, limit: int, model=Meal) -> List[Tuple[Meal, float]]:
+    grams = sorted({gram for term in _words(query) for gram in _fts_trigrams(term)})
+    match = " OR ".join(f'"{gram}"' for gram in grams)
+    fts_name = FTS_TABLES[model]
+    fts = table(fts_name, column("rowid"))
+    
+    candidates = (await db.scalars(
+        select(model).join(
+            fts, fts.c.rowid == model.id
+        ).where(
+            and_(
+                text(f"{fts_name} MATCH :match").bindparams(match=match),
+                model.user_id == user.id
+            )
+        ).order_by(text(f"bm25({fts_name})")).limit(limit * CANDIDATE_MULTIPLIER)
+    )).all()
+    
+    return _rank(candidates, query, limit, settings.search_similarity_threshold)
+
+async def _search_substring(user: User, query: str, db: AsyncSession, limit: int, model=Meal) -> List[Tuple[Meal, float]]:
+    meals = (await db.scalars(
+        select(model).where(
+            and_(
+                model.user_id == user.id,
+                model.description.ilike(f"%{query}%")
+            )
+        ).order_by(desc(model.logged_at)).limit(limit)
+    )).all()
+    
+    return _rank(meals, query, limit)
+
+async def search_user_meals(user: User, query: str, db: AsyncSession, limit: int = 20) -> List[MealSearchResult]:
+    dialect = db.get_bind().dialect.name
+    models = [Meal, MealArchive] if archive_horizon() is not None else [Meal]
+    
+    if dialect == "postgresql" and search_index_available(dialect):
+        await db.execute(
+            text("SELECT set_config('pg_trgm.word_similarity_threshold', :threshold, true)"),
+            {"threshold": str(settings.search_similarity_threshold)}
+        )
+        search = _search_postgres
+    elif dialect == "sqlite" and search_index_available(dialect) and any(len(term) >= 3 for term in _words(query)):
+        search = _search_sqlite
+    else:
+        search = _search_substring
+    
+    rows = []
+    for model in models:
+        rows += await search(user, query, db, limit, model)
+    rows = sorted(rows, key=lambda row: row[1], reverse=True)[:limit]
+    
+    return [
+        MealSearchResult.model_validate(meal).model_copy(
+            update={"score": score, "snippet": build_snippet(meal.description, query)}
+        )
+        for meal, score in rows
+    ]
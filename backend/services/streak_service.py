@@ -0,0 +1,110 @@
+from typing import Dict, Any, List, Optional, Tuple
+from uuid import UUID
+from datetime import date, datetime, timedelta
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func, cast, literal, Integer, Date
+from models.user import UserStreak
+from models.meal import DailyNutrition
+from services.archive_service import meal_history
+
+EPOCH = date(1970, 1, 1)
+
+def _epoch_day(day_expr, dialect: str):
+    if dialect == "sqlite":
+        return cast(func.julianday(day_expr) - 2440587.5, Integer)
+    return day_expr - literal(EPOCH, Date)
+
+def _logged_days(user_id: UUID, dialect: str, from_meals: bool):
+    if from_meals:
+        meals = meal_history("logged_at", user_id=user_id)
+        day = func.date(meals.c.logged_at, type_=Date)
+        return select(_epoch_day(day, dialect).label("n")).group_by(day).subquery()
+    
+    return select(_epoch_day(DailyNutrition.day, dialect).label("n")).where(
+        DailyNutrition.user_id == user_id,
+        DailyNutrition.meal_count > 0
+    ).subquery()
+
+async def get_logged_islands(user_id: UUID, db: AsyncSession, from_meals: bool = False) -> List[Tuple[date, date, int]]:
+    dialect = db.get_bind().dialect.name
+    days = _logged_days(user_id, dialect, from_meals)
+    numbered = select(
+        days.c.n,
+        (days.c.n - func.row_number().over(order_by=days.c.n)).label("island")
+    ).subquery()
+    
+    rows = (await db.execute(
+        select(
+            func.min(numbered.c.n).label("first_day"),
+            func.max(numbered.c.n).label("last_day"),
+            func.count().label("length")
+        ).group_by(numbered.c.island).order_by(func.max(numbered.c.n).desc())
+    )).all()
+    
+    return [
+        (EPOCH + timedelta(days=int(row.first_day)), EPOCH + timedelta(days=int(row.last_day)), row.length)
+        for row in rows
+    ]
+
+async def compute_streak(user_id: UUID, db: AsyncSession, from_meals: bool = False) -> Dict[str, Any]:
+    islands = await get_logged_islands(user_id, db, from_meals)
+    if not islands:
+        return {"current_streak": 0, "longest_streak": 0, "last_logged_date": None}
+    
+    _, last_logged_date, current_streak = islands[0]
+    return {
+        "current_streak": current_streak,
+        "longest_streak": max(length for _, _, length in islands),
+        "last_logged_date": last_logged_date
+    }
+
+async def recompute_user_streak(user_id: UUID, db: AsyncSession, from_meals: bool = False) -> UserStreak:
+    computed = await compute_streak(user_id, db, from_meals)
+    streak = await db.scalar(select(UserStreak).where(UserStreak.user_id == user_id).with_for_update())
+    if not streak:
+        streak = UserStreak(user_id=user_id)
+        db.add(streak)
+    
+    for field, value in computed.items():
+        setattr(streak, field, value)
+    await db.flush()
+    return streak
+
+async def record_logged_day(user_id: UUID, day: date, db: AsyncSession) -> UserStreak:
+    streak = await db.scalar(select(UserStreak).where(UserStreak.user_id == user_id).with_for_update())
+    if not streak or (streak.last_logged_date and day < streak.last_logged_date):
+        return await recompute_user_streak(user_id, db)
+    
+    if streak.last_logged_date and day == streak.last_logged_date + timedelta(days=1):
+        streak.current_streak += 1
+    elif streak.last_logged_date != day:
+        streak.current_streak = 1
+    
+    streak.last_logged_date = day
+    streak.longest_streak = max(streak.longest_streak, streak.current_streak)
+    await db.flush()
+    return streak
+
+async def apply_logged_day_changes(
+    user_id: UUID,
+    db: AsyncSession,
+    added_day: Optional[date] = None,
+    removed_day: Optional[date] = None
+):
+    if removed_day:
+        await recompute_user_streak(user_id, db)
+    elif added_day:
+        await record_logged_day(user_id, added_day, db)
+
+async def get_streak_summary(user_id: UUID, db: AsyncSession) -> Dict[str, Any]:
+    streak = await db.get(UserStreak, user_id)
+    if not streak:
+        streak = await recompute_user_streak(user_id, db)
+        await db.commit()
+    
+    today = datetime.utcnow().date()
+    return {
+        "streak": streak.current_streak if streak.last_logged_date == today else 0,
+        "longest_streak": streak.longest_streak,
+        "last_logged_date": streak.last_logged_date
+    }
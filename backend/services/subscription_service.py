@@ -1,9 +1,12 @@
 from typing import Dict, Any, Optional
 import stripe
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from models.user import User, UserRole, Subscription
 from schemas.user import SubscriptionCreate
+from services.auth_service import USER_LOAD_OPTIONS, invalidate_cached_user
 from services.user_service import create_subscription, cancel_subscription, get_user_subscription
+from services.data_version_service import bump_data_version
 from utils.config import settings
 from fastapi import HTTPException, status
 from datetime import datetime
@@ -51,7 +54,7 @@ async def create_checkout_session(user: User, plan: str, success_url: str, cance
             detail=f"Stripe error: {str(e)}"
         )
 
-async def handle_webhook_event(event_data: Dict[str, Any], signature: str, db: Session) -> bool:
+async def handle_webhook_event(event_data: Dict[str, Any], signature: str, db: AsyncSession) -> bool:
     try:
         event = stripe.Webhook.construct_event(
             event_data, signature, settings.stripe_webhook_secret
@@ -75,35 +78,37 @@ async def handle_webhook_event(event_data: Dict[str, Any], signature: str, db: S
     
     return True
 
-async def handle_successful_payment(session_data: Dict[str, Any], db: Session):
+async def handle_successful_payment(session_data: Dict[str, Any], db: AsyncSession):
     user_id = session_data["metadata"]["user_id"]
     plan = session_data["metadata"]["plan"]
     
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.scalar(select(User).options(*USER_LOAD_OPTIONS).where(User.id == user_id))
     if user:
         subscription_data = SubscriptionCreate(plan=plan)
         await create_subscription(user, subscription_data, db)
 
-async def handle_payment_succeeded(invoice_data: Dict[str, Any], db: Session):
+async def handle_payment_succeeded(invoice_data: Dict[str, Any], db: AsyncSession):
     customer_id = invoice_data["customer"]
     
     try:
         customer = stripe.Customer.retrieve(customer_id)
-        user = db.query(User).filter(User.email == customer.email).first()
+        user = await db.scalar(select(User).options(*USER_LOAD_OPTIONS).where(User.email == customer.email))
         
         if user and user.role != UserRole.PREMIUM:
             user.role = UserRole.PREMIUM
-            db.commit()
+            await bump_data_version(user.id, db)
+            await db.commit()
+            invalidate_cached_user(user.id)
     
     except stripe.error.StripeError:
         pass
 
-async def handle_subscription_cancelled(subscription_data: Dict[str, Any], db: Session):
+async def handle_subscription_cancelled(subscription_data: Dict[str, Any], db: AsyncSession):
     customer_id = subscription_data["customer"]
     
     try:
         customer = stripe.Customer.retrieve(customer_id)
-        user = db.query(User).filter(User.email == customer.email).first()
+        user = await db.scalar(select(User).options(*USER_LOAD_OPTIONS).where(User.email == customer.email))
         
         if user:
             await cancel_subscription(user, db)
@@ -133,7 +138,7 @@ async def get_billing_portal_url(user: User) -> str:
             detail=f"Stripe error: {str(e)}"
         )
 
-async def cancel_user_subscription(user: User, db: Session) -> bool:
+async def cancel_user_subscription(user: User, db: AsyncSession) -> bool:
     try:
         customers = stripe.Customer.list(email=user.email, limit=1)
         
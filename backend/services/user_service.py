@@ -1,61 +1,75 @@
-from typing import Dict, Any, Optional
-from sqlalchemy.orm import Session
-from models.user import User, UserProfile, Subscription, UserRole
+from typing import Dict, Any, List, Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from models.user import User, UserProfile, NutritionGoal, Subscription, UserRole
 from schemas.user import UserProfileCreate, UserProfileUpdate, SubscriptionCreate
-from utils.helpers import calculate_bmr, calculate_tdee, calculate_macro_targets, calculate_calorie_goal
-from datetime import datetime, timedelta
+from services.auth_service import invalidate_cached_user
+from services.goal_service import GOAL_INPUT_FIELDS, compute_profile_goals, get_goal_versions, get_goals_for_day, record_goal_version
+from services.streak_service import get_streak_summary
+from services.data_version_service import bump_data_version
+from datetime import datetime
 
-async def get_user_profile(user: User, db: Session) -> Optional[UserProfile]:
-    return db.query(UserProfile).filter(UserProfile.user_id == user.id).first()
+async def get_user_profile(user: User, db: AsyncSession) -> Optional[UserProfile]:
+    return await db.scalar(select(UserProfile).where(UserProfile.user_id == user.id))
 
-async def create_user_profile(user: User, profile_data: UserProfileCreate, db: Session) -> UserProfile:
+async def create_user_profile(user: User, profile_data: UserProfileCreate, db: AsyncSession) -> UserProfile:
     existing_profile = await get_user_profile(user, db)
     if existing_profile:
-        db.delete(existing_profile)
-        db.commit()
+        await db.delete(existing_profile)
+        await db.commit()
     
     profile = UserProfile(
         user_id=user.id,
         **profile_data.model_dump()
     )
     db.add(profile)
-    db.commit()
-    db.refresh(profile)
+    await record_goal_version(profile, db)
+    await bump_data_version(user.id, db)
+    await db.commit()
+    await db.refresh(profile)
+    invalidate_cached_user(user.id)
     return profile
 
-async def update_user_profile(user: User, profile_data: UserProfileUpdate, db: Session) -> Optional[UserProfile]:
+async def update_user_profile(user: User, profile_data: UserProfileUpdate, db: AsyncSession) -> Optional[UserProfile]:
     profile = await get_user_profile(user, db)
     if not profile:
         return None
     
     update_data = profile_data.model_dump(exclude_unset=True)
+    inputs_changed = any(
+        field in GOAL_INPUT_FIELDS and getattr(profile, field) != value
+        for field, value in update_data.items()
+    )
     for field, value in update_data.items():
         setattr(profile, field, value)
     
-    db.commit()
-    db.refresh(profile)
+    if inputs_changed:
+        await record_goal_version(profile, db)
+    
+    await bump_data_version(user.id, db)
+    await db.commit()
+    await db.refresh(profile)
+    invalidate_cached_user(user.id)
     return profile
 
 async def calculate_user_goals(profile: UserProfile) -> Dict[str, float]:
-    bmr = calculate_bmr(profile.age, profile.height, profile.weight, True)
-    tdee = calculate_tdee(bmr, profile.activity_level)
-    calorie_goal = calculate_calorie_goal(profile.weight, profile.goal, tdee)
-    macro_targets = calculate_macro_targets(calorie_goal, profile.goal)
-    
-    return {
-        "bmr": bmr,
-        "tdee": tdee,
-        "calorie_goal": calorie_goal,
-        **macro_targets
-    }
+    return compute_profile_goals(profile)
 
-async def get_user_subscription(user: User, db: Session) -> Optional[Subscription]:
-    return db.query(Subscription).filter(
-        Subscription.user_id == user.id,
-        Subscription.active == True
-    ).first()
+async def get_current_goals(user: User, db: AsyncSession) -> Dict[str, float]:
+    return await get_goals_for_day(user, datetime.utcnow().date(), db)
 
-async def create_subscription(user: User, subscription_data: SubscriptionCreate, db: Session) -> Subscription:
+async def get_goal_history(user: User, db: AsyncSession) -> List[NutritionGoal]:
+    return await get_goal_versions(user.id, db)
+
+async def get_user_subscription(user: User, db: AsyncSession) -> Optional[Subscription]:
+    return await db.scalar(
+        select(Subscription).where(
+            Subscription.user_id == user.id,
+            Subscription.active == True
+        )
+    )
+
+async def create_subscription(user: User, subscription_data: SubscriptionCreate, db: AsyncSession) -> Subscription:
     existing_subscription = await get_user_subscription(user, db)
     if existing_subscription:
         existing_subscription.active = False
@@ -71,11 +85,13 @@ async def create_subscription(user: User, subscription_data: SubscriptionCreate,
     user.role = UserRole.PREMIUM
     
     db.add(subscription)
-    db.commit()
-    db.refresh(subscription)
+    await bump_data_version(user.id, db)
+    await db.commit()
+    await db.refresh(subscription)
+    invalidate_cached_user(user.id)
     return subscription
 
-async def cancel_subscription(user: User, db: Session) -> bool:
+async def cancel_subscription(user: User, db: AsyncSession) -> bool:
     subscription = await get_user_subscription(user, db)
     if not subscription:
         return False
@@ -84,10 +100,12 @@ async def cancel_subscription(user: User, db: Session) -> bool:
     subscription.end_date = datetime.utcnow()
     user.role = UserRole.FREE
     
-    db.commit()
+    await bump_data_version(user.id, db)
+    await db.commit()
+    invalidate_cached_user(user.id)
     return True
 
-async def check_subscription_status(user: User, db: Session) -> Dict[str, Any]:
+async def check_subscription_status(user: User, db: AsyncSession) -> Dict[str, Any]:
     subscription = await get_user_subscription(user, db)
     
     if not subscription:
@@ -106,28 +124,13 @@ async def check_subscription_status(user: User, db: Session) -> Dict[str, Any]:
         "expires_at": subscription.end_date
     }
 
-async def get_user_streak(user: User, db: Session) -> int:
-    from models.meal import Meal
-    current_date = datetime.utcnow().date()
-    streak = 0
-    
-    for i in range(365):
-        check_date = current_date - timedelta(days=i)
-        meals_count = db.query(Meal).filter(
-            Meal.user_id == user.id,
-            Meal.logged_at >= datetime.combine(check_date, datetime.min.time()),
-            Meal.logged_at < datetime.combine(check_date + timedelta(days=1), datetime.min.time())
-        ).count()
-        
-        if meals_count > 0:
-            streak += 1
-        else:
-            break
-    
-    return streak
+async def get_user_streak(user: User, db: AsyncSession) -> int:
+    summary = await get_streak_summary(user.id, db)
+    return summary["streak"]
 
-async def update_user_email(user: User, new_email: str, db: Session) -> User:
+async def update_user_email(user: User, new_email: str, db: AsyncSession) -> User:
     user.email = new_email
-    db.commit()
-    db.refresh(user)
+    await bump_data_version(user.id, db)
+    await db.commit()
+    invalidate_cached_user(user.id)
     return user
\ No newline at end of file
@@ -0,0 +1,53 @@
+from typing import Dict, Iterator
+from pathlib import Path
+import os
+import sys
+import tempfile
+import time
+import uuid
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+DATABASE_DIR = tempfile.mkdtemp(prefix="eatwise-tests-")
+JWT_SECRET = "test-secret"
+
+os.environ.update({
+    "APP_ENVIRONMENT": "test",
+    "DATABASE_URL": f"sqlite:///{DATABASE_DIR}/test.db",
+    "SUPABASE_JWT_SECRET": JWT_SECRET,
+    "MEAL_ARCHIVE_AFTER_DAYS": "30",
+})
+for name in (
+    "SUPABASE_URL", "SUPABASE_KEY", "SUPABASE_SERVICE_ROLE_KEY", "SUPABASE_ANON_KEY", "SUPABASE_STORAGE_BUCKET",
+    "OPENAI_API_KEY", "STRIPE_SECRET_KEY", "STRIPE_PUBLISHABLE_KEY", "STRIPE_WEBHOOK_SECRET",
+):
+    os.environ.setdefault(name, "test")
+sys.path.insert(0, str(BACKEND_DIR))
+
+from fastapi.testclient import TestClient
+from jose import jwt
+from benchmarks.fake_openai import FakeOpenAI, install_fake_openai
+
+@pytest.fixture(scope="session")
+def client() -> Iterator[TestClient]:
+    import main
+    with TestClient(main.app) as test_client:
+        yield test_client
+
+@pytest.fixture
+def user_id() -> uuid.UUID:
+    return uuid.uuid4()
+
+@pytest.fixture
+def headers(user_id: uuid.UUID) -> Dict[str, str]:
+    now = int(time.time())
+    token = jwt.encode(
+        {"sub": str(user_id), "email": f"{user_id}@example.com", "aud": "authenticated", "role": "authenticated", "iat": now, "exp": now + 3600},
+        JWT_SECRET,
+        algorithm="HS256"
+    )
+    return {"Authorization": f"Bearer {token}"}
+
+@pytest.fixture
+def fake_openai() -> FakeOpenAI:
+    return install_fake_openai(0.0, 0.0, 0.0)
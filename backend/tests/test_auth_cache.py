@@ -0,0 +1,92 @@
+from typing import Dict
+from types import SimpleNamespace
+import uuid
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import select, update
+from models.database import SessionLocal
+from models.user import User, UserRole
+from services import auth_service
+from utils import cache
+from utils.cache import TTLCache
+
+def write_user(client: TestClient, user_id: uuid.UUID, bump: bool, **values):
+    async def run():
+        async with SessionLocal() as db:
+            if bump:
+                values["data_version"] = User.data_version + 1
+            await db.execute(update(User).where(User.id == user_id).values(**values))
+            await db.commit()
+    client.portal.call(run)
+
+def run_webhook(client: TestClient, handler, payload: Dict, email: str, monkeypatch):
+    stripe = pytest.importorskip("stripe")
+    monkeypatch.setattr(stripe.Customer, "retrieve", lambda customer_id: SimpleNamespace(email=email))
+    async def run():
+        async with SessionLocal() as db:
+            await handler(payload, db)
+    client.portal.call(run)
+
+def data_version(client: TestClient, user_id: uuid.UUID) -> int:
+    async def run():
+        async with SessionLocal() as db:
+            return await db.scalar(select(User.data_version).where(User.id == user_id))
+    return client.portal.call(run)
+
+def role(client: TestClient, headers: Dict[str, str]) -> str:
+    response = client.get("/api/users/me", headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()["role"]
+
+def test_cached_user_is_served_until_data_version_changes(client: TestClient, headers: Dict[str, str], user_id: uuid.UUID):
+    role(client, headers)
+    write_user(client, user_id, bump=True, role=UserRole.FREE)
+    assert role(client, headers) == "free"
+    
+    write_user(client, user_id, bump=False, role=UserRole.PREMIUM)
+    assert role(client, headers) == "free"
+    
+    write_user(client, user_id, bump=True)
+    assert role(client, headers) == "premium"
+
+def test_webhook_role_changes_reach_other_workers(client: TestClient, headers: Dict[str, str], user_id: uuid.UUID, monkeypatch):
+    pytest.importorskip("stripe")
+    from services.subscription_service import handle_payment_succeeded, handle_subscription_cancelled, handle_successful_payment
+    
+    email = f"{user_id}@example.com"
+    role(client, headers)
+    write_user(client, user_id, bump=True, role=UserRole.FREE)
+    assert role(client, headers) == "free"
+    version = data_version(client, user_id)
+    other_worker_snapshot = auth_service.user_cache.get(str(user_id))
+    
+    run_webhook(client, handle_payment_succeeded, {"customer": "cus_test"}, email, monkeypatch)
+    assert data_version(client, user_id) == version + 1
+    auth_service.user_cache.set(str(user_id), other_worker_snapshot)
+    assert role(client, headers) == "premium"
+    
+    run_webhook(client, handle_successful_payment, {"metadata": {"user_id": str(user_id), "plan": "monthly"}}, email, monkeypatch)
+    role(client, headers)
+    other_worker_snapshot = auth_service.user_cache.get(str(user_id))
+    run_webhook(client, handle_subscription_cancelled, {"customer": "cus_test"}, email, monkeypatch)
+    auth_service.user_cache.set(str(user_id), other_worker_snapshot)
+    assert role(client, headers) == "free"
+
+def test_local_invalidation_drops_the_snapshot(client: TestClient, headers: Dict[str, str], user_id: uuid.UUID):
+    role(client, headers)
+    assert auth_service.user_cache.get(str(user_id)) is not None
+    
+    auth_service.invalidate_cached_user(user_id)
+    assert auth_service.user_cache.get(str(user_id)) is None
+
+def test_entries_expire_after_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache.time, "time", lambda: now[0])
+    entries = TTLCache(10, ttl=60.0)
+    entries.set("user", "snapshot")
+    
+    now[0] += 59.0
+    assert entries.get("user") == "snapshot"
+    now[0] += 2.0
+    assert entries.get("user") is None
+    assert entries.stats()["misses"] == 1
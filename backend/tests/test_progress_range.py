@@ -0,0 +1,50 @@
+from typing import Dict
+from datetime import datetime, timedelta
+import uuid
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import update
+from models.database import SessionLocal
+from models.user import NutritionGoal
+from utils.config import settings
+
+def backdate_goals(client: TestClient, user_id: uuid.UUID, days: int):
+    async def run():
+        async with SessionLocal() as db:
+            await db.execute(
+                update(NutritionGoal)
+                .where(NutritionGoal.user_id == user_id)
+                .values(effective_from=datetime.utcnow().date() - timedelta(days=days))
+            )
+            await db.commit()
+    client.portal.call(run)
+
+def test_range_applies_the_goal_version_of_each_day(client: TestClient, headers: Dict[str, str], user_id: uuid.UUID):
+    profile = {"age": 30, "height": 180, "weight": 80, "activity_level": "medium", "goal": "maintain"}
+    assert client.post("/api/users/profile", headers=headers, json=profile).status_code == 200
+    backdate_goals(client, user_id, 10)
+    assert client.put("/api/users/profile", headers=headers, json={"weight": 95, "goal": "weight_loss"}).status_code == 200
+    
+    today = datetime.utcnow().date()
+    old_goal = client.get(f"/api/progress/daily?target_date={(today - timedelta(days=1)).isoformat()}", headers=headers).json()["calorie_goal"]
+    new_goal = client.get(f"/api/progress/daily?target_date={today.isoformat()}", headers=headers).json()["calorie_goal"]
+    assert old_goal != new_goal
+    
+    start = today - timedelta(days=2)
+    days = client.get(f"/api/progress/range?start={start.isoformat()}&end={today.isoformat()}", headers=headers).json()
+    assert [bucket["calorie_goal"] for bucket in days["buckets"]] == [old_goal, old_goal, new_goal]
+    assert days["calorie_goal"] == new_goal
+    
+    month = client.get(f"/api/progress/range?start={start.isoformat()}&end={today.isoformat()}&granularity=month", headers=headers).json()
+    assert sum(bucket["calorie_goal"] for bucket in month["buckets"]) == pytest.approx(2 * old_goal + new_goal)
+
+def test_range_cap_is_separate_from_analytics(client: TestClient, headers: Dict[str, str], monkeypatch):
+    monkeypatch.setattr(settings, "progress_range_max_days", 7)
+    today = datetime.utcnow().date()
+    start = today - timedelta(days=7)
+    
+    response = client.get(f"/api/progress/range?start={start.isoformat()}&end={today.isoformat()}", headers=headers)
+    assert response.status_code == 422
+    assert response.json()["detail"] == "Range must not exceed 7 days"
+    assert client.get(f"/api/progress/analytics?start={start.isoformat()}&end={today.isoformat()}", headers=headers).status_code == 200
+    assert client.get(f"/api/progress/range?start={(start + timedelta(days=1)).isoformat()}&end={today.isoformat()}", headers=headers).status_code == 200
@@ -0,0 +1,182 @@
+from typing import Any, Dict, List
+from datetime import date, datetime, timedelta
+import base64
+import io
+import uuid
+import pytest
+from fastapi.testclient import TestClient
+from PIL import Image
+from models.database import SessionLocal
+from services.archive_service import archive_old_meals
+from services.report_service import last_completed_week_start
+from scripts.precompute_weekly_reports import precompute_weekly_reports
+from api.meals.routes import get_meals
+from api.users.routes import get_current_user_info
+from utils.query_budget import QueryBudgetExceeded
+
+PROFILE = {"age": 30, "height": 180, "weight": 80, "activity_level": "medium", "goal": "maintain"}
+
+def log_meal(client: TestClient, headers: Dict[str, str], logged_at: datetime, calories: float = 500.0, description: str = "chicken rice") -> Dict[str, Any]:
+    response = client.post(
+        "/api/meals",
+        headers=headers,
+        json={"description": description, "calories": calories, "protein": 30, "carbs": 50, "fat": 10, "logged_at": logged_at.isoformat()}
+    )
+    assert response.status_code == 200, response.text
+    return response.json()
+
+def archive_meals(client: TestClient, user_id: uuid.UUID):
+    async def run():
+        async with SessionLocal() as db:
+            return await archive_old_meals(db, user_id=user_id)
+    return client.portal.call(run)
+
+def precompute_reports(client: TestClient, user_id: uuid.UUID, week_starts: List[date]):
+    return client.portal.call(precompute_weekly_reports, week_starts, 0, 200, True, user_id)
+
+def weekly(client: TestClient, headers: Dict[str, str], week_start: date) -> Dict[str, Any]:
+    response = client.get(f"/api/progress/weekly?week_start={week_start.isoformat()}", headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+def week_calories(report: Dict[str, Any]) -> float:
+    return sum(day["calories"] for day in report["daily_summaries"])
+
+@pytest.fixture(autouse=True)
+def profile(client: TestClient, headers: Dict[str, str]):
+    response = client.post("/api/users/profile", headers=headers, json=PROFILE)
+    assert response.status_code == 200, response.text
+
+def test_requests_over_budget_fail(client: TestClient, headers: Dict[str, str], monkeypatch):
+    log_meal(client, headers, datetime.utcnow())
+    assert client.get("/api/meals", headers=headers).status_code == 200
+    
+    monkeypatch.setattr(get_meals, "query_budget", 0)
+    with pytest.raises(QueryBudgetExceeded, match="api.meals.routes.get_meals ran"):
+        client.get("/api/meals", headers=headers)
+
+def test_dependency_statements_are_counted(client: TestClient, headers: Dict[str, str], monkeypatch):
+    assert client.get("/api/users/me", headers=headers).status_code == 200
+    
+    monkeypatch.setattr(get_current_user_info, "query_budget", 1)
+    assert client.get("/api/users/me", headers=headers).status_code == 200
+    
+    monkeypatch.setattr(get_current_user_info, "query_budget", 0)
+    with pytest.raises(QueryBudgetExceeded, match=r"(?s)ran 1 SQL statements, budget is 0:.*FROM users"):
+        client.get("/api/users/me", headers=headers)
+
+def test_meal_routes(client: TestClient, headers: Dict[str, str]):
+    now = datetime.utcnow()
+    meals = [log_meal(client, headers, now - timedelta(days=days, hours=1), description=f"chicken rice {days}") for days in (0, 1, 2)]
+    
+    listed = client.get("/api/meals?skip=1&limit=2", headers=headers)
+    assert listed.status_code == 200
+    assert [meal["id"] for meal in listed.json()] == [meals[1]["id"], meals[2]["id"]]
+    assert client.get("/api/meals", headers={**headers, "If-None-Match": listed.headers["etag"]}).status_code == 200
+    assert client.get("/api/meals?skip=1&limit=2", headers={**headers, "If-None-Match": listed.headers["etag"]}).status_code == 304
+    
+    page = client.get("/api/meals?pagination=cursor&limit=2", headers=headers).json()
+    rest = client.get(f"/api/meals?pagination=cursor&limit=2&cursor={page['next_cursor']}", headers=headers).json()
+    assert [meal["id"] for meal in page["items"] + rest["items"]] == [meal["id"] for meal in meals]
+    
+    assert len(client.get("/api/meals/search?q=chicken", headers=headers).json()) == 3
+    assert client.get(f"/api/meals/{meals[0]['id']}", headers=headers).status_code == 200
+    assert client.put(f"/api/meals/{meals[0]['id']}", headers=headers, json={"calories": 650}).json()["calories"] == 650
+    assert client.delete(f"/api/meals/{meals[2]['id']}", headers=headers).status_code == 200
+    assert client.get(f"/api/meals/{meals[2]['id']}", headers=headers).status_code == 404
+
+def test_archived_meal_routes(client: TestClient, headers: Dict[str, str], user_id: uuid.UUID):
+    now = datetime.utcnow()
+    recent = log_meal(client, headers, now - timedelta(days=40))
+    edited = log_meal(client, headers, now - timedelta(days=100))
+    oldest = log_meal(client, headers, now - timedelta(days=400))
+    assert archive_meals(client, user_id) == (3, 0)
+    
+    history = client.get("/api/meals?skip=1&limit=1", headers=headers).json()
+    assert [meal["id"] for meal in history] == [edited["id"]]
+    assert client.get(f"/api/meals/{oldest['id']}", headers=headers).status_code == 200
+    
+    updated = client.put(f"/api/meals/{edited['id']}", headers=headers, json={"calories": 321})
+    assert updated.status_code == 200
+    assert updated.json()["calories"] == 321
+    
+    assert client.delete(f"/api/meals/{recent['id']}", headers=headers).status_code == 200
+    streak = client.get("/api/users/streak", headers=headers).json()
+    assert streak["last_logged_date"] == edited["logged_at"][:10]
+    
+    assert client.delete(f"/api/meals/{oldest['id']}", headers=headers).status_code == 200
+    assert [meal["id"] for meal in client.get("/api/meals", headers=headers).json()] == [edited["id"]]
+
+def test_backdated_edits_invalidate_stored_reports(client: TestClient, headers: Dict[str, str], user_id: uuid.UUID):
+    week_start = last_completed_week_start()
+    logged_at = datetime.combine(week_start + timedelta(days=2), datetime.min.time()) + timedelta(hours=12)
+    meal = log_meal(client, headers, logged_at, calories=400)
+    
+    assert precompute_reports(client, user_id, [week_start])["reports"] == 1
+    assert week_calories(weekly(client, headers, week_start)) == 400
+    
+    extra = log_meal(client, headers, logged_at + timedelta(days=1), calories=250)
+    assert week_calories(weekly(client, headers, week_start)) == 650
+    
+    precompute_reports(client, user_id, [week_start])
+    client.put(f"/api/meals/{meal['id']}", headers=headers, json={"calories": 100})
+    assert week_calories(weekly(client, headers, week_start)) == 350
+    
+    precompute_reports(client, user_id, [week_start])
+    client.delete(f"/api/meals/{extra['id']}", headers=headers)
+    assert week_calories(weekly(client, headers, week_start)) == 100
+
+def test_progress_routes(client: TestClient, headers: Dict[str, str]):
+    today = datetime.utcnow().date()
+    for days in range(10):
+        log_meal(client, headers, datetime.combine(today - timedelta(days=days), datetime.min.time()) + timedelta(hours=1))
+    
+    for url in (
+        f"/api/progress/daily?target_date={today.isoformat()}",
+        f"/api/progress/weekly?week_start={(today - timedelta(days=today.weekday())).isoformat()}",
+        f"/api/progress/range?start={(today - timedelta(days=60)).isoformat()}&end={today.isoformat()}&granularity=week",
+        f"/api/progress/analytics?start={(today - timedelta(days=30)).isoformat()}&end={today.isoformat()}",
+        f"/api/progress/calendar?month={today.month}&year={today.year}",
+        f"/api/progress/year?year={today.year}",
+        "/api/users/streak",
+    ):
+        response = client.get(url, headers=headers)
+        assert response.status_code == 200, f"{url}: {response.text}"
+        assert client.get(url, headers={**headers, "If-None-Match": response.headers["etag"]}).status_code == 304
+    
+    assert client.get("/api/progress/range?start=2024-01-01&end=9999-12-31", headers=headers).status_code == 422
+    assert client.get("/api/progress/analytics?start=0001-01-01&end=0001-01-31", headers=headers).status_code == 422
+
+def test_user_routes(client: TestClient, headers: Dict[str, str]):
+    for url in ("/api/users/me", "/api/users/profile", "/api/users/goals", "/api/users/goals/history", "/api/users/subscription"):
+        response = client.get(url, headers=headers)
+        assert response.status_code == 200, f"{url}: {response.text}"
+    
+    assert client.put("/api/users/profile", headers=headers, json={"weight": 78}).status_code == 200
+    assert client.put("/api/users/me", headers=headers, json={}).status_code == 200
+
+def test_ai_routes(client: TestClient, headers: Dict[str, str], fake_openai):
+    now = datetime.utcnow()
+    hot = log_meal(client, headers, now)
+    archived = log_meal(client, headers, now - timedelta(days=200))
+    
+    local = client.post("/api/meals/chat-log", headers=headers, json={"description": "200g chicken breast and 1 cup of rice"})
+    assert local.status_code == 200
+    for _ in range(2):
+        parsed = client.post("/api/meals/chat-log", headers=headers, json={"description": "a bowl of grandma's mystery stew"})
+        assert parsed.status_code == 200
+    assert fake_openai.stats()["calls"] == 1
+    
+    output = io.BytesIO()
+    Image.new("RGB", (64, 48), (200, 120, 40)).save(output, "PNG")
+    image_url = "data:image/png;base64," + base64.b64encode(output.getvalue()).decode()
+    for _ in range(2):
+        photo = client.post("/api/meals/photo-analysis", headers=headers, json={"image_url": image_url})
+        assert photo.status_code == 200
+    
+    for meal in (hot, archived):
+        assert client.post("/api/ai/feedback", headers=headers, json={"meal_id": meal["id"]}).status_code == 200
+        assert client.post("/api/ai/meal-adjustment", headers=headers, json={"meal_id": meal["id"]}).status_code == 200
+    assert client.get("/api/ai/daily-tip", headers=headers).status_code == 200
+    assert client.post("/api/ai/qna", headers=headers, json={"question": "How much fiber do I need?"}).status_code == 200
+    assert client.get("/api/meals/barcode/4006381333931", headers=headers).status_code in (200, 404, 503)
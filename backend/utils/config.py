@@ -1,5 +1,6 @@
 from pydantic_settings import BaseSettings
 from typing import Optional
+from pydantic import Field
 
 class Settings(BaseSettings):
     database_url: str
@@ -15,6 +16,45 @@ class Settings(BaseSettings):
     stripe_webhook_secret: str
     app_environment: str = "development"
     cors_origins: str = "http://localhost:3000"
+    db_pool_size: int = Field(5, ge=1)
+    db_max_overflow: int = Field(10, ge=0)
+    db_pool_timeout: float = Field(30.0, gt=0)
+    db_pool_recycle: int = 1800
+    db_pool_pre_ping: bool = True
+    db_statement_timeout_ms: int = Field(0, ge=0)
+    search_similarity_threshold: float = 0.4
+    search_recency_weight: float = 0.2
+    search_recency_half_life_days: float = 30.0
+    import_chunk_size: int = 1000
+    import_max_errors: int = 1000
+    export_batch_size: int = 1000
+    meal_archive_after_days: int = 0
+    progress_range_max_days: int = 3660
+    analytics_max_days: int = 3660
+    analytics_adherence_tolerance: float = 0.1
+    auth_claims_cache_size: int = 10000
+    auth_user_cache_size: int = 10000
+    auth_user_cache_ttl_seconds: float = 60.0
+    response_cache_size: int = 10000
+    response_cache_ttl_seconds: float = 300.0
+    response_cache_max_body_bytes: int = 262144
+    meal_text_cache_size: int = 10000
+    meal_text_cache_ttl_seconds: float = 2592000.0
+    photo_cache_ttl_seconds: float = 86400.0
+    photo_cache_max_distance: int = 6
+    photo_cache_candidates: int = 200
+    photo_max_upload_bytes: int = 20000000
+    photo_download_timeout_seconds: float = 10.0
+    photo_max_pixels: int = 50000000
+    photo_max_edge: int = 1024
+    photo_jpeg_quality: int = 85
+    photo_preprocess_workers: int = 4
+    local_meal_parser_enabled: bool = True
+    food_table_path: Optional[str] = None
+    product_index_path: Optional[str] = None
+    internal_api_token: Optional[str] = None
+    log_level: str = "INFO"
+    request_timing_sample_rate: float = 1.0
     
     class Config:
         env_file = ".env"
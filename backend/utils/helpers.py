@@ -1,48 +1,103 @@
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterable, Optional
 from datetime import datetime
-from models.user import ActivityLevel, GoalType
+import numpy as np
+from models.user import ActivityLevel, GoalType, Sex
 
-def calculate_bmr(age: int, height: float, weight: float, is_male: bool = True) -> float:
-    if is_male:
-        return 88.362 + (13.397 * weight) + (4.799 * height) - (5.677 * age)
-    else:
-        return 447.593 + (9.247 * weight) + (3.098 * height) - (4.330 * age)
+GOAL_FORMULA_VERSION = 2
+
+ACTIVITY_MULTIPLIERS = {
+    ActivityLevel.LOW: 1.2,
+    ActivityLevel.MEDIUM: 1.55,
+    ActivityLevel.HIGH: 1.9
+}
+
+CALORIE_ADJUSTMENTS = {
+    GoalType.WEIGHT_LOSS: -500,
+    GoalType.MUSCLE_GAIN: 300,
+    GoalType.MAINTAIN: 0
+}
+
+MACRO_RATIOS = {
+    GoalType.WEIGHT_LOSS: {"protein": 0.30, "fat": 0.25, "carbs": 0.45},
+    GoalType.MUSCLE_GAIN: {"protein": 0.30, "fat": 0.25, "carbs": 0.45},
+    GoalType.MAINTAIN: {"protein": 0.25, "fat": 0.30, "carbs": 0.45}
+}
+
+MACRO_CALORIES_PER_GRAM = {"protein": 4, "fat": 9, "carbs": 4}
+
+SEX_MALE_WEIGHT = {Sex.MALE: 1.0, Sex.FEMALE: 0.0, None: 0.5}
+
+def calculate_bmr(age: int, height: float, weight: float, is_male: Optional[bool] = True) -> float:
+    male_bmr = 88.362 + (13.397 * weight) + (4.799 * height) - (5.677 * age)
+    female_bmr = 447.593 + (9.247 * weight) + (3.098 * height) - (4.330 * age)
+    if is_male is None:
+        return (male_bmr + female_bmr) / 2
+    return male_bmr if is_male else female_bmr
 
 def calculate_tdee(bmr: float, activity_level: ActivityLevel) -> float:
-    multipliers = {
-        ActivityLevel.LOW: 1.2,
-        ActivityLevel.MEDIUM: 1.55,
-        ActivityLevel.HIGH: 1.9
-    }
-    return bmr * multipliers[activity_level]
+    return bmr * ACTIVITY_MULTIPLIERS[activity_level]
 
 def calculate_macro_targets(calories: float, goal: GoalType) -> Dict[str, float]:
-    if goal == GoalType.WEIGHT_LOSS:
-        protein_ratio = 0.30
-        fat_ratio = 0.25
-        carbs_ratio = 0.45
-    elif goal == GoalType.MUSCLE_GAIN:
-        protein_ratio = 0.30
-        fat_ratio = 0.25
-        carbs_ratio = 0.45
-    else:
-        protein_ratio = 0.25
-        fat_ratio = 0.30
-        carbs_ratio = 0.45
-    
     return {
-        "protein": (calories * protein_ratio) / 4,
-        "fat": (calories * fat_ratio) / 9,
-        "carbs": (calories * carbs_ratio) / 4
+        macro: (calories * ratio) / MACRO_CALORIES_PER_GRAM[macro]
+        for macro, ratio in MACRO_RATIOS[goal].items()
     }
 
 def calculate_calorie_goal(weight: float, goal: GoalType, tdee: float) -> float:
-    if goal == GoalType.WEIGHT_LOSS:
-        return tdee - 500
-    elif goal == GoalType.MUSCLE_GAIN:
-        return tdee + 300
-    else:
-        return tdee
+    return tdee + CALORIE_ADJUSTMENTS[goal]
+
+def sex_to_is_male(sex: Optional[Sex]) -> Optional[bool]:
+    if sex is None:
+        return None
+    return sex == Sex.MALE
+
+def calculate_goals(
+    age: int,
+    height: float,
+    weight: float,
+    activity_level: ActivityLevel,
+    goal: GoalType,
+    sex: Optional[Sex] = None
+) -> Dict[str, float]:
+    bmr = calculate_bmr(age, height, weight, sex_to_is_male(sex))
+    tdee = calculate_tdee(bmr, activity_level)
+    calorie_goal = calculate_calorie_goal(weight, goal, tdee)
+    
+    return {
+        "bmr": bmr,
+        "tdee": tdee,
+        "calorie_goal": calorie_goal,
+        **calculate_macro_targets(calorie_goal, goal)
+    }
+
+def calculate_goals_bulk(
+    ages: Iterable[int],
+    heights: Iterable[float],
+    weights: Iterable[float],
+    activity_levels: Iterable[ActivityLevel],
+    goals: Iterable[GoalType],
+    sexes: Iterable[Optional[Sex]]
+) -> Dict[str, np.ndarray]:
+    age = np.asarray(list(ages), dtype=np.float64)
+    height = np.asarray(list(heights), dtype=np.float64)
+    weight = np.asarray(list(weights), dtype=np.float64)
+    goals = list(goals)
+    
+    male_weight = np.array([SEX_MALE_WEIGHT[sex] for sex in sexes], dtype=np.float64)
+    activity = np.array([ACTIVITY_MULTIPLIERS[level] for level in activity_levels], dtype=np.float64)
+    adjustment = np.array([CALORIE_ADJUSTMENTS[goal] for goal in goals], dtype=np.float64)
+    
+    male_bmr = 88.362 + (13.397 * weight) + (4.799 * height) - (5.677 * age)
+    female_bmr = 447.593 + (9.247 * weight) + (3.098 * height) - (4.330 * age)
+    bmr = female_bmr + male_weight * (male_bmr - female_bmr)
+    tdee = bmr * activity
+    calorie_goal = tdee + adjustment
+    
+    result = {"bmr": bmr, "tdee": tdee, "calorie_goal": calorie_goal}
+    for macro, calories_per_gram in MACRO_CALORIES_PER_GRAM.items():
+        ratio = np.array([MACRO_RATIOS[goal][macro] for goal in goals], dtype=np.float64)
+        result[macro] = calorie_goal * ratio / calories_per_gram
+    return result
 
 def format_nutrition_value(value: Optional[float]) -> str:
     if value is None:
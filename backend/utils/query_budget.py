@@ -0,0 +1,49 @@
+from typing import Callable, List, Optional
+from contextvars import ContextVar
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from utils.config import settings
+
+_statements: ContextVar[Optional[List[str]]] = ContextVar("query_budget_statements", default=None)
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+def query_budgets_enforced() -> bool:
+    return settings.app_environment == "test"
+
+def _record_statement(conn, cursor, statement, parameters, context, executemany):
+    statements = _statements.get()
+    if statements is not None:
+        statements.append(statement)
+
+def install_statement_counter(engine: AsyncEngine):
+    event.listen(engine.sync_engine, "before_cursor_execute", _record_statement)
+
+def query_budget(limit: int) -> Callable:
+    def decorator(endpoint: Callable) -> Callable:
+        endpoint.query_budget = limit
+        return endpoint
+    return decorator
+
+def budgeted_handler(handler: Callable, endpoint: Callable) -> Callable:
+    async def counted_handler(request):
+        limit = getattr(endpoint, "query_budget", None)
+        if limit is None:
+            return await handler(request)
+        
+        token = _statements.set([])
+        try:
+            response = await handler(request)
+            statements = _statements.get()
+        finally:
+            _statements.reset(token)
+        
+        if len(statements) > limit:
+            listing = "\n".join(f"  {index + 1}. {statement}" for index, statement in enumerate(statements))
+            raise QueryBudgetExceeded(
+                f"{endpoint.__module__}.{endpoint.__name__} ran {len(statements)} SQL statements, budget is {limit}:\n{listing}"
+            )
+        return response
+    
+    return counted_handler
\ No newline at end of file
@@ -0,0 +1,173 @@
+from typing import Any, Callable, Dict, Optional
+from contextvars import ContextVar
+import asyncio
+import functools
+import json
+import logging
+import random
+import time
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from utils.query_budget import budgeted_handler, query_budgets_enforced
+
+logger = logging.getLogger("eatwise.timing")
+
+_current: ContextVar[Optional["RequestMetrics"]] = ContextVar("request_metrics", default=None)
+
+class RequestMetrics:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.route: Optional[str] = None
+        self.db_count = 0
+        self.db_time = 0.0
+        self.slowest_time = 0.0
+        self.slowest_statement: Optional[str] = None
+        self.route_started: Optional[float] = None
+        self.handler_started: Optional[float] = None
+        self.handler_finished: Optional[float] = None
+        self.route_finished: Optional[float] = None
+        self.response_started: Optional[float] = None
+        self.finished: Optional[float] = None
+    
+    def record_statement(self, statement: str, elapsed: float):
+        self.db_count += 1
+        self.db_time += elapsed
+        if elapsed > self.slowest_time:
+            self.slowest_time = elapsed
+            self.slowest_statement = statement
+    
+    def phases(self) -> Dict[str, float]:
+        phases = {"db": self.db_time, "db-slowest": self.slowest_time}
+        if self.route_started is not None and self.handler_started is not None:
+            phases["deps"] = self.handler_started - self.route_started
+        if self.handler_started is not None and self.handler_finished is not None:
+            phases["handler"] = self.handler_finished - self.handler_started
+        if self.handler_finished is not None and self.route_finished is not None:
+            phases["serialize"] = self.route_finished - self.handler_finished
+        phases["total"] = (self.response_started or time.perf_counter()) - self.started
+        return phases
+    
+    def server_timing(self) -> str:
+        entries = []
+        for name, seconds in self.phases().items():
+            entry = f"{name};dur={seconds * 1000:.2f}"
+            if name == "db":
+                entry += f';desc="{self.db_count} queries"'
+            entries.append(entry)
+        return ", ".join(entries)
+    
+    def log_record(self, method: str, path: str, status_code: int) -> Dict[str, Any]:
+        return {
+            "event": "request_timing",
+            "method": method,
+            "route": self.route or path,
+            "path": path,
+            "status": status_code,
+            "db_statements": self.db_count,
+            **{f"{name.replace('-', '_')}_ms": round(seconds * 1000, 2) for name, seconds in self.phases().items()},
+            "complete_ms": round(((self.finished or time.perf_counter()) - self.started) * 1000, 2),
+            "slowest_statement": (self.slowest_statement or "")[:200] or None,
+        }
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("request_timing_started", []).append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info["request_timing_started"].pop()
+    metrics = _current.get()
+    if metrics is not None:
+        metrics.record_statement(statement, time.perf_counter() - started)
+
+def _handle_error(exception_context):
+    connection = exception_context.connection
+    if connection is not None and connection.info.get("request_timing_started"):
+        connection.info["request_timing_started"].pop()
+
+def install_query_timing(engine: AsyncEngine):
+    event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine.sync_engine, "handle_error", _handle_error)
+
+def _timed_endpoint(endpoint: Callable) -> Callable:
+    def start():
+        metrics = _current.get()
+        if metrics is not None:
+            metrics.handler_started = time.perf_counter()
+        return metrics
+    
+    def finish(metrics: Optional[RequestMetrics]):
+        if metrics is not None:
+            metrics.handler_finished = time.perf_counter()
+    
+    if asyncio.iscoroutinefunction(endpoint):
+        @functools.wraps(endpoint)
+        async def async_wrapper(*args, **kwargs):
+            metrics = start()
+            try:
+                return await endpoint(*args, **kwargs)
+            finally:
+                finish(metrics)
+        return async_wrapper
+    
+    @functools.wraps(endpoint)
+    def sync_wrapper(*args, **kwargs):
+        metrics = start()
+        try:
+            return endpoint(*args, **kwargs)
+        finally:
+            finish(metrics)
+    return sync_wrapper
+
+class InstrumentedRoute(APIRoute):
+    def get_route_handler(self) -> Callable:
+        self.dependant.call = _timed_endpoint(self.dependant.call)
+        handler = super().get_route_handler()
+        path = self.path
+        
+        async def timed_handler(request):
+            metrics = _current.get()
+            if metrics is None:
+                return await handler(request)
+            
+            metrics.route = path
+            metrics.route_started = time.perf_counter()
+            try:
+                return await handler(request)
+            finally:
+                metrics.route_finished = time.perf_counter()
+        
+        if query_budgets_enforced():
+            return budgeted_handler(timed_handler, self.endpoint)
+        return timed_handler
+
+class RequestTimingMiddleware:
+    def __init__(self, app, sample_rate: float = 1.0, emit_header: bool = True):
+        self.app = app
+        self.sample_rate = sample_rate
+        self.emit_header = emit_header
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or self.sample_rate <= 0 or random.random() >= self.sample_rate:
+            await self.app(scope, receive, send)
+            return
+        
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        status_code = 500
+        
+        async def send_with_timing(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                metrics.response_started = time.perf_counter()
+                if self.emit_header:
+                    message["headers"] = [*message.get("headers", []), (b"server-timing", metrics.server_timing().encode())]
+            await send(message)
+        
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            metrics.finished = time.perf_counter()
+            _current.reset(token)
+            logger.info(json.dumps(metrics.log_record(scope["method"], scope["path"], status_code)))
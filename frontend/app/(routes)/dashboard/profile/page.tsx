@@ -14,7 +14,7 @@ import { useUserProfile, useUser } from '@/hooks/useUser';
 import { useAuthContext } from '@/components/auth/AuthProvider';
 import { usersApi } from '@/lib/api';
 import { profileSchema, type ProfileFormData } from '@/types';
-import { getActivityLevelLabel, getGoalLabel } from '@/lib/utils';
+import { calculateBmr, getActivityLevelLabel, getGoalLabel } from '@/lib/utils';
 
 function ProfileContent() {
   const router = useRouter();
@@ -39,20 +39,20 @@ function ProfileContent() {
       weight: profile?.weight || 70,
       activity_level: profile?.activity_level || 'medium',
       goal: profile?.goal || 'maintain',
+      sex: profile?.sex || undefined,
     }
   });
 
   const watchedValues = watch();
 
   const calculateGoals = () => {
-    const { age, height, weight, activity_level, goal } = watchedValues;
+    const { age, height, weight, activity_level, goal, sex } = watchedValues;
     
     if (!age || !height || !weight || !activity_level || !goal) {
       return null;
     }
 
-    // BMR calculation (Mifflin-St Jeor Equation)
-    const bmr = 88.362 + (13.397 * weight) + (4.799 * height) - (5.677 * age);
+    const bmr = calculateBmr(age, height, weight, sex);
     
     const activityMultipliers = {
       low: 1.2,
@@ -181,7 +181,20 @@ function ProfileContent() {
                   </div>
 
                   {/* Activity & Goals */}
-                  <div className="grid grid-cols-1 md:grid-cols-2 gap-4">
+                  <div className="grid grid-cols-1 md:grid-cols-3 gap-4">
+                    <div>
+                      <Label htmlFor="sex">Sex</Label>
+                      <select
+                        id="sex"
+                        className="form-input w-full"
+                        {...register('sex', { setValueAs: (value) => value || undefined })}
+                      >
+                        <option value="">Prefer not to say</option>
+                        <option value="male">Male</option>
+                        <option value="female">Female</option>
+                      </select>
+                    </div>
+
                     <div>
                       <Label htmlFor="activity_level">Activity Level</Label>
                       <select
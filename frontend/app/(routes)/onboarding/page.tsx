@@ -9,7 +9,7 @@ import { Button } from '@/components/ui/Button';
 import { Input } from '@/components/ui/Input';
 import { Label } from '@/components/ui/Label';
 import { profileSchema, type ProfileFormData } from '@/types';
-import { getActivityLevelLabel, getGoalLabel } from '@/lib/utils';
+import { calculateBmr, getActivityLevelLabel, getGoalLabel } from '@/lib/utils';
 
 export default function OnboardingPage() {
   const [step, setStep] = useState(1);
@@ -67,14 +67,13 @@ export default function OnboardingPage() {
   };
 
   const calculateCalorieGoal = () => {
-    const { age, height, weight, activity_level, goal } = watchedValues;
+    const { age, height, weight, activity_level, goal, sex } = watchedValues;
     
     if (!age || !height || !weight || !activity_level || !goal) {
       return null;
     }
 
-    // BMR calculation (Mifflin-St Jeor Equation - assuming male for simplicity)
-    const bmr = 88.362 + (13.397 * weight) + (4.799 * height) - (5.677 * age);
+    const bmr = calculateBmr(age, height, weight, sex);
     
     // Activity multipliers
     const activityMultipliers = {
@@ -163,6 +162,19 @@ export default function OnboardingPage() {
                   {...register('weight', { valueAsNumber: true })}
                 />
               </div>
+
+              <div>
+                <Label htmlFor="sex">Sex</Label>
+                <select
+                  id="sex"
+                  className="form-input"
+                  {...register('sex', { setValueAs: (value) => value || undefined })}
+                >
+                  <option value="">Prefer not to say</option>
+                  <option value="male">Male</option>
+                  <option value="female">Female</option>
+                </select>
+              </div>
             </div>
           )}
 
@@ -1,6 +1,6 @@
 import useSWR from 'swr';
 import { progressApi } from '@/lib/api';
-import type { DailyNutritionSummary, WeeklyProgressData } from '@/types';
+import type { DailyNutritionSummary, WeeklyProgressData, YearHeatmapData } from '@/types';
 
 export function useDailyProgress(date: string) {
   const { data, error, mutate } = useSWR<DailyNutritionSummary>(
@@ -110,6 +110,24 @@ export function useCalendarData(month: number, year: number) {
   };
 }
 
+export function useYearHeatmap(year: number) {
+  const { data, error, mutate } = useSWR<YearHeatmapData>(
+    ['year-heatmap', year],
+    async () => {
+      const response = await progressApi.getYearHeatmap(year);
+      if (response.error) throw new Error(response.error);
+      return response.data!;
+    }
+  );
+
+  return {
+    heatmap: data,
+    loading: !error && !data,
+    error,
+    mutate,
+  };
+}
+
 export function useTodaysProgress() {
   const today = new Date().toISOString().split('T')[0];
   return useDailyProgress(today);
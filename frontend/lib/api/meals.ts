@@ -2,6 +2,8 @@ import { apiClient } from './client';
 import type { 
   Meal, 
   MealFormData, 
+  MealPage, 
+  MealSearchResult, 
   PhotoAnalysisResponse, 
   ChatLogResponse 
 } from '@/types';
@@ -26,10 +28,25 @@ export const mealsApi = {
     return apiClient.get<Meal[]>(`/api/meals${query ? `?${query}` : ''}`);
   },
 
+  getMealsPage: (params?: {
+    cursor?: string;
+    limit?: number;
+    start_date?: string;
+    end_date?: string;
+  }) => {
+    const searchParams = new URLSearchParams({ pagination: 'cursor' });
+    if (params?.cursor) searchParams.set('cursor', params.cursor);
+    if (params?.limit) searchParams.set('limit', params.limit.toString());
+    if (params?.start_date) searchParams.set('start_date', params.start_date);
+    if (params?.end_date) searchParams.set('end_date', params.end_date);
+    
+    return apiClient.get<MealPage>(`/api/meals?${searchParams.toString()}`);
+  },
+
   searchMeals: (query: string, limit?: number) => {
     const params = new URLSearchParams({ q: query });
     if (limit) params.set('limit', limit.toString());
-    return apiClient.get<Meal[]>(`/api/meals/search?${params.toString()}`);
+    return apiClient.get<MealSearchResult[]>(`/api/meals/search?${params.toString()}`);
   },
 
   getMealById: (id: number) =>
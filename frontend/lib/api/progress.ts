@@ -1,5 +1,5 @@
 import { apiClient } from './client';
-import type { DailyNutritionSummary, WeeklyProgressData } from '@/types';
+import type { DailyNutritionSummary, WeeklyProgressData, YearHeatmapData } from '@/types';
 
 export const progressApi = {
   getDailyProgress: (date: string) =>
@@ -14,4 +14,7 @@ export const progressApi = {
       year: number;
       days: Record<string, { meal_count: number; total_calories: number }>;
     }>(`/api/progress/calendar?month=${month}&year=${year}`),
+
+  getYearHeatmap: (year: number) =>
+    apiClient.get<YearHeatmapData>(`/api/progress/year?year=${year}`),
 };
\ No newline at end of file
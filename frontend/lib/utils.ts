@@ -23,6 +23,19 @@ export function calculatePercentage(current: number, target: number): number {
   return Math.round((current / target) * 100);
 }
 
+export function calculateBmr(age: number, height: number, weight: number, sex?: string | null): number {
+  const maleBmr = 88.362 + (13.397 * weight) + (4.799 * height) - (5.677 * age);
+  const femaleBmr = 447.593 + (9.247 * weight) + (3.098 * height) - (4.330 * age);
+
+  if (sex === 'male') {
+    return maleBmr;
+  }
+  if (sex === 'female') {
+    return femaleBmr;
+  }
+  return (maleBmr + femaleBmr) / 2;
+}
+
 export function getActivityLevelLabel(level: string): string {
   switch (level) {
     case 'low':
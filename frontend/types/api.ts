@@ -1,6 +1,7 @@
 export type UserRole = 'free' | 'premium';
 export type ActivityLevel = 'low' | 'medium' | 'high';
 export type GoalType = 'weight_loss' | 'muscle_gain' | 'maintain';
+export type Sex = 'male' | 'female';
 
 export interface User {
   id: string;
@@ -18,6 +19,7 @@ export interface UserProfile {
   weight: number;
   activity_level: ActivityLevel;
   goal: GoalType;
+  sex?: Sex | null;
   calorie_goal?: number;
   protein_goal?: number;
   carbs_goal?: number;
@@ -25,6 +27,23 @@ export interface UserProfile {
   goal_weight?: number;
 }
 
+export interface NutritionGoalVersion {
+  effective_from: string;
+  formula_version: number;
+  age: number;
+  height: number;
+  weight: number;
+  activity_level: ActivityLevel;
+  goal: GoalType;
+  sex?: Sex | null;
+  bmr: number;
+  tdee: number;
+  calorie_goal: number;
+  protein: number;
+  carbs: number;
+  fat: number;
+}
+
 export interface Meal {
   id: number;
   user_id: string;
@@ -39,6 +58,16 @@ export interface Meal {
   logged_at: string;
 }
 
+export interface MealPage {
+  items: Meal[];
+  next_cursor?: string | null;
+}
+
+export interface MealSearchResult extends Meal {
+  score: number;
+  snippet?: string;
+}
+
 export interface Subscription {
   has_subscription: boolean;
   plan?: string;
@@ -79,6 +108,17 @@ export interface WeeklyProgressData {
   fiber?: number;
 }
 
+export interface HeatmapCell {
+  day: string;
+  meal_count: number;
+  total_calories: number;
+}
+
+export interface YearHeatmapData {
+  year: number;
+  days: HeatmapCell[];
+}
+
 export interface ApiResponse<T> {
   data?: T;
   error?: string;
@@ -21,6 +21,7 @@ export const profileSchema = z.object({
   weight: z.number().min(20).max(500),
   activity_level: z.enum(['low', 'medium', 'high'] as const),
   goal: z.enum(['weight_loss', 'muscle_gain', 'maintain'] as const),
+  sex: z.enum(['male', 'female'] as const).optional(),
 });
 
 export const mealSchema = z.object({